@@ -1,16 +1,24 @@
 import streamlit as st
 import tempfile
 import os
-import subprocess
 import shutil
 from pathlib import Path
 import re
-from ts341_project.pipeline.Pipelines import list_pipelines
+from ts341_project.pipeline import list_pipelines
+from ts341_project.logging_utils import setup_logging
+from ts341_project.ProcessingSession import ProcessingSession
 
 st.set_page_config(page_title="TS341 - Détection de drones", layout="wide")
 st.title("TS341 - Détection de drones")
 
 
+@st.cache_resource
+def get_session():
+    """Session partagée par tous les reruns : workers et pipelines restent chauds"""
+    setup_logging()
+    return ProcessingSession(preload=["drone-detection"]).start()
+
+
 # Layout : colonne gauche (1/3) = paramètres, colonne droite (2/3) = upload + preview + résultat
 col_param, col_main = st.columns([1, 2])
 
@@ -60,25 +68,22 @@ with col_main:
             dest_video = os.path.join("ts341_project", "choosen_video" + Path(video_path).suffix)
             shutil.copy(video_path, dest_video)
             output_path = "ts341_project/output/output.mp4"
-            cmd = [
-                "poetry", "run", "python", "ts341_project/new_main.py",
-                dest_video,
-                "--pipeline", pipeline_to_run,
-                "--save", output_path,
-                "--no-display"
-            ]
-            st.write(f"Commande exécutée : {' '.join(cmd)}")
+            st.write(f"Job : {dest_video} -> {output_path} (pipeline {pipeline_to_run})")
             with st.spinner("Traitement en cours..."):
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    st.error(f"Erreur : {result.stderr}")
+                result = get_session().run(
+                    dest_video, output_path=output_path, pipeline=pipeline_to_run
+                )
+
+                if not result.ok:
+                    st.error(f"Erreur : {result.error}")
                 else:
                     if os.path.exists(output_path):
                         st.video(output_path)
                     else:
                         st.warning("Aucune vidéo de sortie trouvée.")
-            st.text(result.stdout)
+            st.text(
+                f"{result.frames} frames en {result.elapsed:.1f}s ({result.fps:.1f} FPS)"
+            )
             st.session_state['processing'] = False
         elif not uploaded_file:
             st.info("Veuillez uploader une vidéo pour commencer.")
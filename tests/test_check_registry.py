@@ -0,0 +1,18 @@
+import dataclasses
+
+from ts341_project.pipeline import check_registry
+
+
+def test_registry_matches_classes():
+    assert check_registry.verify_specs() == []
+
+
+def test_description_drift_is_reported(monkeypatch):
+    specs = dict(check_registry.PIPELINE_SPECS)
+    specs["blur"] = dataclasses.replace(specs["blur"], description="Gaussian Blur (kernel=9)")
+    monkeypatch.setattr(check_registry, "PIPELINE_SPECS", specs)
+
+    problems = check_registry.verify_specs()
+
+    assert len(problems) == 1
+    assert problems[0].startswith("blur: description")
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ts341_project.DeliveryQueue import DeliveryQueue
+
+
+def _item(index):
+    return {"frame_number": index, "frame": np.zeros((4, 4, 3), np.uint8)}
+
+
+def _drain(queue):
+    items = []
+    while queue.depth:
+        items.append(queue.get(timeout=1.0)["frame_number"])
+    return items
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        DeliveryQueue(policy="latest")
+
+
+def test_drop_newest_keeps_the_first_items():
+    queue = DeliveryQueue(maxsize=2, policy="drop_newest")
+    results = [queue.put(_item(i)) for i in range(4)]
+
+    assert results == [True, True, False, False]
+    stats = queue.stats()
+    assert (stats["delivered"], stats["dropped"], stats["depth"]) == (2, 2, 2)
+    assert stats["bytes"] == 2 * 48
+    assert _drain(queue) == [0, 1]
+    assert queue.stats()["bytes"] == 0
+
+
+def test_drop_oldest_keeps_the_last_items():
+    dropped = []
+    queue = DeliveryQueue(
+        maxsize=2, policy="drop_oldest", on_drop=lambda item: dropped.append(item["frame_number"])
+    )
+    assert all(queue.put(_item(i)) for i in range(4))
+
+    stats = queue.stats()
+    assert (stats["delivered"], stats["dropped"], stats["depth"]) == (4, 2, 2)
+    assert dropped == [0, 1]
+    assert _drain(queue) == [2, 3]
+
+
+def test_control_message_is_never_dropped():
+    queue = DeliveryQueue(maxsize=1, policy="drop_newest")
+    queue.put(_item(0))
+
+    assert queue.put({"end_of_stream": True}, control=True)
+    assert queue.get(timeout=1.0) == {"end_of_stream": True}
+    assert queue.stats()["dropped"] == 1
+
+
+def test_block_waits_without_loss_and_honours_stop_event():
+    queue = DeliveryQueue(maxsize=1, policy="block")
+    queue.put(_item(0))
+
+    consumer = threading.Timer(0.3, lambda: queue.get(timeout=1.0))
+    consumer.start()
+    assert queue.put(_item(1))
+    consumer.join()
+    assert queue.stats()["blocked_s"] > 0.1
+    assert queue.stats()["dropped"] == 0
+
+    stop = threading.Event()
+    stop.set()
+    assert not queue.put(_item(2), stop_event=stop)
+    assert queue.stats()["dropped"] == 1
+    assert _drain(queue) == [1]
+
+
+def test_from_budget_clamps_capacity():
+    assert DeliveryQueue.from_budget(100, 10, max_items=8).maxsize == 8
+    assert DeliveryQueue.from_budget(100, 1000, min_items=2).maxsize == 2
+    assert DeliveryQueue.from_budget(100, 20).maxsize == 5
+
+
+def test_eviction_keeps_end_of_stream_of_another_stream():
+    queue = DeliveryQueue(maxsize=2, policy="drop_oldest")
+    queue.put({**_item(0), "stream_id": 0})
+    queue.put({"end_of_stream": True, "stream_id": 0}, control=True)
+    for i in range(1, 20):
+        queue.put({**_item(i), "stream_id": 1})
+
+    items = [queue.get(timeout=1.0) for _ in range(queue.depth)]
+    assert {"end_of_stream": True, "stream_id": 0} in items
+    assert items[-1]["frame_number"] == 19
+    assert queue.stats()["dropped"] == 19
+
+
+def test_finished_stream_is_seen_while_another_floods():
+    queue = DeliveryQueue(maxsize=2, policy="drop_oldest")
+    stop = threading.Event()
+
+    def produce(stream_id, frames):
+        for i in range(frames):
+            queue.put({**_item(i), "stream_id": stream_id}, stop)
+        queue.put({"end_of_stream": True, "stream_id": stream_id}, stop, control=True)
+
+    producers = [
+        threading.Thread(target=produce, args=(0, 5)),
+        threading.Thread(target=produce, args=(1, 2000)),
+    ]
+    for producer in producers:
+        producer.start()
+
+    # Consommateur lent (affichage) : s'arrête quand tous les flux sont terminés
+    active_streams = {0, 1}
+    while active_streams:
+        data = queue.get(timeout=5.0)
+        if data.get("end_of_stream"):
+            active_streams.discard(data["stream_id"])
+        else:
+            time.sleep(0.001)
+
+    for producer in producers:
+        producer.join(timeout=5.0)
+    assert queue.stats()["dropped"] > 0
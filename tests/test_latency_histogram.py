@@ -0,0 +1,66 @@
+import math
+import random
+
+import pytest
+
+from ts341_project.LatencyHistogram import LatencyHistogram, LatencyRecorder
+
+# Largeur relative d'un bucket (20 par décade)
+BUCKET_RATIO = 10 ** (1 / 20)
+
+
+def _samples(n=2000, seed=0):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(math.log(5e-3), 1.0) for _ in range(n)]
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) == 0.0
+    assert histogram.mean == 0.0
+
+
+@pytest.mark.parametrize("q", [1, 50, 90, 95, 99, 100])
+def test_percentile_is_the_bucket_upper_bound(q):
+    samples = _samples()
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+
+    # Rang ceil(q * n / 100) de l'échantillon trié
+    exact = sorted(samples)[max(0, math.ceil(q / 100 * len(samples)) - 1)]
+    estimate = histogram.percentile(q)
+    assert exact <= estimate <= exact * BUCKET_RATIO
+
+
+def test_percentiles_never_exceed_the_max():
+    histogram = LatencyHistogram()
+    for value in (2e-3, 2e-3, 2e-3):
+        histogram.record(value)
+    assert histogram.percentile(50) == histogram.max == 2e-3
+
+    histogram.record(500.0)  # Au-delà du dernier bucket
+    assert histogram.percentile(100) == 500.0
+
+
+def test_merge_equals_recording_everything():
+    samples = _samples()
+    left, right, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(samples):
+        (left if i % 2 else right).record(value)
+        both.record(value)
+
+    left.merge(right)
+    assert left.counts == both.counts
+    assert left.count == both.count
+    assert left.max == both.max
+    assert left.mean == pytest.approx(both.mean)
+
+
+def test_recorder_keeps_first_recording_order():
+    recorder = LatencyRecorder()
+    for name in ("resize", "mog2", "resize", "orb"):
+        recorder.record(name, 1e-3)
+
+    assert list(recorder.names()) == ["resize", "mog2", "orb"]
+    assert recorder.to_dict()["resize"]["count"] == 2
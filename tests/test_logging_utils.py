@@ -0,0 +1,45 @@
+import logging
+import multiprocessing as mp
+import time
+
+from ts341_project.logging_utils import BatchQueueListener, MultiprocessLogManager
+
+
+class _Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _log_and_return(handler):
+    logger = logging.getLogger("ts341_project.tests.child")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.warning("premier")  # Envoyé immédiatement : démarre le thread de la queue
+    logger.info("dernier")  # Lot incomplet : part au vidage de sortie
+
+
+def _received(collector, expected, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(collector.messages) < expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return collector.messages
+
+
+def test_child_last_batch_is_flushed_at_exit():
+    manager = MultiprocessLogManager(level=logging.INFO, batch_size=64, flush_interval=60.0)
+    collector = _Collector()
+    listener = BatchQueueListener(manager.log_queue, collector)
+    listener.start()
+    try:
+        process = mp.get_context("fork").Process(target=_log_and_return, args=(manager.handler,))
+        process.start()
+        process.join(timeout=10)
+        assert process.exitcode == 0
+        assert _received(collector, 2) == ["premier", "dernier"]
+    finally:
+        listener.stop()
@@ -0,0 +1,56 @@
+import logging
+import multiprocessing as mp
+
+import numpy as np
+
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.PipelineMetrics import StageMetrics
+from ts341_project.logging_utils import setup_logging, shutdown_logging
+from ts341_project.pipeline.PipelineProcessor import PipelineProcessor
+from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
+from ts341_project.pipeline.image_block.ProcessingBlock import ProcessingBlock
+
+
+class _FailOnOddFrames(ProcessingBlock):
+    def process(self, frame, result=None):
+        if result.frame_number % 2:
+            raise RuntimeError(f"frame {result.frame_number}")
+        return result
+
+
+def test_block_errors_are_logged_counted_and_do_not_stop_the_stream(tmp_path):
+    log_file = tmp_path / "processor.log"
+    setup_logging(level=logging.WARNING, log_file=str(log_file))
+    stop_event = mp.Event()
+    input_queue = DeliveryQueue(maxsize=8, name="processor")
+    output_queue = DeliveryQueue(maxsize=8, name="storage")
+    metrics = StageMetrics("processor")
+    processor = PipelineProcessor(
+        pipeline=ProcessingPipeline(blocks=[_FailOnOddFrames()]),
+        input_queue=input_queue,
+        output_queues={"storage": output_queue},
+        stop_event=stop_event,
+        metrics=metrics,
+    ).start()
+    try:
+        for frame_number in range(1, 6):
+            input_queue.put({"frame": np.zeros((4, 4), np.uint8), "frame_number": frame_number})
+        input_queue.put({"end_of_stream": True}, control=True)
+
+        received = []
+        while True:
+            data = output_queue.get(timeout=10.0)
+            if data.get("end_of_stream"):
+                break
+            received.append(data["frame_number"])
+        processor.process.join(timeout=10.0)
+    finally:
+        processor.stop()
+        shutdown_logging()
+
+    assert received == [2, 4]
+    snapshot = metrics.snapshot()
+    assert (snapshot["frames"], snapshot["errors"]) == (2, 3)
+    log = log_file.read_text()
+    assert log.count("jetée sur erreur") == 3
+    assert "RuntimeError: frame 3" in log
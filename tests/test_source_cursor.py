@@ -0,0 +1,72 @@
+import cv2
+
+from ts341_project.VideoReader import SourceCursor
+
+
+class _FakeCapture:
+    """Capture de `count` frames (la frame est son index 0-based)"""
+
+    def __init__(self, count, seekable=True, stride=1):
+        self.count = count
+        self.seekable = seekable
+        self.stride = stride  # Pas appliqué par le « décodeur »
+        self.position = 0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES and self.seekable:
+            self.position = int(value)
+            return True
+        return False
+
+    def get(self, prop):
+        return float(self.position) if prop == cv2.CAP_PROP_POS_FRAMES else 0.0
+
+    def grab(self):
+        if self.position >= self.count:
+            return False
+        self.position += 1
+        return True
+
+    def read(self):
+        if self.position >= self.count:
+            return False, None
+        frame = self.position
+        self.position += self.stride
+        return True, frame
+
+
+def _read_all(cursor):
+    frames = []
+    while cursor.skip():
+        ret, frame = cursor.read()
+        if not ret:
+            break
+        frames.append((frame, cursor.position, cursor.pts()))
+    return frames
+
+
+def test_stride_and_range_keep_source_indices():
+    cursor = SourceCursor(_FakeCapture(100), fps=10.0, start=1.0, end=2.0, stride=3)
+    frames = _read_all(cursor)
+
+    assert [frame for frame, _, _ in frames] == [10, 13, 16, 19]
+    assert [position for _, position, _ in frames] == [11, 14, 17, 20]
+    assert [pts for _, _, pts in frames] == [1.0, 1.3, 1.6, 1.9]
+    assert cursor.end_reason == "Fin de plage"
+    assert cursor.skipped == 6
+
+
+def test_seek_falls_back_to_grab():
+    cursor = SourceCursor(_FakeCapture(20, seekable=False), fps=10.0, start=0.5)
+    assert cursor.position == 5
+    assert [frame for frame, _, _ in _read_all(cursor)] == list(range(5, 20))
+    assert cursor.end_reason == "Fin de vidéo"
+
+
+def test_decoder_stride_reads_without_grab():
+    cursor = SourceCursor(_FakeCapture(10, stride=2), fps=10.0, stride=2)
+    frames = _read_all(cursor)
+
+    assert cursor.decoder_stride
+    assert [frame for frame, _, _ in frames] == [0, 2, 4, 6, 8]
+    assert [position for _, position, _ in frames] == [1, 3, 5, 7, 9]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ts341_project.debug.StreamRecorder import (
+    KIND_GRAY,
+    StreamRecorder,
+    StreamRecording,
+    decode_mask,
+    encode_mask,
+)
+
+
+def _mask(seed, height=37, width=53):
+    # Taille non multiple de 8 : le dernier octet bit-packé est incomplet
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[rng.integers(0, height, 40), rng.integers(0, width, 40)] = 255
+    mask[5:15, 10:30] = 255
+    return mask
+
+
+def test_mask_rle_round_trip():
+    for mask in (_mask(0), np.zeros((37, 53), np.uint8), np.full((37, 53), 255, np.uint8)):
+        assert np.array_equal(decode_mask(encode_mask(mask), 53, 37), mask)
+
+
+def test_mask_values_are_binarized():
+    mask = np.array([[0, 1, 128, 255]], dtype=np.uint8)
+    assert decode_mask(encode_mask(mask), 4, 1).tolist() == [[0, 255, 255, 255]]
+
+
+def test_recording_keeps_source_frame_numbers(tmp_path):
+    path = tmp_path / "mask.tsrec"
+    masks = {number: _mask(number) for number in (1, 3, 5, 9, 11)}
+    # chunk_frames=2 : plusieurs chunks plus un chunk final incomplet
+    with StreamRecorder(path, chunk_frames=2) as recorder:
+        for number, mask in masks.items():
+            recorder.write(mask, number)
+
+    with StreamRecording(path) as recording:
+        assert recording.frame_numbers.tolist() == list(masks)
+        for number, mask in masks.items():
+            assert np.array_equal(recording.get_frame(number), mask)
+        with pytest.raises(KeyError):
+            recording.get_frame(4)
+
+
+def test_frame_number_defaults_to_write_rank(tmp_path):
+    path = tmp_path / "gray.tsrec"
+    layers = [np.full((8, 8), value, np.uint8) for value in (10, 20, 30)]
+    with StreamRecorder(path, kind=KIND_GRAY) as recorder:
+        for layer in layers:
+            recorder.write(layer)
+
+    with StreamRecording(path) as recording:
+        assert recording.frame_numbers.tolist() == [0, 1, 2]
+        assert np.array_equal(recording[-1], layers[-1])
@@ -0,0 +1,69 @@
+import pytest
+
+from ts341_project.storage.StorageProcess import (
+    TimestampGrid,
+    read_timecodes,
+    timecodes_commands,
+)
+
+
+def test_regular_pts_are_cfr():
+    grid = TimestampGrid(fps=25.0)
+    placements = [grid.place(10.0 + i / 25.0) for i in range(5)]
+
+    assert placements == [True] * 5
+    assert (grid.gaps, grid.rejected, grid.next_index) == (0, 0, 5)
+    assert grid.timecodes == pytest.approx([0.0, 40.0, 80.0, 120.0, 160.0])
+    assert not grid.vfr
+
+
+def test_gap_keeps_the_real_time_without_repeats():
+    grid = TimestampGrid(fps=10.0)
+    grid.place(0.0)
+
+    # Frame suivante 300 ms plus tard : 2 emplacements sans frame
+    assert grid.place(0.3)
+    assert (grid.gaps, grid.next_index) == (2, 4)
+    assert grid.timecodes == pytest.approx([0.0, 300.0])
+    assert grid.vfr
+
+
+def test_early_frames_are_kept_and_non_increasing_pts_rejected():
+    grid = TimestampGrid(fps=10.0)
+    grid.place(0.0)
+    grid.place(0.1)
+
+    assert grid.place(0.12)  # Moins d'une demi-période après la précédente
+    assert not grid.place(0.05)  # PTS en arrière
+    assert not grid.place(0.12)  # PTS répété
+    assert grid.place(0.2)
+    assert grid.rejected == 2
+    assert grid.timecodes == pytest.approx([0.0, 100.0, 120.0, 200.0])
+    assert grid.vfr
+
+
+def test_missing_pts_takes_the_next_slot(tmp_path):
+    grid = TimestampGrid(fps=20.0)
+    assert [grid.place() for _ in range(3)] == [True] * 3
+    assert grid.origin is None
+    assert not grid.vfr
+
+    path = tmp_path / "out.timecodes.txt"
+    grid.write_timecodes(path)
+    assert path.read_text().splitlines() == [
+        "# timestamp format v2",
+        "0.000",
+        "50.000",
+        "100.000",
+    ]
+    assert read_timecodes(path) == [0.0, 50.0, 100.0]
+
+
+def test_commands_only_at_offset_changes():
+    # Frames 0, 1 régulières, trou de 2 emplacements, puis 2 frames régulières
+    commands = timecodes_commands([0.0, 100.0, 400.0, 500.0], fps=10.0).splitlines()
+
+    assert commands == [
+        "0.000000-0.150000 [enter] setpts expr PTS+0.000000/TB;",
+        "0.150000-1000000000.000000 [enter] setpts expr PTS+0.200000/TB;",
+    ]
@@ -0,0 +1,247 @@
+"""
+DeliveryQueue - Queue multiprocessus avec politique de livraison par consommateur
+
+Chaque consommateur choisit sa politique :
+    - block       : sans perte, le producteur attend (sauvegarde offline)
+    - drop_newest : la frame qui arrive est jetée si la queue est pleine
+    - drop_oldest : la plus ancienne est jetée, la dernière gagne (affichage live)
+
+Les messages de contrôle (end_of_stream) ne sont pas jetés par les politiques
+drop_*, y compris par l'éviction sur une queue partagée par plusieurs flux.
+
+Les compteurs (frames livrées, jetées, temps bloqué, profondeur, octets
+bufferisés) sont en mémoire partagée et lisibles depuis n'importe quel processus.
+La capacité peut être exprimée en budget mémoire (voir from_budget).
+"""
+
+import time
+from multiprocessing import Queue, Value
+from queue import Empty, Full
+from typing import Any, Callable
+
+from ts341_project.memory_utils import format_bytes
+from ts341_project.TimelineTrace import span
+
+POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+def payload_nbytes(item: Any) -> int:
+    """Taille des données image d'un payload de queue (frame brute ou JPEG)."""
+    if not isinstance(item, dict):
+        return 0
+    frame = item.get("frame")
+    if frame is not None and hasattr(frame, "nbytes"):
+        return int(frame.nbytes)
+    return len(item.get("frame_jpeg", b""))
+
+
+def is_control(item: Any) -> bool:
+    """Message de contrôle (end_of_stream) : jamais jeté par une politique de livraison."""
+    return isinstance(item, dict) and bool(item.get("end_of_stream"))
+
+
+class DeliveryQueue:
+    """
+    Enveloppe d'une multiprocessing.Queue avec politique de livraison
+    et télémétrie de backpressure.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10,
+        policy: str = "block",
+        name: str = "queue",
+        budget_bytes: int = 0,
+        on_drop: Callable[[Any], None] = None,
+    ):
+        """
+        Args:
+            maxsize: Capacité (nombre d'éléments)
+            policy: 'block', 'drop_newest' ou 'drop_oldest'
+            name: Nom du consommateur (pour les logs)
+            budget_bytes: Budget mémoire ayant servi à dimensionner la queue (info)
+            on_drop: Appelé avec chaque élément jeté (ex: libérer un slot de
+                     SharedFrameRing)
+        """
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Politique de livraison inconnue: {policy} ({', '.join(POLICIES)})"
+            )
+
+        self.queue = Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.on_drop = on_drop
+
+        # Compteurs partagés
+        self._delivered = Value("q", 0)
+        self._dropped = Value("q", 0)
+        self._depth = Value("q", 0)
+        self._blocked_time = Value("d", 0.0)
+        self._bytes = Value("q", 0)
+
+    @classmethod
+    def from_budget(
+        cls,
+        budget_bytes: int,
+        item_bytes: int,
+        policy: str = "block",
+        name: str = "queue",
+        min_items: int = 2,
+        max_items: int = 64,
+    ) -> "DeliveryQueue":
+        """
+        Crée une queue dont la capacité découle d'un budget mémoire.
+
+        Args:
+            budget_bytes: Mémoire maximale bufferisée dans la queue
+            item_bytes: Taille estimée d'un élément (ex: w * h * 3 pour une frame BGR)
+            min_items: Capacité minimale (même si une frame dépasse le budget)
+            max_items: Capacité maximale (petites résolutions)
+        """
+        maxsize = budget_bytes // max(1, item_bytes)
+        maxsize = int(min(max_items, max(min_items, maxsize)))
+        return cls(maxsize=maxsize, policy=policy, name=name, budget_bytes=budget_bytes)
+
+    def _count_put(self, item: Any):
+        with self._depth.get_lock():
+            self._depth.value += 1
+        with self._bytes.get_lock():
+            self._bytes.value += payload_nbytes(item)
+        with self._delivered.get_lock():
+            self._delivered.value += 1
+
+    def _count_get(self, item: Any):
+        with self._depth.get_lock():
+            self._depth.value -= 1
+        with self._bytes.get_lock():
+            self._bytes.value -= payload_nbytes(item)
+
+    def _count_drop(self, item: Any):
+        with self._dropped.get_lock():
+            self._dropped.value += 1
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def _evict_oldest(self) -> bool:
+        """
+        Jette le plus ancien élément. Un message de contrôle (ex: end_of_stream
+        d'un autre flux) est remis en queue à la place : seuls les flux encore
+        actifs le suivent, l'ordre par flux est conservé.
+
+        Returns:
+            True si une place a été libérée
+        """
+        try:
+            # Attente très courte : la Queue peut être pleine alors que le thread
+            # d'alimentation n'a pas encore écrit l'élément dans le pipe
+            item = self.queue.get(timeout=0.01)
+        except Empty:
+            return False
+        if is_control(item):
+            # Sans attente ni perte : la place libérée est reprise (un autre
+            # producteur peut l'avoir prise entre-temps, on attend alors le consommateur)
+            self.queue.put(item)
+            return False
+        self._count_get(item)
+        self._count_drop(item)
+        return True
+
+    def put(self, item: Any, stop_event=None, control: bool = False) -> bool:
+        """
+        Envoie un élément selon la politique de la queue.
+
+        Args:
+            item: Élément à envoyer
+            stop_event: Event d'arrêt (interrompt une attente en mode 'block')
+            control: Message de contrôle (end_of_stream) : jamais jeté, et
+                     n'attend jamais sur une queue d'affichage (éviction)
+
+        Returns:
+            True si l'élément a été mis dans la queue
+        """
+        try:
+            self.queue.put_nowait(item)
+            self._count_put(item)
+            return True
+        except Full:
+            pass
+
+        if self.policy == "drop_newest" and not control:
+            self._count_drop(item)
+            return False
+
+        if self.policy != "block":
+            # drop_oldest (ou contrôle sur une queue non bloquante) : on fait de la place
+            with span(f"éviction {self.name}", "queue"):
+                for _ in range(self.maxsize + 1):
+                    self._evict_oldest()
+                    try:
+                        self.queue.put_nowait(item)
+                        self._count_put(item)
+                        return True
+                    except Full:
+                        continue
+            if not control:
+                self._count_drop(item)
+                return False
+            # Queue pleine de messages de contrôle : attendre le consommateur
+
+        # block : attendre de la place (sans perte), interruptible par stop_event
+        start = time.perf_counter()
+        try:
+            with span(f"attente {self.name}", "queue"):
+                while True:
+                    try:
+                        self.queue.put(item, timeout=0.1)
+                        self._count_put(item)
+                        return True
+                    except Full:
+                        if stop_event is not None and stop_event.is_set():
+                            self._count_drop(item)
+                            return False
+        finally:
+            with self._blocked_time.get_lock():
+                self._blocked_time.value += time.perf_counter() - start
+
+    def get(self, block: bool = True, timeout: float = None) -> Any:
+        """Récupère un élément (lève queue.Empty si rien après timeout)."""
+        item = self.queue.get(block, timeout)
+        self._count_get(item)
+        return item
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    @property
+    def depth(self) -> int:
+        return max(0, self._depth.value)
+
+    def stats(self) -> dict:
+        """Instantané des compteurs de la queue."""
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "depth": self.depth,
+            "maxsize": self.maxsize,
+            "delivered": self._delivered.value,
+            "dropped": self._dropped.value,
+            "blocked_s": self._blocked_time.value,
+            "bytes": max(0, self._bytes.value),
+            "budget_bytes": self.budget_bytes,
+        }
+
+    def describe(self) -> str:
+        """Résumé court pour les logs."""
+        s = self.stats()
+        return (
+            f"{s['name']}[{s['policy']}]: {s['depth']}/{s['maxsize']} "
+            f"({format_bytes(s['bytes'])}), "
+            f"{s['delivered']} livrées, {s['dropped']} jetées, "
+            f"bloqué {s['blocked_s']:.2f}s"
+        )
+
+    def __repr__(self):
+        return f"DeliveryQueue({self.describe()})"
@@ -0,0 +1,76 @@
+"""
+FrameCodec - Encodage des frames envoyées aux consommateurs
+
+Les frames voyagent dans leur nombre de canaux natif (1 canal pour les masques
+et niveaux de gris) et sont étendues en BGR uniquement côté consommateur.
+Pour l'affichage, le producteur réduit la frame à la taille d'affichage et
+peut la compresser en JPEG avant de la mettre dans la queue.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+CODECS = ("raw", "jpeg")
+
+
+@dataclass
+class FrameCodec:
+    """
+    Configuration d'encodage pour une queue de sortie.
+
+    Attributes:
+        max_height: Hauteur max (réduction côté producteur), None = taille native
+        codec: 'raw' (tableau numpy) ou 'jpeg' (octets compressés)
+        jpeg_quality: Qualité JPEG (0-100)
+    """
+
+    max_height: Optional[int] = None
+    codec: str = "raw"
+    jpeg_quality: int = 80
+
+    def __post_init__(self):
+        if self.codec not in CODECS:
+            raise ValueError(f"Codec de frame inconnu: {self.codec} ({', '.join(CODECS)})")
+
+    def encode(self, frame: np.ndarray) -> dict:
+        """
+        Prépare une frame pour la queue.
+
+        Returns:
+            Dict à fusionner dans le payload: {'frame': ndarray} ou {'frame_jpeg': bytes}
+        """
+        h, w = frame.shape[:2]
+        if self.max_height is not None and h > self.max_height:
+            scale = self.max_height / h
+            frame = cv2.resize(
+                frame, (int(w * scale), self.max_height), interpolation=cv2.INTER_AREA
+            )
+
+        if self.codec == "jpeg":
+            ok, buffer = cv2.imencode(
+                ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+            )
+            if ok:
+                return {"frame_jpeg": buffer.tobytes()}
+
+        return {"frame": frame}
+
+    @staticmethod
+    def decode(data: dict) -> np.ndarray:
+        """Récupère la frame (canaux natifs) depuis un payload de queue."""
+        if "frame_jpeg" in data:
+            buffer = np.frombuffer(data["frame_jpeg"], dtype=np.uint8)
+            return cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+        return data["frame"]
+
+    @staticmethod
+    def to_bgr(frame: np.ndarray) -> np.ndarray:
+        """Étend une frame 1 canal (ou BGRA) en BGR pour les sinks qui l'exigent."""
+        if frame.ndim == 2 or (frame.ndim == 3 and frame.shape[2] == 1):
+            return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        return frame
@@ -0,0 +1,118 @@
+"""
+LatencyHistogram - Histogrammes de durées à buckets fixes
+
+Enregistrement sans allocation (un bisect sur des bornes logarithmiques
+précalculées) : utilisable à chaque frame et pour chaque bloc. Les
+percentiles sont estimés à la borne supérieure du bucket (erreur < 12 % avec
+20 buckets par décade).
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable
+
+# Bornes des buckets: 1 µs -> 100 s, 20 buckets par décade
+_MIN_EXPONENT, _MAX_EXPONENT, _PER_DECADE = -6, 2, 20
+BUCKET_BOUNDS = [
+    10 ** (_MIN_EXPONENT + i / _PER_DECADE)
+    for i in range((_MAX_EXPONENT - _MIN_EXPONENT) * _PER_DECADE + 1)
+]
+
+
+def format_duration(seconds: float) -> str:
+    """Durée lisible (µs, ms ou s)"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+class LatencyHistogram:
+    """Histogramme de durées (secondes)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Percentile q (0-100), borne supérieure du bucket (max observé au-delà)"""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return min(BUCKET_BOUNDS[i], self.max) if i < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> str:
+        return (
+            f"p50={format_duration(self.percentile(50))} "
+            f"p95={format_duration(self.percentile(95))} "
+            f"p99={format_duration(self.percentile(99))} "
+            f"max={format_duration(self.max)} n={self.count}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LatencyRecorder:
+    """Histogrammes nommés (un par bloc ou sous-étape), créés au premier enregistrement"""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(self, name: str, seconds: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def merge(self, other: "LatencyRecorder"):
+        for name, histogram in other.histograms.items():
+            self.histograms.setdefault(name, LatencyHistogram()).merge(histogram)
+
+    def names(self) -> Iterable[str]:
+        return self.histograms.keys()
+
+    def report(self, title: str = "Durées") -> str:
+        """Rapport multi-lignes (ordre de premier enregistrement)"""
+        if not self.histograms:
+            return f"{title}: aucune mesure"
+        width = max(len(name) for name in self.histograms)
+        lines = [f"{title}:"]
+        for name, histogram in self.histograms.items():
+            lines.append(f"  {name:<{width}s}  {histogram.summary()}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {name: histogram.to_dict() for name, histogram in self.histograms.items()}
@@ -0,0 +1,79 @@
+"""
+LatencyTrace - Latence de bout en bout (capture -> affichage / disque)
+
+Chaque étape ajoute un horodatage time.monotonic() (horloge commune à tous les
+processus) dans le champ 'trace' de l'enveloppe de la frame. Le consommateur
+final (affichage, stockage) découpe la latence totale en segments (attente en
+queue, traitement de chaque étape) et les accumule dans des histogrammes.
+
+Étapes, dans l'ordre :
+    capture        frame lue (ou capturée, en mode live)
+    reader_out     envoi par le reader (avant put : l'attente en queue et la
+                   backpressure comptent dans le segment suivant)
+    processor_in   frame reçue par le processor
+    processed      pipeline appliqué
+    processor_out  envoi vers le consommateur (après encodage)
+    sink_in        frame reçue par le consommateur
+    sink_out       frame affichée / écrite
+"""
+
+import time
+from typing import Optional
+
+from ts341_project.LatencyHistogram import LatencyRecorder
+
+STAMPS = (
+    "capture",
+    "reader_out",
+    "processor_in",
+    "processed",
+    "processor_out",
+    "sink_in",
+    "sink_out",
+)
+
+# Nom du segment entre deux horodatages consécutifs présents
+SEGMENTS = {
+    ("capture", "reader_out"): "reader",
+    ("reader_out", "processor_in"): "queue processor",
+    ("processor_in", "processed"): "pipeline",
+    ("processed", "processor_out"): "encodage",
+    ("processor_out", "sink_in"): "queue {sink}",
+    ("reader_out", "sink_in"): "queue {sink}",
+    ("sink_in", "sink_out"): "{sink}",
+}
+
+
+def new_trace(capture_time: float = None) -> dict:
+    """
+    Trace d'une frame lue à l'instant.
+
+    Args:
+        capture_time: Instant de capture time.time() (mode live : la frame a pu
+                      attendre dans le thread de capture), None = maintenant
+    """
+    now = time.monotonic()
+    if capture_time is None:
+        return {"capture": now}
+    return {"capture": now - max(0.0, time.time() - capture_time)}
+
+
+def stamp(trace: Optional[dict], name: str) -> Optional[dict]:
+    """Ajoute un horodatage (sans effet si la trace est désactivée)"""
+    if trace is not None:
+        trace[name] = time.monotonic()
+    return trace
+
+
+def record_trace(recorder: LatencyRecorder, trace: dict, sink: str):
+    """Découpe une trace terminée en segments et les enregistre"""
+    previous = None
+    for name in STAMPS:
+        if name not in trace:
+            continue
+        if previous is not None:
+            segment = SEGMENTS.get((previous, name), f"{previous} -> {name}")
+            recorder.record(segment.format(sink=sink), trace[name] - trace[previous])
+        previous = name
+    if previous is not None and previous != "capture":
+        recorder.record("total", trace[previous] - trace["capture"])
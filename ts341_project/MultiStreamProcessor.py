@@ -0,0 +1,240 @@
+"""
+MultiStreamProcessor - Orchestrateur multi-caméras
+
+N sources dans un seul arbre de processus : un VideoReader par flux, des
+workers de traitement partagés (affinité flux -> worker), un seul affichage et
+un seul stockage. Chaque message est tagué par l'identifiant de flux.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Sequence, Type, Union
+
+from ts341_project.VideoProcessor import VideoProcessor
+from ts341_project.VideoReader import VideoReader
+from ts341_project.pipeline.PipelineProcessor import PipelineProcessor
+from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
+from ts341_project.display import NewDisplayProcess
+from ts341_project.storage import NewStorageProcess
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.logging_utils import get_logger
+from ts341_project.memory_utils import format_bytes
+
+
+class MultiStreamProcessor(VideoProcessor):
+    """
+    Orchestrateur multiprocessus pour plusieurs sources.
+
+    Le flux s (index dans `sources`) est traité par le worker s % workers, qui
+    possède une instance de pipeline par flux (état séparé, ex: un MOG2 par
+    caméra). Les options de VideoProcessor s'appliquent à tous les flux.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Any],
+        pipeline: Union[str, ProcessingPipeline, Type[ProcessingPipeline]],
+        workers: int = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            sources: Sources vidéo (chemins, ID webcam, séquences d'images)
+            pipeline: Pipeline de traitement (instancié une fois par flux)
+            workers: Nombre de processus de traitement (défaut: moitié des CPU,
+                     au plus un par flux)
+            **kwargs: Options de VideoProcessor. output_path peut contenir
+                      '{stream}', sinon '_cam<id>' est ajouté au nom de fichier
+        """
+        if not sources:
+            raise ValueError("Au moins une source est nécessaire")
+
+        super().__init__(source=sources[0], pipeline=pipeline, **kwargs)
+        if self.shared_decode:
+            raise ValueError("Un seul pipeline par orchestrateur multi-caméras")
+        self.logger = get_logger(__name__)
+        self.sources = list(sources)
+        self.workers = max(1, min(len(self.sources), workers or (os.cpu_count() or 2) // 2))
+
+        # Flux (remplis dans start)
+        self.worker_queues = []
+        self.stream_options = {}  # stream_id -> options de lecture
+        self.stream_properties = {}  # stream_id -> (largeur, hauteur, fps)
+
+    @property
+    def stream_ids(self) -> list:
+        return list(range(len(self.sources)))
+
+    def worker_of(self, stream_id: int) -> int:
+        """Affinité flux -> worker (l'état du pipeline reste dans un seul processus)"""
+        return stream_id % self.workers
+
+    def stream_output_path(self, stream_id: int) -> str:
+        """Fichier de sortie d'un flux"""
+        if "{stream}" in self.output_path:
+            return self.output_path.format(stream=stream_id)
+        path = Path(self.output_path)
+        return str(path.with_name(f"{path.stem}_cam{stream_id}{path.suffix}"))
+
+    def _create_stream_queues(self):
+        """Queues partagées (sorties) + une queue d'entrée par worker"""
+        # Dimensionnement sur le flux le plus grand
+        width, height, _ = max(self.stream_properties.values(), key=lambda p: p[0] * p[1])
+        self._create_queues(width, height)
+        self.reader_queue = None
+
+        frame_bytes = width * height * 3
+        self.worker_queues = []
+        for worker in range(self.workers):
+            name = f"processor{worker}"
+            if self.live:
+                # Une frame en attente par flux du worker
+                streams = [s for s in self.stream_ids if self.worker_of(s) == worker]
+                queue = DeliveryQueue(
+                    maxsize=len(streams), policy=self.delivery_policies["processor"], name=name
+                )
+            else:
+                queue = DeliveryQueue.from_budget(
+                    self.queue_budget_bytes,
+                    frame_bytes,
+                    policy=self.delivery_policies["processor"],
+                    name=name,
+                )
+            self.worker_queues.append(queue)
+
+    def queues(self) -> list:
+        """Liste de toutes les queues actives"""
+        queues = [*self.worker_queues, self.raw_display_queue]
+        queues.extend(self.output_queues.values())
+        return [q for q in queues if q is not None]
+
+    def start(self):
+        """Démarre tous les processus"""
+        self.started_at = time.time()
+        self._start_timeline()
+        self._log(f"Initialisation ({len(self.sources)} flux, {self.workers} workers)...")
+
+        # Propriétés et options de lecture par flux
+        for stream_id, source in zip(self.stream_ids, self.sources):
+            self.capture_options = self._capture_options(source)
+            width, height, fps, _ = self._detect_video_properties(source)
+            self.stream_options[stream_id] = dict(self.capture_options)
+            self.stream_properties[stream_id] = (width, height, fps)
+            self._log(
+                f"Flux {stream_id}: {source} - {width}x{height} @ {fps} FPS "
+                f"-> worker {self.worker_of(stream_id)}"
+            )
+
+        self._create_stream_queues()
+        self._log(
+            f"Budget queues: {format_bytes(self.queue_budget_bytes)} -> "
+            + ", ".join(f"{q.name}={q.maxsize} frames" for q in self.queues())
+        )
+
+        # 1. Consommateurs partagés (une fenêtre / un fichier par flux)
+        if self.enable_display_raw:
+            display_raw = NewDisplayProcess(
+                display_queue=self.raw_display_queue,
+                stop_event=self.stop_event,
+                window_name=self.display_raw_window,
+                max_height=self.max_display_height,
+                streams=self.stream_ids,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics("display_raw"),
+                profile=self.profile_config,
+            )
+            display_raw.start()
+            self.processes.append(display_raw)
+            self._log("Display Raw démarré")
+
+        if self.enable_display:
+            display = NewDisplayProcess(
+                display_queue=self.output_queues["display"],
+                stop_event=self.stop_event,
+                window_name=self.display_window,
+                max_height=self.max_display_height,
+                streams=self.stream_ids,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics("display"),
+                profile=self.profile_config,
+            )
+            display.start()
+            self.processes.append(display)
+            self._log("Display Processed démarré")
+
+        if self.enable_storage:
+            outputs = {
+                stream_id: (self.stream_output_path(stream_id), fps, width, height)
+                for stream_id, (width, height, fps) in self.stream_properties.items()
+            }
+            storage = NewStorageProcess(
+                storage_queue=self.output_queues["storage"],
+                stop_event=self.stop_event,
+                output_path=self.output_path,
+                fps=0,
+                width=0,
+                height=0,
+                codec=self.codec,
+                streams=outputs,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics("storage"),
+                profile=self.profile_config,
+            )
+            storage.start()
+            self.processes.append(storage)
+            self._log("Storage démarré")
+
+        # 2. Workers de traitement partagés
+        for worker, queue in enumerate(self.worker_queues):
+            processor = PipelineProcessor(
+                pipeline=self.pipeline,
+                input_queue=queue,
+                output_queues=self.output_queues,
+                stop_event=self.stop_event,
+                metadata_fields=self.metadata_fields,
+                codecs=self.codecs,
+                streams=[s for s in self.stream_ids if self.worker_of(s) == worker],
+                name=f"worker{worker}",
+                started_at=self.started_at,
+                timing_interval=self.block_timing,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics(f"worker{worker}"),
+                profile=self.profile_config,
+            )
+            processor.start()
+            self.processes.append(processor)
+        self._log(f"{self.workers} workers démarrés")
+
+        # 3. Un reader par flux (producteurs) en dernier, dès que les consommateurs sont prêts
+        readers = []
+        for stream_id, source in zip(self.stream_ids, self.sources):
+            options = self.stream_options[stream_id]
+            reader = VideoReader(
+                source=source,
+                output_queue=self.worker_queues[self.worker_of(stream_id)],
+                stop_event=self.stop_event,
+                realtime=self.realtime,
+                raw_display_queue=self.raw_display_queue,
+                raw_display_codec=self.display_codec,
+                backend=options["backend"],
+                decode_width=options.get("decode_width"),
+                pixel_format=options.get("pixel_format"),
+                frame_cache=options.get("cache_dir"),
+                live=self.live,
+                start=self.start_time,
+                end=self.end_time,
+                stride=self.stride,
+                stream_id=stream_id,
+                trace=self.latency_trace,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics(f"reader{stream_id}"),
+                profile=self.profile_config,
+            )
+            readers.append(reader)
+        self._start_reader_when_ready(readers)
+        self._log(f"{len(self.sources)} readers démarrés")
+        self._start_metrics()
+
+        self._log("Tous les processus actifs ✓")
+        return self
@@ -0,0 +1,329 @@
+"""
+PipelineMetrics - Métriques de santé du pipeline (format Prometheus)
+
+Chaque processus (reader, processor, affichage, stockage) écrit ses compteurs
+dans un bloc de mémoire partagée (StageMetrics) dont il est le seul écrivain :
+frames, frames jetées sur erreur, détections, RSS et percentiles de durée par bloc. L'orchestrateur lit
+ces blocs et les compteurs des DeliveryQueue (déjà partagés) et les expose au
+format texte Prometheus, sur un port HTTP local (/metrics) et/ou dans un
+fichier réécrit périodiquement (collecteur textfile de node_exporter).
+
+Seuls des compteurs et des jauges d'état sont exportés : le rendu ne garde
+aucun état entre deux lectures (plusieurs scrapers, ou un scraper et le
+fichier, ne se perturbent pas). Les débits se calculent côté Prometheus :
+    rate(ts341_frames_total{stage="processor"}[1m])
+    rate(ts341_detections_total[1m])
+
+Rien ne passe par la queue de logs.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Array
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from ts341_project.memory_utils import get_rss_bytes
+
+# Compteurs d'un processus (index dans le bloc partagé)
+_FRAMES, _DETECTIONS, _RSS, _STARTED, _UPDATED, _ERRORS = range(6)
+# Statistiques d'un bloc: p50, p95, p99, nombre, somme
+_BLOCK_VALUES = 5
+
+
+class StageMetrics:
+    """
+    Bloc de statistiques partagé d'un processus.
+
+    Créé par l'orchestrateur, passé au processus (seul écrivain) ; lu par
+    l'exporteur. Les percentiles par bloc sont republiés au plus toutes les
+    `publish_interval` secondes.
+    """
+
+    def __init__(self, stage: str, max_blocks: int = 32, publish_interval: float = 1.0):
+        """
+        Args:
+            stage: Nom de l'étape (label 'stage')
+            max_blocks: Nombre max de blocs / sous-étapes publiés
+            publish_interval: Période de mise à jour du RSS et des percentiles
+        """
+        self.stage = stage
+        self.max_blocks = max_blocks
+        self.publish_interval = publish_interval
+        self._counters = Array("d", 6, lock=False)
+        self._block_names = Array("c", max_blocks * 64)
+        self._block_values = Array("d", max_blocks * _BLOCK_VALUES, lock=False)
+        self._next_publish = 0.0
+
+    def frame(self, detections: int = 0, timings=None):
+        """
+        Compte une frame (dans le processus de l'étape).
+
+        Args:
+            detections: Détections trouvées dans la frame
+            timings: LatencyRecorder des durées par bloc (optionnel)
+        """
+        counters = self._counters
+        counters[_FRAMES] += 1
+        counters[_DETECTIONS] += detections
+        now = time.monotonic()
+        if now >= self._next_publish:
+            self._next_publish = now + self.publish_interval
+            self.publish(timings)
+
+    def error(self):
+        """Compte une frame jetée sur exception (dans le processus de l'étape)"""
+        self._counters[_ERRORS] += 1
+
+    def publish(self, timings=None):
+        """Met à jour RSS, horodatage et percentiles par bloc"""
+        counters = self._counters
+        if not counters[_STARTED]:
+            counters[_STARTED] = time.time()
+        counters[_RSS] = get_rss_bytes()
+        counters[_UPDATED] = time.time()
+        if timings is None:
+            return
+
+        histograms = list(timings.histograms.items())[: self.max_blocks]
+        with self._block_names.get_lock():
+            for i, (_, histogram) in enumerate(histograms):
+                base = i * _BLOCK_VALUES
+                self._block_values[base : base + _BLOCK_VALUES] = [
+                    histogram.percentile(50),
+                    histogram.percentile(95),
+                    histogram.percentile(99),
+                    histogram.count,
+                    histogram.total,
+                ]
+            names = "\n".join(name for name, _ in histograms).encode()
+            self._block_names.value = names[: len(self._block_names) - 1]
+
+    def snapshot(self) -> dict:
+        """Lecture des compteurs (depuis n'importe quel processus)"""
+        counters = self._counters[:]
+        with self._block_names.get_lock():
+            raw_names = self._block_names.value.decode(errors="replace")
+            values = self._block_values[:]
+        names = raw_names.split("\n") if raw_names else []
+        blocks = {
+            name: dict(
+                zip(
+                    ("p50", "p95", "p99", "count", "sum"),
+                    values[i * _BLOCK_VALUES : (i + 1) * _BLOCK_VALUES],
+                )
+            )
+            for i, name in enumerate(names)
+        }
+        return {
+            "stage": self.stage,
+            "frames": int(counters[_FRAMES]),
+            "errors": int(counters[_ERRORS]),
+            "detections": int(counters[_DETECTIONS]),
+            "rss_bytes": int(counters[_RSS]),
+            "started": counters[_STARTED],
+            "updated": counters[_UPDATED],
+            "blocks": blocks,
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class MetricsExporter:
+    """
+    Agrège les StageMetrics et les queues, sert /metrics et/ou écrit un fichier.
+
+    Exemple:
+        >>> exporter = MetricsExporter(queues=processor.queues, port=9341)
+        >>> reader_metrics = exporter.stage("reader")  # passé au VideoReader
+        >>> exporter.start()
+    """
+
+    def __init__(
+        self,
+        queues: Callable[[], Iterable] = None,
+        port: int = None,
+        path: str = None,
+        interval: float = 5.0,
+        host: str = "127.0.0.1",
+    ):
+        """
+        Args:
+            queues: Fonction retournant les DeliveryQueue à exposer
+            port: Port HTTP (None = pas de serveur)
+            path: Fichier réécrit toutes les `interval` secondes (None = aucun)
+            interval: Période d'écriture du fichier (secondes)
+            host: Adresse d'écoute du serveur HTTP
+        """
+        self.queues = queues or (lambda: [])
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.host = host
+        self.stages: List[StageMetrics] = []
+        self.server = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def stage(self, name: str) -> StageMetrics:
+        """Crée et enregistre le bloc partagé d'une étape"""
+        metrics = StageMetrics(name)
+        self.stages.append(metrics)
+        return metrics
+
+    def render(self) -> str:
+        """Métriques au format texte Prometheus"""
+        now = time.time()
+        snapshots = [m.snapshot() for m in self.stages]
+        queue_stats = [q.stats() for q in self.queues() if q is not None]
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value}")
+
+        metric(
+            "ts341_frames_total",
+            "counter",
+            "Frames traitées par étape",
+            [(_labels(stage=s["stage"]), s["frames"]) for s in snapshots],
+        )
+        metric(
+            "ts341_frame_errors_total",
+            "counter",
+            "Frames jetées sur exception par étape",
+            [(_labels(stage=s["stage"]), s["errors"]) for s in snapshots],
+        )
+        metric(
+            "ts341_stage_start_time_seconds",
+            "gauge",
+            "Instant (epoch) de la première publication de l'étape",
+            [(_labels(stage=s["stage"]), f"{s['started']:.3f}") for s in snapshots if s["started"]],
+        )
+        metric(
+            "ts341_detections_total",
+            "counter",
+            "Détections par étape",
+            [(_labels(stage=s["stage"]), s["detections"]) for s in snapshots if s["detections"]],
+        )
+        metric(
+            "ts341_process_resident_memory_bytes",
+            "gauge",
+            "Mémoire résidente (RSS) du processus de l'étape",
+            [(_labels(stage=s["stage"]), s["rss_bytes"]) for s in snapshots if s["rss_bytes"]],
+        )
+        metric(
+            "ts341_last_update_age_seconds",
+            "gauge",
+            "Ancienneté de la dernière publication de l'étape",
+            [
+                (_labels(stage=s["stage"]), f"{now - s['updated']:.3f}")
+                for s in snapshots
+                if s["updated"]
+            ],
+        )
+
+        lines.append("# HELP ts341_block_latency_seconds Durée par bloc (percentiles)")
+        lines.append("# TYPE ts341_block_latency_seconds summary")
+        for s in snapshots:
+            for block, values in s["blocks"].items():
+                for key, quantile in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+                    labels = _labels(stage=s["stage"], block=block, quantile=quantile)
+                    lines.append(f"ts341_block_latency_seconds{labels} {values[key]:.6f}")
+                labels = _labels(stage=s["stage"], block=block)
+                lines.append(f"ts341_block_latency_seconds_sum{labels} {values['sum']:.6f}")
+                lines.append(f"ts341_block_latency_seconds_count{labels} {int(values['count'])}")
+
+        for name, key, kind, help_text in (
+            ("ts341_queue_depth", "depth", "gauge", "Éléments en attente dans la queue"),
+            ("ts341_queue_capacity", "maxsize", "gauge", "Capacité de la queue"),
+            ("ts341_queue_bytes", "bytes", "gauge", "Octets d'image en attente"),
+            ("ts341_queue_delivered_total", "delivered", "counter", "Éléments livrés"),
+            ("ts341_queue_dropped_total", "dropped", "counter", "Éléments jetés (politique)"),
+            (
+                "ts341_queue_blocked_seconds_total",
+                "blocked_s",
+                "counter",
+                "Temps passé par les producteurs à attendre une place",
+            ),
+        ):
+            metric(
+                name,
+                kind,
+                help_text,
+                [
+                    (_labels(queue=q["name"], policy=q["policy"]), q[key])
+                    for q in queue_stats
+                ],
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Écrit le fichier de métriques (remplacement atomique)"""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render())
+        tmp.replace(path)
+
+    def _file_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        """Démarre le serveur HTTP et/ou l'écriture périodique (threads daemon)"""
+        if self.port is not None:
+            exporter = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = exporter.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # Pas de ligne de log par scrape
+
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.port = self.server.server_address[1]
+            thread = threading.Thread(
+                target=self.server.serve_forever, name="metrics-http", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        if self.path is not None:
+            thread = threading.Thread(target=self._file_loop, name="metrics-file", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Arrête les threads ; le fichier reçoit un dernier état"""
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        if self.path is not None:
+            self.write()
@@ -0,0 +1,301 @@
+"""
+ProcessProfiler - Profilage de chaque processus du pipeline
+
+Le target d'un processus (VideoReader._reader_process, ...) est enveloppé :
+le processus tourne sous cProfile, ou sous un échantillonneur de pile (thread
+qui relève la pile du thread principal toutes les `interval` secondes, coût
+quasi nul), puis écrit son profil à l'arrêt, nommé d'après son rôle :
+    <dossier>/<rôle>-<pid>.prof          (cProfile, lisible avec pstats/snakeviz)
+    <dossier>/<rôle>-<pid>.samples.json  (échantillons + piles repliées)
+
+Fusion en un rapport (temps cumulé par fonction, attribution par bloc) :
+    python -m ts341_project.ProcessProfiler profiles/ [--top 25] [-o rapport.txt]
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+MODES = ("cprofile", "sample")
+
+# Dossiers des blocs de traitement (attribution par bloc)
+_BLOCK_DIRS = ("image_block", "video_block")
+# Méthodes d'entrée d'un bloc, attribuées à la classe qui les définit
+_BLOCK_METHODS = ("process", "process_with_memory")
+# Bases dont process() générique délègue à process_with_memory() de la sous-classe
+# (héritée par plusieurs blocs : non attribuée, sinon ils seraient confondus)
+_DELEGATING_BASES = ("StatefulProcessingBlock",)
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    """
+    Profilage des processus.
+
+    Attributes:
+        directory: Dossier des profils (un fichier par processus)
+        mode: 'cprofile' (déterministe) ou 'sample' (échantillonnage de pile)
+        interval: Période d'échantillonnage (secondes, mode 'sample')
+    """
+
+    directory: str = "profiles"
+    mode: str = "cprofile"
+    interval: float = 0.005
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Mode de profilage inconnu: {self.mode} ({', '.join(MODES)})")
+
+
+class StackSampler:
+    """
+    Échantillonneur de pile du thread qui l'a démarré.
+
+    Les piles s'arrêtent au frame appelant start() : après un fork, les frames
+    du parent (main, VideoProcessor.start, ...) ne sont pas comptés.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self.self_counts = Counter()  # (qualname, fichier, ligne) -> échantillons en tête de pile
+        self.cum_counts = Counter()  # (qualname, fichier, ligne) -> échantillons dans la pile
+        self.stacks = Counter()  # pile repliée 'a;b;c' -> échantillons
+        self._stop = threading.Event()
+        self._thread = None
+        self._root = None
+
+    def _sample(self, frame):
+        keys = []
+        while frame is not None and frame is not self._root:
+            code = frame.f_code
+            keys.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        if not keys:
+            return
+        self.samples += 1
+        self.self_counts[keys[0]] += 1
+        self.cum_counts.update(set(keys))
+        self.stacks[";".join(name for name, _, _ in reversed(keys))] += 1
+
+    def _run(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def start(self):
+        self._root = sys._getframe(1)
+        self._thread = threading.Thread(
+            target=self._run, args=(threading.get_ident(),), name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def dump(self, path: Path, role: str):
+        functions = [
+            {
+                "name": name,
+                "file": filename,
+                "line": line,
+                "self": self.self_counts[key],
+                "cum": count,
+            }
+            for key, count in self.cum_counts.most_common()
+            for name, filename, line in [key]
+        ]
+        path.write_text(
+            json.dumps(
+                {
+                    "role": role,
+                    "pid": os.getpid(),
+                    "interval": self.interval,
+                    "samples": self.samples,
+                    "functions": functions,
+                    "stacks": dict(self.stacks),
+                }
+            )
+        )
+
+
+def _role_stem(role: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", role).strip("_") or "process"
+
+
+class ProfiledTarget:
+    """Target de processus exécuté sous profileur (picklable si le target l'est)"""
+
+    def __init__(self, target: Callable, config: ProfileConfig, role: str):
+        self.target = target
+        self.config = config
+        self.role = role
+
+    def __call__(self, *args, **kwargs):
+        directory = Path(self.config.directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{_role_stem(self.role)}-{os.getpid()}"
+
+        if self.config.mode == "sample":
+            sampler = StackSampler(self.config.interval)
+            sampler.start()
+            try:
+                return self.target(*args, **kwargs)
+            finally:
+                sampler.stop()
+                sampler.dump(directory / f"{stem}.samples.json", self.role)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return self.target(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(directory / f"{stem}.prof"))
+
+
+def profiled(target: Callable, config: ProfileConfig, role: str) -> Callable:
+    """Target du processus, enveloppé si le profilage est activé (config non None)"""
+    return target if config is None else ProfiledTarget(target, config, role)
+
+
+# --- Fusion des profils ---
+
+
+def _block_name(name: str, filename: str):
+    """
+    Nom du bloc si la fonction est une méthode d'entrée d'un bloc (process(),
+    process_with_memory()), sinon None.
+
+    Le bloc est la classe qui définit la méthode : qualname en mode 'sample',
+    nom du fichier en mode cProfile (qui ne garde que co_name ; un bloc par
+    module). Le process() hérité de StatefulProcessingBlock est ignoré : le
+    temps de chaque bloc à mémoire est porté par son process_with_memory().
+    """
+    method = name.split(".")[-1]
+    if method not in _BLOCK_METHODS:
+        return None
+    parts = Path(filename).parts
+    if not any(d in parts for d in _BLOCK_DIRS):
+        return None
+    block = name.split(".")[-2] if "." in name else Path(filename).stem
+    if method == "process" and block in _DELEGATING_BASES:
+        return None
+    return block
+
+
+def _load_profile(path: Path) -> dict:
+    """
+    Profil normalisé : {'role', 'total', 'functions': [(nom, fichier, ligne, self, cum)]}
+    (durées en secondes)
+    """
+    if path.name.endswith(".samples.json"):
+        data = json.loads(path.read_text())
+        interval = data["interval"]
+        return {
+            "role": data["role"],
+            "kind": "échantillons",
+            "total": data["samples"] * interval,
+            "functions": [
+                (f["name"], f["file"], f["line"], f["self"] * interval, f["cum"] * interval)
+                for f in data["functions"]
+            ],
+        }
+
+    stats = pstats.Stats(str(path))
+    role = path.stem.rsplit("-", 1)[0]
+    return {
+        "role": role,
+        "kind": "cProfile",
+        "total": stats.total_tt,
+        "functions": [
+            (funcname, filename, line, tt, ct)
+            for (filename, line, funcname), (_, _, tt, ct, _) in stats.stats.items()
+        ],
+    }
+
+
+def merge_profiles(directory: str, top: int = 25) -> str:
+    """
+    Rapport fusionné des profils d'un dossier.
+
+    Sections : temps par processus, fonctions les plus coûteuses (temps
+    cumulé, tous processus), attribution par bloc (méthodes d'entrée de chaque bloc).
+    """
+    paths = sorted(Path(directory).glob("*.prof")) + sorted(
+        Path(directory).glob("*.samples.json")
+    )
+    if not paths:
+        return f"Aucun profil dans {directory}"
+    profiles = [_load_profile(path) for path in paths]
+
+    lines = ["Processus:"]
+    for profile in profiles:
+        lines.append(f"  {profile['role']:<32s} {profile['total']:>9.2f}s  ({profile['kind']})")
+
+    # Fonctions: temps cumulé (rôle conservé pour situer la fonction)
+    functions = []
+    for profile in profiles:
+        for name, filename, line, self_time, cum in profile["functions"]:
+            functions.append((cum, self_time, profile["role"], name, filename, line))
+    functions.sort(reverse=True)
+
+    lines.append("")
+    lines.append(f"Top {top} - temps cumulé:")
+    lines.append(f"  {'cumulé':>9s} {'propre':>9s}  {'processus':<20s} fonction")
+    for cum, self_time, role, name, filename, line in functions[:top]:
+        location = f"{Path(filename).name}:{line}" if line else filename
+        lines.append(f"  {cum:>8.2f}s {self_time:>8.2f}s  {role:<20s} {name} ({location})")
+
+    # Attribution par bloc
+    blocks: Dict[tuple, List[float]] = {}
+    totals = {profile["role"]: profile["total"] for profile in profiles}
+    for cum, self_time, role, name, filename, line in functions:
+        block = _block_name(name, filename)
+        if block is not None:
+            entry = blocks.setdefault((role, block), [0.0, 0.0])
+            # process() englobe process_with_memory() d'un même bloc : pas de cumul
+            entry[0] = max(entry[0], cum)
+            entry[1] += self_time
+
+    lines.append("")
+    if blocks:
+        lines.append(
+            "Attribution par bloc (process() / process_with_memory(), temps cumulé, "
+            "blocs imbriqués inclus dans leur parent):"
+        )
+        for (role, block), (cum, _) in sorted(blocks.items(), key=lambda item: -item[1][0]):
+            share = 100.0 * cum / totals[role] if totals.get(role) else 0.0
+            lines.append(f"  {block:<32s} {cum:>8.2f}s  {share:5.1f} %  ({role})")
+    else:
+        lines.append("Attribution par bloc: aucun bloc trouvé")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusion des profils par processus")
+    parser.add_argument("directory", nargs="?", default="profiles", help="Dossier des profils")
+    parser.add_argument("--top", type=int, default=25, help="Fonctions listées (défaut: 25)")
+    parser.add_argument("-o", "--output", metavar="FICHIER", help="Écrire le rapport dans un fichier")
+    args = parser.parse_args()
+
+    report = merge_profiles(args.directory, top=args.top)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
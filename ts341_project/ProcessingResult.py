@@ -1,12 +1,20 @@
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 
 @dataclass
 class ProcessingResult:
     """
     Résultat d'un traitement contenant l'image et des métadonnées.
+
+    `metadata` contient les informations par frame transmises aux consommateurs
+    (voir ResultSchema) ; `scratch` contient les données internes aux étapes
+    (masques, images intermédiaires) qui ne quittent jamais le processor.
+    `pts` est l'horodatage de la frame dans la source, transmis aux sinks
+    (sortie à cadence variable) ; `frame_number` son index dans la source
+    (enregistrements de debug alignés sur la source malgré stride, plage ou
+    frames jetées).
     """
 
     frame: np.ndarray
@@ -14,7 +22,10 @@ class ProcessingResult:
         default_factory=list
     )  # [(x, y, w, h), ...]
     metadata: Dict[str, Any] = field(default_factory=dict)
+    scratch: Dict[str, Any] = field(default_factory=dict)
     processing_time: float = 0.0
+    pts: Optional[float] = None  # Horodatage source (secondes), None si inconnu
+    frame_number: Optional[int] = None  # Index source (1-based), None si inconnu
 
     def add_box(self, x: int, y: int, w: int, h: int):
         """Ajoute des coordonnées de boîte englobante"""
@@ -0,0 +1,359 @@
+"""
+ProcessingSession - Session de traitement persistante (workers chauds)
+
+Les workers restent démarrés entre les jobs avec leurs pipelines déjà
+construits (patterns chargés, ORB créé) : un job (source + sortie) ne paie ni
+le démarrage des processus, ni les imports, ni la construction du pipeline.
+L'état propre à une vidéo (fond MOG2, frame précédente...) est remis à zéro
+entre deux jobs (ProcessingPipeline.reset).
+
+Chaque worker traite un job de bout en bout (lecture, pipeline, écriture) ;
+plusieurs workers traitent plusieurs clips en parallèle. Pas d'affichage :
+destiné aux traitements en lot et à l'interface Streamlit.
+"""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import Event, Process, Queue
+from pathlib import Path
+from queue import Empty
+from typing import Any, Dict, Iterable, Optional
+
+import cv2
+
+from ts341_project.VideoProcessor import VideoProcessor
+from ts341_project.VideoReader import SourceCursor
+from ts341_project.logging_utils import get_logger
+from ts341_project.pipeline.PipelineRegistry import create_pipeline, pipeline_input_format
+from ts341_project.sources import open_capture
+from ts341_project.storage.StorageProcess import OutputWriter
+
+
+@dataclass
+class ProcessingJob:
+    """
+    Job soumis à la session.
+
+    Attributes:
+        source: Chemin vidéo ou séquence d'images
+        output_path: Fichier de sortie (None = traitement sans sauvegarde)
+        pipeline: Nom du pipeline (défaut: premier pipeline préchargé)
+        codec: Codec du VideoWriter
+        start: Début de la plage traitée (secondes)
+        end: Fin de la plage traitée (secondes)
+        stride: Traiter une frame sur `stride`
+        job_id: Identifiant attribué par la session
+    """
+
+    source: Any
+    output_path: Optional[str] = None
+    pipeline: str = None
+    codec: str = "mp4v"
+    start: float = None
+    end: float = None
+    stride: int = 1
+    job_id: int = 0
+
+
+@dataclass
+class JobResult:
+    """Résultat d'un job (error renseigné en cas d'échec)"""
+
+    job_id: int
+    source: str
+    output_path: Optional[str] = None
+    frames: int = 0
+    elapsed: float = 0.0
+    worker: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProcessingSession:
+    """
+    Pool de workers persistants avec pipelines préchargés.
+
+    Exemple:
+        >>> with ProcessingSession(preload=["drone-detection"]) as session:
+        ...     for clip in clips:
+        ...         result = session.run(clip, output_path=f"out/{Path(clip).stem}.mp4")
+    """
+
+    def __init__(
+        self,
+        preload: Iterable[str] = ("drone-detection",),
+        workers: int = 1,
+        reader_backend: str = "opencv",
+        frame_cache: str = None,
+        ready_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            preload: Pipelines construits au démarrage de chaque worker (les
+                     autres sont construits au premier job qui les demande,
+                     puis gardés)
+            workers: Nombre de processus (jobs traités en parallèle)
+            reader_backend: 'opencv' ou 'ffmpeg'
+            frame_cache: Dossier du cache de frames décodées (optionnel)
+            ready_timeout: Attente max du préchargement au démarrage (secondes)
+        """
+        self.preload = list(preload)
+        self.workers = max(1, int(workers))
+        self.reader_backend = reader_backend
+        self.frame_cache = frame_cache
+        self.ready_timeout = ready_timeout
+        self.logger = get_logger(__name__)
+
+        self.stop_event = Event()
+        self.job_queue = Queue()
+        self.result_queue = Queue()
+        self.ready_events = []
+        self.processes = []
+
+        self._job_ids = itertools.count(1)
+        self._results: Dict[int, JobResult] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self.processes)
+
+    @staticmethod
+    def _capture_options(job, pipeline, reader_backend, frame_cache) -> dict:
+        """Options de lecture d'un job (format d'entrée du pipeline si applicable)"""
+        return VideoProcessor._source_capture_options(
+            job.source, reader_backend, pipeline_input_format(pipeline), frame_cache
+        )
+
+    @staticmethod
+    def _run_job(job, pipeline, capture_options, stop_event, logger) -> JobResult:
+        """Lecture, traitement et écriture d'un job (dans le worker)"""
+        t0 = time.time()
+        result = JobResult(job.job_id, str(job.source), job.output_path)
+        cap = output = None
+
+        try:
+            # Pas appliqué dans le décodeur quand le backend le permet (ffmpeg)
+            cap = open_capture(job.source, stride=job.stride, **capture_options)
+            if not cap.isOpened():
+                result.error = f"Impossible d'ouvrir la source: {job.source}"
+                return result
+
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            cursor = SourceCursor(cap, fps, job.start, job.end, job.stride)
+
+            while not stop_event.is_set() and cursor.skip():
+                ret, frame = cursor.read()
+                if not ret:
+                    break
+                pts = cursor.pts()
+
+                processed = pipeline.process(frame, pts, cursor.position)
+                result.frames += 1
+                if job.output_path is None:
+                    continue
+
+                # Sortie ouverte à la première frame traitée (taille de sortie du pipeline)
+                if output is None:
+                    height, width = processed.frame.shape[:2]
+                    output = OutputWriter(
+                        job.output_path, fps / cursor.stride, width, height, job.codec, logger
+                    )
+                    if not output.opened:
+                        result.error = f"Impossible d'ouvrir la sortie: {job.output_path}"
+                        return result
+                output.write(processed.frame, pts)
+
+            if output is not None:
+                output.finalize()
+        finally:
+            if cap is not None:
+                cap.release()
+            if output is not None:
+                output.release()
+            result.elapsed = time.time() - t0
+        return result
+
+    @staticmethod
+    def _worker_process(
+        worker_id,
+        job_queue,
+        result_queue,
+        ready_event,
+        stop_event,
+        preload,
+        reader_backend,
+        frame_cache,
+    ):
+        """Processus worker : pipelines construits une fois, un job à la fois"""
+        logger = get_logger(__name__)
+        t0 = time.time()
+        pipelines = {}
+
+        def pipeline_for(name):
+            if name not in pipelines:
+                pipelines[name] = create_pipeline(name)
+            return pipelines[name]
+
+        for name in preload:
+            pipeline_for(name)
+        ready_event.set()
+        logger.info(
+            f"Worker {worker_id} prêt en {time.time() - t0:.2f}s "
+            f"(pipelines: {', '.join(preload) or '-'})"
+        )
+
+        jobs = 0
+        while not stop_event.is_set():
+            try:
+                job = job_queue.get(timeout=0.5)
+            except Empty:
+                continue
+            if job is None:
+                break
+
+            try:
+                name = job.pipeline or (preload[0] if preload else "passthrough")
+                pipeline = pipeline_for(name)
+                pipeline.reset()
+                options = ProcessingSession._capture_options(
+                    job, pipeline, reader_backend, frame_cache
+                )
+                result = ProcessingSession._run_job(
+                    job, pipeline, options, stop_event, logger
+                )
+            except Exception as e:
+                result = JobResult(job.job_id, str(job.source), job.output_path)
+                result.error = f"{type(e).__name__}: {e}"
+
+            result.worker = worker_id
+            jobs += 1
+            if result.ok:
+                logger.info(
+                    f"Worker {worker_id}: job {job.job_id} terminé - "
+                    f"{result.frames} frames en {result.elapsed:.2f}s ({result.fps:.1f} FPS)"
+                )
+            else:
+                logger.error(f"Worker {worker_id}: job {job.job_id} en échec - {result.error}")
+            result_queue.put(result)
+
+        for pipeline in pipelines.values():
+            pipeline.close()
+        logger.info(f"Worker {worker_id} arrêté - {jobs} jobs")
+
+    def start(self):
+        """Démarre les workers et attend le préchargement des pipelines"""
+        if self.started:
+            return self
+
+        t0 = time.time()
+        for worker_id in range(self.workers):
+            ready_event = Event()
+            process = Process(
+                target=ProcessingSession._worker_process,
+                args=(
+                    worker_id,
+                    self.job_queue,
+                    self.result_queue,
+                    ready_event,
+                    self.stop_event,
+                    self.preload,
+                    self.reader_backend,
+                    self.frame_cache,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.ready_events.append(ready_event)
+            self.processes.append(process)
+
+        deadline = t0 + self.ready_timeout
+        for ready_event in self.ready_events:
+            if not ready_event.wait(timeout=max(0.0, deadline - time.time())):
+                self.logger.warning("Préchargement incomplet à l'expiration du délai")
+                break
+        self.logger.info(
+            f"Session prête: {self.workers} worker(s) en {time.time() - t0:.2f}s"
+        )
+        return self
+
+    def submit(self, source: Any, output_path: str = None, **options) -> int:
+        """
+        Soumet un job (démarre la session si nécessaire).
+
+        Args:
+            source: Chemin vidéo ou séquence d'images
+            output_path: Fichier de sortie (None = sans sauvegarde)
+            **options: Champs de ProcessingJob (pipeline, codec, start, end, stride)
+
+        Returns:
+            Identifiant du job
+        """
+        self.start()
+        if output_path is not None:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        job = ProcessingJob(
+            source=source, output_path=output_path, job_id=next(self._job_ids), **options
+        )
+        self.job_queue.put(job)
+        return job.job_id
+
+    def result(self, job_id: int, timeout: float = None) -> JobResult:
+        """
+        Attend le résultat d'un job.
+
+        Raises:
+            TimeoutError: Si le job n'est pas terminé après `timeout` secondes
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._lock:
+            while job_id not in self._results:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Job {job_id} non terminé")
+                if not any(p.is_alive() for p in self.processes):
+                    raise RuntimeError("Aucun worker actif")
+                try:
+                    result = self.result_queue.get(
+                        timeout=0.5 if remaining is None else min(0.5, remaining)
+                    )
+                except Empty:
+                    continue
+                self._results[result.job_id] = result
+            return self._results.pop(job_id)
+
+    def run(self, source: Any, output_path: str = None, **options) -> JobResult:
+        """Soumet un job et attend son résultat"""
+        return self.result(self.submit(source, output_path, **options))
+
+    def close(self):
+        """Arrête les workers (les jobs en cours se terminent)"""
+        if not self.started:
+            return
+        for _ in self.processes:
+            self.job_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=10.0)
+            if process.is_alive():
+                self.stop_event.set()
+                process.join(timeout=2.0)
+                if process.is_alive():
+                    process.terminate()
+        self.processes = []
+        self.ready_events = []
+        self.logger.info("Session fermée")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,118 @@
+"""
+ResultSchema - Schéma typé des métadonnées transmises entre processus
+
+Seules les métadonnées par frame (scalaires, détections) traversent les queues.
+Les données internes aux étapes (masques, images intermédiaires) vivent dans
+`ProcessingResult.scratch` et ne sont jamais envoyées.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Encodage binaire d'une détection (19 octets au lieu d'un dict picklé)
+DETECTION_DTYPE = np.dtype(
+    [
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("w", "<i4"),
+        ("h", "<i4"),
+        ("is_drone", "?"),
+        ("num_matches", "<u2"),
+    ]
+)
+
+# Champs transportables et leurs types attendus
+TRANSPORT_FIELDS: Dict[str, tuple] = {
+    "drone_detections": (list, bytes),
+    "num_detections": (int,),
+    "num_confirmed_drones": (int,),
+    "drone_center": (tuple, type(None)),
+    "confidence": (int, float, type(None)),
+    "coord_display": (str,),
+    "foreground_pixels": (int, np.integer),
+    "motion_count": (int,),
+}
+
+_SCALAR_TYPES = (int, float, str, bool, np.integer, np.floating, type(None))
+
+
+def detection_label(is_drone: bool, num_matches: int) -> str:
+    """Libellé d'affichage d'une détection (identique à ContourMatchingBlock)."""
+    return f"Drone détecté ({num_matches})" if is_drone else "Poss. Drone"
+
+
+def encode_detections(detections: List[dict]) -> bytes:
+    """Encode une liste de détections {bbox, is_drone, num_matches} en binaire."""
+    records = np.empty(len(detections), dtype=DETECTION_DTYPE)
+    for i, det in enumerate(detections):
+        x, y, w, h = det["bbox"]
+        records[i] = (x, y, w, h, det["is_drone"], det["num_matches"])
+    return records.tobytes()
+
+
+def decode_detections(data: bytes) -> List[dict]:
+    """Inverse de encode_detections (le label est reconstruit)."""
+    records = np.frombuffer(data, dtype=DETECTION_DTYPE)
+    return [
+        {
+            "bbox": (int(r["x"]), int(r["y"]), int(r["w"]), int(r["h"])),
+            "is_drone": bool(r["is_drone"]),
+            "num_matches": int(r["num_matches"]),
+            "label": detection_label(bool(r["is_drone"]), int(r["num_matches"])),
+        }
+        for r in records
+    ]
+
+
+class MetadataSchema:
+    """
+    Filtre et encode les métadonnées d'un ProcessingResult pour un consommateur.
+
+    Un consommateur s'abonne à une liste de champs (None = tous les champs
+    transportables, liste vide = aucune métadonnée).
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        """
+        Args:
+            fields: Champs souscrits (None = tous)
+        """
+        self.fields = None if fields is None else frozenset(fields)
+
+    def _accepts(self, key: str, value: Any) -> bool:
+        if self.fields is not None and key not in self.fields:
+            return False
+        expected = TRANSPORT_FIELDS.get(key)
+        if expected is not None:
+            return isinstance(value, expected)
+        # Champ non déclaré : seuls les scalaires passent (jamais de tableaux)
+        return isinstance(value, _SCALAR_TYPES)
+
+    def pack(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Retourne le dict à envoyer dans la queue."""
+        if self.fields is not None and not self.fields:
+            return {}
+
+        packed = {}
+        for key, value in metadata.items():
+            if not self._accepts(key, value):
+                continue
+            if key == "drone_detections" and isinstance(value, list):
+                value = encode_detections(value)
+            packed[key] = value
+        return packed
+
+    @staticmethod
+    def unpack(packed: Dict[str, Any]) -> Dict[str, Any]:
+        """Décode un dict reçu depuis une queue (côté consommateur)."""
+        metadata = dict(packed)
+        if isinstance(metadata.get("drone_detections"), bytes):
+            metadata["drone_detections"] = decode_detections(
+                metadata["drone_detections"]
+            )
+        return metadata
+
+    def __repr__(self):
+        fields = "all" if self.fields is None else sorted(self.fields)
+        return f"MetadataSchema(fields={fields})"
@@ -0,0 +1,111 @@
+"""
+SharedFrameRing - Anneau de frames en mémoire partagée
+
+Le reader écrit chaque frame décodée une seule fois dans un slot de mémoire
+partagée et n'envoie dans les queues qu'une référence (slot, forme, dtype).
+Chaque consommateur (un processor par pipeline) copie le slot localement puis
+le libère ; le slot redevient disponible quand tous les consommateurs l'ont lu.
+"""
+
+import time
+from multiprocessing import Array, Semaphore
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+
+class SharedFrameRing:
+    """
+    Anneau de `slots` frames de taille max `slot_bytes` partagé entre processus.
+
+    Le producteur attend un slot libre (backpressure) ; un slot est libre
+    quand son compteur de références retombe à 0.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int, consumers: int = 1):
+        """
+        Args:
+            slots: Nombre de frames en vol
+            slot_bytes: Taille max d'une frame (ex: w * h * 3)
+            consumers: Nombre de lecteurs de chaque frame
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.consumers = consumers
+
+        self.shm = SharedMemory(create=True, size=slots * slot_bytes)
+        self._refs = Array("i", slots)
+        self._free = Semaphore(slots)
+        self._next = 0  # Prochain slot essayé (côté producteur)
+
+    @property
+    def nbytes(self) -> int:
+        return self.slots * self.slot_bytes
+
+    def _slot_view(self, slot: int, shape: tuple, dtype: str) -> np.ndarray:
+        return np.ndarray(
+            shape, dtype=np.dtype(dtype), buffer=self.shm.buf, offset=slot * self.slot_bytes
+        )
+
+    def put(self, frame: np.ndarray, stop_event=None) -> Optional[dict]:
+        """
+        Copie une frame dans un slot libre (attend si l'anneau est plein).
+
+        Returns:
+            Référence à envoyer aux consommateurs, None si arrêt demandé
+        """
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(
+                f"Frame de {frame.nbytes} octets > slot de {self.slot_bytes} octets"
+            )
+
+        while not self._free.acquire(timeout=0.1):
+            if stop_event is not None and stop_event.is_set():
+                return None
+
+        with self._refs.get_lock():
+            for i in range(self.slots):
+                slot = (self._next + i) % self.slots
+                if self._refs[slot] == 0:
+                    self._refs[slot] = self.consumers
+                    break
+        self._next = (slot + 1) % self.slots
+
+        self._slot_view(slot, frame.shape, frame.dtype.str)[...] = frame
+        return {"slot": slot, "shape": frame.shape, "dtype": frame.dtype.str}
+
+    def get(self, ref: dict) -> np.ndarray:
+        """Copie locale de la frame référencée, puis libération du slot"""
+        frame = self._slot_view(ref["slot"], ref["shape"], ref["dtype"]).copy()
+        self.release(ref)
+        return frame
+
+    def release(self, ref: dict):
+        """Rend la référence d'un consommateur (lecture terminée ou message jeté)"""
+        if not isinstance(ref, dict):
+            return
+        ref = ref.get("frame_ref", ref)
+        if "slot" not in ref:
+            return
+        with self._refs.get_lock():
+            self._refs[ref["slot"]] -= 1
+            freed = self._refs[ref["slot"]] == 0
+        if freed:
+            self._free.release()
+
+    def in_use(self) -> int:
+        """Nombre de slots occupés"""
+        with self._refs.get_lock():
+            return sum(1 for r in self._refs if r > 0)
+
+    def close(self):
+        """Libère la mémoire partagée (processus créateur, après arrêt des lecteurs)"""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self):
+        return f"SharedFrameRing(slots={self.slots}, slot_bytes={self.slot_bytes})"
@@ -0,0 +1,194 @@
+"""
+TimelineTrace - Chronologie multiprocessus (format Chrome trace / Perfetto)
+
+Chaque processus enregistre ses intervalles (lecture, attente en queue,
+pipeline, blocs, affichage, écriture) dans un anneau en mémoire, avec pid et
+tid. À l'arrêt du processus, l'anneau est écrit dans un fichier partiel ;
+l'orchestrateur fusionne les fichiers en un JSON « trace event » à ouvrir dans
+https://ui.perfetto.dev ou chrome://tracing.
+
+Désactivé par défaut : span() retourne alors un contexte vide partagé (un test
+sur une globale, aucune allocation).
+
+Horloge : time.monotonic(), commune à tous les processus de la machine.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+_tracer = None  # Tracer du processus courant (None = désactivé)
+
+
+class _NullSpan:
+    """Contexte vide (traçage désactivé)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.category, self.start, time.monotonic(), self.args)
+        return False
+
+
+class TimelineTracer:
+    """Anneau d'événements d'un processus"""
+
+    def __init__(self, directory: str, role: str, capacity: int = 100_000):
+        """
+        Args:
+            directory: Dossier des fichiers partiels (un par processus)
+            role: Nom du processus dans la chronologie (reader, processor...)
+            capacity: Nombre max d'événements gardés (les plus anciens sont perdus)
+        """
+        self.directory = Path(directory)
+        self.role = role
+        self.pid = os.getpid()
+        self.events = deque(maxlen=capacity)
+        self.recorded = 0
+
+    def complete(self, name: str, category: str, start: float, end: float, args=None):
+        """Intervalle [start, end] (secondes, time.monotonic())"""
+        self.events.append((name, category, start, end, threading.get_native_id(), args))
+        self.recorded += 1
+
+    def flush(self) -> Path:
+        """Écrit l'anneau dans le fichier partiel du processus"""
+        thread_names = {t.native_id: t.name for t in threading.enumerate()}
+        events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self.pid,
+                "tid": tid,
+                **({"args": args} if args else {}),
+            }
+            for name, category, start, end, tid, args in self.events
+        ]
+        part = {
+            "role": self.role,
+            "pid": self.pid,
+            "threads": {str(tid): name for tid, name in thread_names.items()},
+            "dropped": self.recorded - len(self.events),
+            "events": events,
+        }
+        path = self.directory / f"{self.role}-{self.pid}.json".replace(" ", "_")
+        path.write_text(json.dumps(part))
+        return path
+
+
+class BlockTraceRecorder:
+    """
+    Enregistreur compatible LatencyRecorder (ProcessingPipeline.enable_timing) :
+    chaque durée de bloc devient un intervalle se terminant maintenant.
+    """
+
+    def __init__(self, tracer: TimelineTracer, timings=None):
+        """
+        Args:
+            tracer: Tracer du processus
+            timings: LatencyRecorder recevant aussi les durées (optionnel)
+        """
+        self.tracer = tracer
+        self.timings = timings
+
+    def record(self, name: str, seconds: float):
+        end = time.monotonic()
+        self.tracer.complete(name, "block", end - seconds, end)
+        if self.timings is not None:
+            self.timings.record(name, seconds)
+
+
+def start_tracing(directory: Optional[str], role: str) -> Optional[TimelineTracer]:
+    """Active le traçage dans le processus courant (sans effet si directory est None)"""
+    global _tracer
+    if directory is None:
+        return None
+    _tracer = TimelineTracer(directory, role)
+    return _tracer
+
+
+def stop_tracing():
+    """Écrit les événements du processus courant et désactive le traçage"""
+    global _tracer
+    if _tracer is not None:
+        _tracer.flush()
+        _tracer = None
+
+
+def current_tracer() -> Optional[TimelineTracer]:
+    return _tracer
+
+
+def span(name: str, category: str = "stage", **args):
+    """
+    Intervalle tracé (contexte) : `with span("pipeline", frame=n): ...`
+    Contexte vide si le traçage est désactivé.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def merge_traces(directory: str, output_path: str) -> dict:
+    """
+    Fusionne les fichiers partiels en un JSON trace event (Perfetto).
+
+    Returns:
+        {'processes': n, 'events': n, 'dropped': n}
+    """
+    events = []
+    dropped = 0
+    parts = sorted(Path(directory).glob("*.json"))
+    for part_path in parts:
+        part = json.loads(part_path.read_text())
+        pid = part["pid"]
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": part["role"]}}
+        )
+        for tid, thread_name in part["threads"].items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": int(tid),
+                    "args": {"name": thread_name},
+                }
+            )
+        events.extend(part["events"])
+        dropped += part["dropped"]
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return {
+        "processes": len(parts),
+        "events": sum(1 for e in events if e["ph"] == "X"),
+        "dropped": dropped,
+    }
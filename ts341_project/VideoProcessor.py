@@ -4,7 +4,10 @@ NewVideoProcessor - Orchestrateur multiprocessus propre
 Composition de tous les processus avec architecture statique pour éviter les problèmes de pickling.
 """
 
-from multiprocessing import Queue, Event
+from multiprocessing import Event
+from pathlib import Path
+import shutil
+import tempfile
 from typing import Any, Union, Type
 import cv2
 import time
@@ -12,9 +15,23 @@ import time
 from ts341_project.VideoReader import VideoReader
 from ts341_project.pipeline.PipelineProcessor import PipelineProcessor
 from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
+from ts341_project.pipeline.PipelineRegistry import named_pipelines, shared_input_format
+from ts341_project.sources import (
+    open_capture,
+    is_image_sequence,
+    FFmpegCapture,
+    ImageSequenceCapture,
+)
 from ts341_project.display import NewDisplayProcess
 from ts341_project.storage import NewStorageProcess
 from ts341_project.logging_utils import get_logger
+from ts341_project.FrameCodec import FrameCodec
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.SharedFrameRing import SharedFrameRing
+from ts341_project.memory_utils import format_bytes
+from ts341_project.TimelineTrace import merge_traces
+from ts341_project.PipelineMetrics import MetricsExporter
+from ts341_project.ProcessProfiler import ProfileConfig, merge_profiles
 
 
 class VideoProcessor:
@@ -25,10 +42,17 @@ class VideoProcessor:
     de pickling (Queue/Event dans self).
     """
 
+    DEFAULT_DELIVERY_POLICIES = {
+        "processor": "block",
+        "storage": "block",
+        "display": "drop_oldest",
+        "display_raw": "drop_oldest",
+    }
+
     def __init__(
         self,
         source: Any,
-        pipeline: Union[str, ProcessingPipeline, Type[ProcessingPipeline]],
+        pipeline: Union[str, ProcessingPipeline, Type[ProcessingPipeline], list, dict],
         enable_display: bool = True,
         enable_display_raw: bool = False,
         enable_storage: bool = False,
@@ -38,11 +62,39 @@ class VideoProcessor:
         max_display_height: int = 720,
         realtime: bool = False,
         codec: str = "mp4v",
+        metadata_fields: dict = None,
+        display_codec: str = "raw",
+        jpeg_quality: int = 80,
+        delivery_policies: dict = None,
+        queue_budget_mb: float = 64.0,
+        reader_backend: str = "opencv",
+        decode_width: int = None,
+        decode_pixel_format: str = None,
+        frame_cache: str = None,
+        live: bool = False,
+        start: float = None,
+        end: float = None,
+        stride: int = 1,
+        block_timing: float = None,
+        latency_trace: bool = False,
+        timeline_path: str = None,
+        metrics_port: int = None,
+        metrics_file: str = None,
+        metrics_interval: float = 5.0,
+        profile: str = None,
+        profile_dir: str = "profiles",
     ):
         """
         Args:
-            source: Source vidéo (chemin, int webcam, etc.)
-            pipeline: Pipeline de traitement (str, ProcessingPipeline instance, ou classe)
+            source: Source vidéo (chemin, int webcam, séquence d'images: dossier,
+                    motif glob ou fichier index)
+            pipeline: Pipeline de traitement (str, PipelineConfig, ProcessingPipeline
+                      instance, ou classe ; sauf une instance, il est construit
+                      dans le processus de traitement),
+                      ou liste / dict {nom: pipeline} : la source est décodée une
+                      seule fois (anneau en mémoire partagée), chaque pipeline a
+                      son processor, sa fenêtre '<display_window> [nom]' et son
+                      fichier '<output>_<nom>.mp4'
             enable_display: Activer affichage du traité
             enable_display_raw: Activer affichage de l'original (live)
             enable_storage: Activer sauvegarde
@@ -52,9 +104,58 @@ class VideoProcessor:
             max_display_height: Hauteur max affichage
             realtime: Mode temps réel (limiter FPS)
             codec: Codec vidéo (mp4v, MJPG, etc.)
+            metadata_fields: Champs de metadata envoyés à chaque consommateur
+                            ('display', 'storage'). Par défaut aucun : ni
+                            l'affichage ni la sauvegarde ne lisent les metadata.
+            display_codec: Encodage des frames d'affichage ('raw' ou 'jpeg'),
+                           toujours réduites à max_display_height par le producteur
+            jpeg_quality: Qualité JPEG si display_codec='jpeg'
+            delivery_policies: Politique de livraison par consommateur
+                               ('processor', 'display', 'display_raw', 'storage').
+                               Par défaut: traitement et sauvegarde sans perte
+                               ('block'), affichages jamais bloquants ('drop_oldest').
+            queue_budget_mb: Budget mémoire par queue (Mo). La capacité en frames
+                             est calculée au démarrage depuis la taille des frames
+                             (ex: 64 Mo = 10 frames 1080p, 2 frames 4K).
+            reader_backend: 'opencv' ou 'ffmpeg' (décodage multi-thread avec
+                            mise à l'échelle et conversion de format au décodage)
+            decode_width: Largeur de décodage (ffmpeg). Par défaut, celle
+                          demandée par le pipeline (ex: 1280 pour drone-detection)
+            decode_pixel_format: 'bgr24' ou 'gray' (ffmpeg). Par défaut, celui
+                                 demandé par le pipeline
+            frame_cache: Dossier du cache de frames décodées (fichiers vidéo) :
+                         le premier passage écrit les frames (au format d'entrée
+                         du pipeline) dans un memmap, les suivants ne décodent plus
+            live: Mode live (webcam) : le reader ne garde que la frame la plus
+                  récente et la queue du processor ne contient qu'une frame
+                  ('drop_oldest'), le processor traite toujours le présent
+            start: Début de la plage traitée (secondes)
+            end: Fin de la plage traitée (secondes)
+            stride: Traiter une frame sur `stride` (frames sautées sans décodage
+                    couleur). La vidéo sauvegardée garde la durée réelle.
+            block_timing: Histogrammes de durée par bloc et sous-étape (p50/p95/p99),
+                          logués toutes les `block_timing` secondes et à l'arrêt
+            latency_trace: Latence de bout en bout par frame (capture -> affichage,
+                           capture -> disque), découpée en attente en queue et
+                           traitement par étape, loguée à l'arrêt par chaque sink
+            timeline_path: Chronologie des processus (lecture, attente en queue,
+                           pipeline et blocs, affichage, écriture) écrite à
+                           l'arrêt au format Chrome trace (ouvrir dans Perfetto)
+            metrics_port: Port HTTP local servant les métriques Prometheus
+                          (/metrics) : FPS par étape, profondeur et pertes des
+                          queues, percentiles par bloc, détections/s, RSS
+            metrics_file: Fichier de métriques Prometheus réécrit toutes les
+                          `metrics_interval` secondes (collecteur textfile)
+            metrics_interval: Période d'écriture de metrics_file (secondes)
+            profile: Profilage de chaque processus : 'cprofile' ou 'sample'
+                     (échantillonnage de pile, coût quasi nul). Un profil par
+                     processus dans '<profile_dir>/<date>/', fusionnés à l'arrêt
+                     dans rapport.txt (temps cumulé, attribution par bloc)
+            profile_dir: Dossier des profils
         """
         self.source = source
-        self.pipeline = pipeline
+        self.pipelines = named_pipelines(pipeline)
+        self.pipeline = next(iter(self.pipelines.values()))
         self.enable_display = enable_display
         self.enable_display_raw = enable_display_raw
         self.enable_storage = enable_storage
@@ -64,6 +165,45 @@ class VideoProcessor:
         self.max_display_height = max_display_height
         self.realtime = realtime
         self.codec = codec
+        self.metadata_fields = {"display": (), "storage": ()}
+        self.metadata_fields.update(metadata_fields or {})
+
+        # Affichage: réduit (et éventuellement compressé) côté producteur
+        # Stockage: frame native, étendue en BGR par le sink
+        self.display_codec = FrameCodec(
+            max_height=max_display_height, codec=display_codec, jpeg_quality=jpeg_quality
+        )
+        self.codecs = {"display": self.display_codec, "storage": FrameCodec()}
+
+        self.live = live
+        self.start_time = start
+        self.end_time = end
+        self.stride = max(1, int(stride))
+        self.block_timing = block_timing
+        self.latency_trace = latency_trace
+        self.timeline_path = timeline_path
+        self.trace_dir = None  # Fichiers partiels par processus (créé dans start)
+        self.profile_config = None
+        if profile is not None:
+            run_dir = Path(profile_dir) / time.strftime("%Y%m%d-%H%M%S")
+            self.profile_config = ProfileConfig(directory=str(run_dir), mode=profile)
+        self.metrics = None
+        if metrics_port is not None or metrics_file is not None:
+            self.metrics = MetricsExporter(
+                queues=self.queues,
+                port=metrics_port,
+                path=metrics_file,
+                interval=metrics_interval,
+            )
+        self.delivery_policies = dict(self.DEFAULT_DELIVERY_POLICIES)
+        if live:
+            self.delivery_policies["processor"] = "drop_oldest"
+        self.delivery_policies.update(delivery_policies or {})
+        self.queue_budget_bytes = int(queue_budget_mb * 1024 * 1024)
+        self.reader_backend = reader_backend
+        self.decode_width = decode_width
+        self.decode_pixel_format = decode_pixel_format
+        self.frame_cache = frame_cache
 
         # Logger (toujours actif)
         self.logger = get_logger(__name__)
@@ -71,33 +211,165 @@ class VideoProcessor:
         # Events
         self.stop_event = Event()
 
-        # Queues pour le processor (depuis reader)
-        self.reader_queue = Queue(maxsize=10)
-
-        # Queues pour les outputs du processor
+        # Queues (dimensionnées dans start, une fois la résolution connue)
+        # Par pipeline: queue d'entrée du processor et queues de ses sinks
+        # (nom None pour un pipeline unique)
+        self.reader_queue = None
+        self.raw_display_queue = None
         self.output_queues = {}
+        self.reader_queues = {}
+        self.pipeline_outputs = {}
+        self.frame_ring = None
 
-        if enable_display:
-            self.output_queues["display"] = Queue(maxsize=10)
+        # Options de lecture (résolues dans start)
+        self.capture_options = {"backend": reader_backend}
 
-        if enable_storage:
-            self.output_queues["storage"] = Queue(maxsize=10)
+        # Processus (initialisés dans start)
+        self.processes = []
+        self.started_at = None
+
+    def _make_queue(self, consumer: str, frame_bytes: int, name: str = None) -> DeliveryQueue:
+        """Crée la queue d'un consommateur (politique de livraison + budget mémoire)"""
+        return DeliveryQueue.from_budget(
+            self.queue_budget_bytes,
+            frame_bytes,
+            policy=self.delivery_policies[consumer],
+            name=name or consumer,
+        )
+
+    @property
+    def shared_decode(self) -> bool:
+        """Plusieurs pipelines sur un seul décodage"""
+        return len(self.pipelines) > 1
+
+    def sink_name(self, base: str, pipeline_name: str = None) -> str:
+        """Nom d'une queue / fenêtre propre à un pipeline"""
+        return base if pipeline_name is None else f"{base} [{pipeline_name}]"
+
+    def pipeline_output_path(self, pipeline_name: str = None) -> str:
+        """Fichier de sortie d'un pipeline"""
+        if pipeline_name is None:
+            return self.output_path
+        path = Path(self.output_path)
+        return str(path.with_name(f"{path.stem}_{pipeline_name}{path.suffix}"))
+
+    def _create_queues(self, width: int, height: int):
+        """Dimensionne les queues depuis la taille des frames (budget mémoire)"""
+        frame_bytes = width * height * 3
+
+        # Les frames d'affichage sont réduites à max_display_height par le producteur
+        display_bytes = frame_bytes
+        if height > self.max_display_height:
+            display_bytes = int(frame_bytes * (self.max_display_height / height) ** 2)
+
+        # Plusieurs pipelines: la frame décodée est écrite une fois dans un
+        # anneau partagé, les queues ne transportent que des références
+        if self.shared_decode:
+            slots = int(min(64, max(4, self.queue_budget_bytes // frame_bytes)))
+            self.frame_ring = SharedFrameRing(slots, frame_bytes, consumers=len(self.pipelines))
+
+        for name in self.pipelines:
+            # Queue pour le processor (depuis reader)
+            # En live: une seule frame en attente, la plus récente
+            queue_name = self.sink_name("processor", name)
+            if self.frame_ring is not None:
+                # Capacité = anneau ; un message jeté libère son slot
+                reader_queue = DeliveryQueue(
+                    maxsize=1 if self.live else self.frame_ring.slots,
+                    policy=self.delivery_policies["processor"],
+                    name=queue_name,
+                    on_drop=self.frame_ring.release,
+                )
+            elif self.live:
+                reader_queue = DeliveryQueue(
+                    maxsize=1, policy=self.delivery_policies["processor"], name=queue_name
+                )
+            else:
+                reader_queue = self._make_queue("processor", frame_bytes, queue_name)
+            self.reader_queues[name] = reader_queue
+
+            # Queues pour les outputs du processor
+            outputs = {}
+            if self.enable_display:
+                outputs["display"] = self._make_queue(
+                    "display", display_bytes, self.sink_name("display", name)
+                )
+            if self.enable_storage:
+                outputs["storage"] = self._make_queue(
+                    "storage", frame_bytes, self.sink_name("storage", name)
+                )
+            self.pipeline_outputs[name] = outputs
+
+        # Pipeline unique: accès direct
+        self.reader_queue = next(iter(self.reader_queues.values()))
+        self.output_queues = next(iter(self.pipeline_outputs.values()))
 
         # Queue dédiée pour l'affichage raw (directement depuis reader)
-        self.raw_display_queue = None
-        if enable_display_raw:
-            self.raw_display_queue = Queue(maxsize=10)
+        if self.enable_display_raw:
+            self.raw_display_queue = self._make_queue("display_raw", display_bytes)
 
-        # Processus (initialisés dans start)
-        self.processes = []
+    def queues(self) -> list:
+        """Liste de toutes les queues actives"""
+        queues = [*self.reader_queues.values(), self.raw_display_queue]
+        for outputs in self.pipeline_outputs.values():
+            queues.extend(outputs.values())
+        return [q for q in queues if q is not None]
+
+    def queue_stats(self) -> list:
+        """Compteurs de backpressure de toutes les queues (drops, temps bloqué, profondeur)"""
+        return [q.stats() for q in self.queues()]
+
+    @staticmethod
+    def _source_capture_options(
+        source: Any,
+        reader_backend: str,
+        input_format: tuple,
+        frame_cache: str = None,
+        decode_width: int = None,
+        pixel_format: str = None,
+    ) -> dict:
+        """
+        Options de lecture d'une source (partagées avec ProcessingSession).
 
-    def _detect_video_properties(self):
-        """Détecte les propriétés vidéo pour le writer"""
-        is_webcam = isinstance(self.source, int)
+        Le format d'entrée du pipeline est appliqué au décodage quand la source
+        le permet (backend ffmpeg, séquence d'images, cache de frames).
 
-        cap = cv2.VideoCapture(self.source)
+        Args:
+            input_format: (largeur, format de pixel) attendus par le(s) pipeline(s)
+            frame_cache: Dossier du cache de frames, None = désactivé
+            decode_width: Largeur imposée (sinon celle du pipeline)
+            pixel_format: Format de pixel imposé (sinon celui du pipeline)
+        """
+        options = {"backend": reader_backend}
+        if frame_cache:
+            options["cache_dir"] = frame_cache
+        elif reader_backend != "ffmpeg" and not is_image_sequence(source):
+            return options
+
+        width, input_pixel_format = input_format
+        options["decode_width"] = decode_width or width
+        options["pixel_format"] = pixel_format or input_pixel_format
+        return options
+
+    def _capture_options(self, source: Any = None) -> dict:
+        """Options du backend de lecture (format d'entrée du pipeline par défaut)"""
+        return VideoProcessor._source_capture_options(
+            self.source if source is None else source,
+            self.reader_backend,
+            shared_input_format(self.pipelines.values()),
+            frame_cache=None if self.live else self.frame_cache,
+            decode_width=self.decode_width,
+            pixel_format=self.decode_pixel_format,
+        )
+
+    def _detect_video_properties(self, source: Any = None):
+        """Détecte les propriétés vidéo pour le writer (après mise à l'échelle au décodage)"""
+        source = self.source if source is None else source
+        is_webcam = isinstance(source, int)
+
+        cap = open_capture(source, **self.capture_options)
         if not cap.isOpened():
-            raise RuntimeError(f"Impossible d'ouvrir la source: {self.source}")
+            raise RuntimeError(f"Impossible d'ouvrir la source: {source}")
 
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -106,27 +378,163 @@ class VideoProcessor:
         if fps == 0 or is_webcam:
             fps = 30.0  # Default
 
+        # Une frame sur `stride` : la sortie garde la durée réelle de la source
+        if not is_webcam:
+            fps = fps / self.stride
+
         cap.release()
 
+        # Pas d'agrandissement au décodage : le pipeline redimensionne lui-même
+        decode_width = self.capture_options.get("decode_width")
+        if decode_width and isinstance(cap, (FFmpegCapture, ImageSequenceCapture)):
+            if cap.source_width <= decode_width:
+                self.capture_options["decode_width"] = None
+                width, height = cap.source_width, cap.source_height
+
         return width, height, fps, is_webcam
 
+    def _wait_ready(self, components, timeout: float = 30.0) -> float:
+        """
+        Attend que chaque consommateur signale qu'il est prêt (fenêtre créée,
+        writer ouvert, pipeline construit).
+
+        Returns:
+            Durée d'attente (secondes)
+
+        Raises:
+            RuntimeError: Si un consommateur s'arrête avant d'être prêt
+            TimeoutError: Si un consommateur n'est pas prêt après `timeout`
+        """
+        t0 = time.time()
+        pending = list(components)
+        while pending:
+            for component in list(pending):
+                if component.ready_event.is_set():
+                    pending.remove(component)
+                elif not component.process.is_alive():
+                    raise RuntimeError(f"{type(component).__name__} arrêté avant d'être prêt")
+            if not pending:
+                break
+            if time.time() - t0 > timeout:
+                names = ", ".join(type(c).__name__ for c in pending)
+                raise TimeoutError(f"Consommateurs non prêts après {timeout:.0f}s: {names}")
+            pending[0].ready_event.wait(timeout=0.05)
+        return time.time() - t0
+
+    def _start_reader_when_ready(self, readers):
+        """Démarre le(s) reader(s) dès que tous les consommateurs sont prêts"""
+        try:
+            ready_time = self._wait_ready(self.processes)
+        except (RuntimeError, TimeoutError) as e:
+            self._log(f"Démarrage impossible: {e}", level="error")
+            self.stop()
+            raise
+        self._log(f"Consommateurs prêts en {ready_time:.2f}s")
+
+        for reader in readers:
+            reader.start()
+            self.processes.append(reader)
+
+    @property
+    def time_to_first_frame(self) -> float:
+        """Délai démarrage -> première frame traitée (secondes, None si aucune)"""
+        delays = [
+            proc.time_to_first_frame
+            for proc in self.processes
+            if isinstance(proc, PipelineProcessor) and proc.time_to_first_frame is not None
+        ]
+        return min(delays) if delays else None
+
+    def _start_timeline(self):
+        """Dossier des chronologies partielles (une par processus), si demandé"""
+        if self.timeline_path is not None:
+            self.trace_dir = tempfile.mkdtemp(prefix="ts341_timeline_")
+
+    def _stage_metrics(self, stage: str):
+        """Bloc de métriques partagé d'un processus (None si désactivé)"""
+        return None if self.metrics is None else self.metrics.stage(stage)
+
+    def _start_metrics(self):
+        """Démarre l'exposition des métriques (tous les processus créés)"""
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.start()
+        except OSError as e:
+            self._log(f"Métriques non exposées: {e}", level="error")
+            return
+        if self.metrics.server is not None:
+            self._log(
+                f"Métriques: http://{self.metrics.host}:{self.metrics.port}/metrics"
+            )
+        if self.metrics.path is not None:
+            self._log(f"Métriques: {self.metrics.path} (toutes les {self.metrics.interval:.0f}s)")
+
+    def _write_profile_report(self):
+        """Fusionne les profils des processus (rapport.txt dans le dossier du run)"""
+        if self.profile_config is None:
+            return
+        directory = Path(self.profile_config.directory)
+        if not directory.exists():
+            return
+        report_path = directory / "rapport.txt"
+        report_path.write_text(merge_profiles(str(directory)) + "\n")
+        self._log(f"Profils: {directory} - rapport: {report_path}")
+
+    def _write_timeline(self):
+        """Fusionne les chronologies des processus en un fichier Chrome trace"""
+        if self.trace_dir is None:
+            return
+        try:
+            stats = merge_traces(self.trace_dir, self.timeline_path)
+            self._log(
+                f"Chronologie: {self.timeline_path} ({stats['processes']} processus, "
+                f"{stats['events']} événements, {stats['dropped']} perdus) "
+                "- ouvrir dans https://ui.perfetto.dev"
+            )
+        except (OSError, ValueError) as e:
+            self._log(f"Chronologie non écrite: {e}", level="error")
+        finally:
+            shutil.rmtree(self.trace_dir, ignore_errors=True)
+            self.trace_dir = None
+
     def _log(self, message: str, level: str = "info"):
         """Helper pour logger"""
         getattr(self.logger, level)(message)
 
     def start(self):
         """Démarre tous les processus"""
+        self.started_at = time.time()
         self._log("Initialisation...")
+        self._start_timeline()
+        self.capture_options = self._capture_options()
 
         # Détecter propriétés
         width, height, fps, is_webcam = self._detect_video_properties()
 
         self._log(f"Source: {self.source}")
         self._log(f"Résolution: {width}x{height} @ {fps} FPS")
+        self._log(f"Lecture: {self.capture_options}")
+        if self.shared_decode:
+            self._log(f"Pipelines (décodage partagé): {', '.join(self.pipelines)}")
         self._log(
             f"Display Processed: {self.enable_display}, "
             f"Display Raw: {self.enable_display_raw}, Storage: {self.enable_storage}"
         )
+        self._create_queues(width, height)
+        self._log(
+            "Livraison: "
+            + ", ".join(f"{q.name}={q.policy}" for q in self.queues())
+        )
+        self._log(
+            f"Budget queues: {format_bytes(self.queue_budget_bytes)} -> "
+            + ", ".join(f"{q.name}={q.maxsize} frames" for q in self.queues())
+        )
+        if self.frame_ring is not None:
+            self._log(
+                f"Anneau partagé: {self.frame_ring.slots} slots, "
+                f"{format_bytes(self.frame_ring.nbytes)}"
+            )
 
         # 1. Créer les consommateurs d'abord
 
@@ -137,60 +545,93 @@ class VideoProcessor:
                 stop_event=self.stop_event,
                 window_name=self.display_raw_window,
                 max_height=self.max_display_height,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics("display_raw"),
+                profile=self.profile_config,
             )
             display_raw.start()
             self.processes.append(display_raw)
             self._log("Display Raw démarré")
 
-        # Display PROCESSED (frames traitées, depuis processor)
-        if self.enable_display:
-            display = NewDisplayProcess(
-                display_queue=self.output_queues["display"],
+        for name, outputs in self.pipeline_outputs.items():
+            # Display PROCESSED (frames traitées, depuis processor)
+            if self.enable_display:
+                display = NewDisplayProcess(
+                    display_queue=outputs["display"],
+                    stop_event=self.stop_event,
+                    window_name=self.sink_name(self.display_window, name),
+                    max_height=self.max_display_height,
+                    trace_dir=self.trace_dir,
+                    metrics=self._stage_metrics(self.sink_name("display", name)),
+                    profile=self.profile_config,
+                )
+                display.start()
+                self.processes.append(display)
+                self._log(f"{self.sink_name('Display Processed', name)} démarré")
+
+            if self.enable_storage:
+                storage = NewStorageProcess(
+                    storage_queue=outputs["storage"],
+                    stop_event=self.stop_event,
+                    output_path=self.pipeline_output_path(name),
+                    fps=fps,
+                    width=width,
+                    height=height,
+                    codec=self.codec,
+                    trace_dir=self.trace_dir,
+                    metrics=self._stage_metrics(self.sink_name("storage", name)),
+                    profile=self.profile_config,
+                )
+                storage.start()
+                self.processes.append(storage)
+                self._log(f"{self.sink_name('Storage', name)} démarré")
+
+        # 2. Créer les processors (un par pipeline)
+        for name, pipeline in self.pipelines.items():
+            processor = PipelineProcessor(
+                pipeline=pipeline,
+                input_queue=self.reader_queues[name],
+                output_queues=self.pipeline_outputs[name],
                 stop_event=self.stop_event,
-                window_name=self.display_window,
-                max_height=self.max_display_height,
+                metadata_fields=self.metadata_fields,
+                codecs=self.codecs,
+                name=name,
+                frame_ring=self.frame_ring,
+                started_at=self.started_at,
+                timing_interval=self.block_timing,
+                trace_dir=self.trace_dir,
+                metrics=self._stage_metrics(self.sink_name("processor", name)),
+                profile=self.profile_config,
             )
-            display.start()
-            self.processes.append(display)
-            self._log("Display Processed démarré")
-
-        if self.enable_storage:
-            storage = NewStorageProcess(
-                storage_queue=self.output_queues["storage"],
-                stop_event=self.stop_event,
-                output_path=self.output_path,
-                fps=fps,
-                width=width,
-                height=height,
-                codec=self.codec,
-            )
-            storage.start()
-            self.processes.append(storage)
-            self._log("Storage démarré")
-
-        # 2. Créer le processor
-        processor = PipelineProcessor(
-            pipeline=self.pipeline,
-            input_queue=self.reader_queue,
-            output_queues=self.output_queues,
-            stop_event=self.stop_event,
-        )
-        processor.start()
-        self.processes.append(processor)
-        self._log("Processor démarré")
+            processor.start()
+            self.processes.append(processor)
+            self._log(f"{self.sink_name('Processor', name)} démarré")
 
-        # 3. Créer le reader (producteur) en dernier
-        time.sleep(0.5)  # Laisser temps aux consommateurs
+        # 3. Créer le reader (producteur) en dernier, dès que les consommateurs sont prêts
         reader = VideoReader(
             source=self.source,
-            output_queue=self.reader_queue,
+            output_queue=list(self.reader_queues.values()),
             stop_event=self.stop_event,
             realtime=self.realtime,
             raw_display_queue=self.raw_display_queue,
+            raw_display_codec=self.display_codec,
+            backend=self.capture_options["backend"],
+            decode_width=self.capture_options.get("decode_width"),
+            pixel_format=self.capture_options.get("pixel_format"),
+            frame_cache=self.capture_options.get("cache_dir"),
+            live=self.live,
+            start=self.start_time,
+            end=self.end_time,
+            stride=self.stride,
+            frame_ring=self.frame_ring,
+            trace=self.latency_trace,
+            trace_dir=self.trace_dir,
+            metrics=self._stage_metrics("reader"),
+            profile=self.profile_config,
         )
-        reader.start()
-        self.processes.append(reader)
+        self._start_reader_when_ready([reader])
         self._log("Reader démarré")
+        self._start_metrics()
 
         self._log("Tous les processus actifs ✓")
         return self
@@ -216,6 +657,17 @@ class VideoProcessor:
             if hasattr(proc, "stop"):
                 proc.stop()
 
+        for queue in self.queues():
+            self._log(queue.describe())
+        if self.time_to_first_frame is not None:
+            self._log(f"Démarrage -> première frame traitée: {self.time_to_first_frame:.2f}s")
+        if self.frame_ring is not None:
+            self.frame_ring.close()
+            self.frame_ring = None
+        self._write_timeline()
+        self._write_profile_report()
+        if self.metrics is not None:
+            self.metrics.stop()
         self._log("Tous les processus arrêtés")
 
     def __enter__(self):
@@ -6,9 +6,109 @@ Lit depuis webcam ou fichier vidéo et distribue les frames via Queue
 
 import cv2
 import time
-from multiprocessing import Process, Queue, Event
-from typing import Union
+from multiprocessing import Process, Event
+from typing import List, Union
 from ts341_project.logging_utils import get_logger
+from ts341_project.FrameCodec import FrameCodec
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.SharedFrameRing import SharedFrameRing
+from ts341_project.sources import (
+    open_capture,
+    ImageSequenceCapture,
+    LatestFrameCapture,
+    ScaledCapture,
+)
+from ts341_project.LatencyTrace import new_trace, stamp
+from ts341_project.TimelineTrace import span, start_tracing, stop_tracing
+from ts341_project.ProcessProfiler import profiled
+
+
+class SourceCursor:
+    """
+    Parcours d'une source fichier : seek au début de plage, pas (stride), fin
+    de plage et PTS source. Partagé par VideoReader et ProcessingSession.
+
+    `position` est l'index 0-based de la prochaine frame source ; après read(),
+    c'est l'index 1-based (frame_number) de la frame lue.
+    """
+
+    def __init__(self, cap, fps: float, start: float = None, end: float = None, stride: int = 1):
+        """
+        Args:
+            cap: Capture ouverte (interface cv2.VideoCapture)
+            fps: Cadence de la source
+            start: Début de la plage (secondes, seek au keyframe)
+            end: Fin de la plage (secondes, exclue)
+            stride: Une frame sur `stride` (les autres sautées avec grab(),
+                    ou déjà par le décodeur s'il applique ce pas)
+        """
+        self.cap = cap
+        self.fps = fps
+        self.stride = max(1, int(stride))
+        self.position = self.first_frame = 0
+        if start:
+            self.first_frame = int(round(start * fps))
+            self.position = VideoReader._seek(cap, self.first_frame)
+        self.end_frame = int(round(end * fps)) if end is not None else None
+        # Frames sautées par le décodeur lui-même : rien à lire entre deux frames
+        self.decoder_stride = self.stride > 1 and getattr(cap, "stride", 1) == self.stride
+        self.skipped = 0
+        self.end_reason = None  # "Fin de plage" / "Fin de vidéo" quand la source est terminée
+        self._last_pts = -1.0
+
+    def skip(self) -> bool:
+        """
+        Saute les frames hors pas jusqu'à la prochaine frame à lire.
+
+        Returns:
+            False si la plage ou la source est terminée (end_reason)
+        """
+        while (self.position - self.first_frame) % self.stride:
+            if self.end_frame is not None and self.position >= self.end_frame:
+                break
+            if not self.decoder_stride and not self.cap.grab():
+                self.end_reason = "Fin de plage"
+                return False
+            self.position += 1
+            self.skipped += 1
+
+        if self.end_frame is not None and self.position >= self.end_frame:
+            self.end_reason = "Fin de plage"
+            return False
+        return True
+
+    def read(self):
+        """
+        Lit la frame suivante.
+
+        Returns:
+            (ret, frame) de la capture ; ret est False (end_reason) en fin de
+            vidéo ou si la frame dépasse la plage, None si la capture n'a pas
+            encore de frame (mode live)
+        """
+        ret, frame = self.cap.read()
+        if ret is None:
+            return None, None
+        if not ret:
+            self.end_reason = "Fin de vidéo"
+            return False, None
+
+        self.position += 1
+        if isinstance(self.cap, ImageSequenceCapture):
+            # Les images illisibles sautées par read() avancent aussi la position
+            self.position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if self.end_frame is not None and self.position > self.end_frame:
+                self.end_reason = "Fin de plage"
+                return False, None
+        return True, frame
+
+    def pts(self) -> float:
+        """PTS source (secondes) de la dernière frame lue, strictement croissant"""
+        pts = VideoReader._source_pts(self.cap, self.position, self.fps)
+        if pts <= self._last_pts:
+            pts = (self.position - 1) / self.fps
+        self._last_pts = pts
+        return pts
 
 
 class VideoReader:
@@ -20,25 +120,82 @@ class VideoReader:
     def __init__(
         self,
         source: Union[str, int],
-        output_queue: Queue,
+        output_queue: Union[DeliveryQueue, List[DeliveryQueue]],
         stop_event: Event,
         realtime: bool = False,
-        raw_display_queue: Queue = None,
+        raw_display_queue: DeliveryQueue = None,
+        raw_display_codec: FrameCodec = None,
+        backend: str = "opencv",
+        decode_width: int = None,
+        pixel_format: str = None,
+        decode_threads: int = 0,
+        frame_cache: str = None,
+        live: bool = False,
+        start: float = None,
+        end: float = None,
+        stride: int = 1,
+        stream_id: int = None,
+        frame_ring: SharedFrameRing = None,
+        trace: bool = False,
+        trace_dir: str = None,
+        metrics=None,
+        profile=None,
     ):
         """
         Args:
             source: Chemin vidéo ou ID webcam (0, 1, ...)
-            output_queue: Queue principale pour le traitement
+            output_queue: Queue principale pour le traitement, ou liste de queues
+                          (un processor par pipeline, même frame décodée une fois)
             stop_event: Event pour arrêter la lecture
             realtime: Si True, respecte le FPS de la source
             raw_display_queue: Queue optionnelle pour affichage raw (sans traitement)
+            raw_display_codec: Encodage des frames pour l'affichage raw (réduction/JPEG)
+            backend: 'opencv' (cv2.VideoCapture) ou 'ffmpeg' (pipe, décodage multi-thread)
+            decode_width: Largeur de sortie du décodeur (backend ffmpeg)
+            pixel_format: 'bgr24' ou 'gray' (backend ffmpeg)
+            decode_threads: Threads de décodage (ffmpeg / séquence d'images, 0 = auto)
+            frame_cache: Dossier du cache de frames décodées (memmap), None = désactivé
+            live: Mode live « la dernière frame gagne » : un thread de capture
+                  garde uniquement la frame la plus récente, les frames non lues
+                  sont ignorées et comptées (frame_number reste l'index capturé)
+            start: Début de la plage à lire (secondes, seek au keyframe)
+            end: Fin de la plage à lire (secondes, exclue)
+            stride: Ne traiter qu'une frame sur `stride` (les autres sont sautées
+                    avec grab(), sans conversion couleur ni retrieve)
+            stream_id: Identifiant du flux (multi-caméras) ajouté à chaque
+                       message, y compris end_of_stream
+            frame_ring: Anneau de mémoire partagée : la frame y est écrite une
+                        fois et seule sa référence ('frame_ref') part dans les queues
+            trace: Ajoute à chaque message les horodatages de latence ('trace',
+                   voir LatencyTrace), complétés par chaque étape suivante
+            trace_dir: Dossier de la chronologie (TimelineTrace), None = désactivée
+            metrics: Bloc de métriques partagé de l'étape (PipelineMetrics), None = désactivé
+            profile: Profilage du processus (ProcessProfiler.ProfileConfig), None = désactivé
         """
         self.source = source
         self.output_queue = output_queue
         self.stop_event = stop_event
         self.realtime = realtime
         self.raw_display_queue = raw_display_queue
+        self.raw_display_codec = raw_display_codec or FrameCodec()
         self.is_webcam = isinstance(source, int)
+        self.live = live
+        self.start_time = start
+        self.end_time = end
+        self.stride = max(1, int(stride))
+        self.stream_id = stream_id
+        self.frame_ring = frame_ring
+        self.trace = trace
+        self.trace_dir = trace_dir
+        self.metrics = metrics
+        self.profile = profile
+        self.capture_options = {
+            "backend": backend,
+            "decode_width": decode_width,
+            "pixel_format": pixel_format,
+            "threads": decode_threads,
+            "cache_dir": frame_cache,
+        }
 
         # Propriétés (remplies au démarrage)
         self.fps = 0
@@ -53,15 +210,72 @@ class VideoReader:
         self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
+    @staticmethod
+    def _seek(cap, target: int) -> int:
+        """
+        Positionne la capture sur la frame d'index `target` (0-based).
+
+        Le backend cherche le keyframe précédent puis décode jusqu'à la cible ;
+        si le seek n'est pas supporté, on avance avec grab().
+
+        Returns:
+            Index réel de la prochaine frame lue
+        """
+        position = 0
+        if cap.set(cv2.CAP_PROP_POS_FRAMES, target):
+            position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+        while position < target and cap.grab():
+            position += 1
+        return position
+
+    @staticmethod
+    def _source_pts(cap, position: int, fps: float) -> float:
+        """
+        PTS source (secondes) de la frame qui vient d'être lue.
+
+        Args:
+            position: Index 1-based de cette frame dans la source
+        """
+        # cv2.VideoCapture: timestamp du conteneur (sources à cadence variable)
+        if isinstance(cap, ScaledCapture):
+            cap = cap.capture
+        if isinstance(cap, cv2.VideoCapture):
+            msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            if msec > 0 or position == 1:
+                return msec / 1000.0
+        # Backends à cadence fixe (pipe ffmpeg, séquence d'images, cache)
+        return (position - 1) / fps
+
     @staticmethod
     def _reader_process(
-        source, output_queue, stop_event, realtime, is_webcam, raw_display_queue
+        source,
+        output_queue,
+        stop_event,
+        realtime,
+        is_webcam,
+        raw_display_queue,
+        raw_display_codec,
+        capture_options,
+        live,
+        start,
+        end,
+        stride,
+        stream_id,
+        frame_ring,
+        trace,
+        trace_dir,
+        metrics,
     ):
         """Processus de lecture (fonction statique pour multiprocessing)"""
         logger = get_logger(__name__)
-        logger.info(f"Démarrage lecture - Source: {source}")
+        start_tracing(trace_dir, "reader" if stream_id is None else f"reader{stream_id}")
+        logger.info(
+            f"Démarrage lecture - Source: {source} ({capture_options['backend']})"
+        )
 
-        cap = cv2.VideoCapture(source)
+        # Pas appliqué dans le décodeur quand le backend le permet (ffmpeg)
+        cap = open_capture(source, stride=1 if live else stride, **capture_options)
         if not cap.isOpened():
             logger.error(f"Impossible d'ouvrir {source}")
             return
@@ -71,17 +285,54 @@ class VideoReader:
             cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-        frame_time = 1.0 / fps if realtime and fps > 0 else 0
+        frame_time = stride / fps if realtime and fps > 0 and not live else 0
+
+        if live:
+            # Mode live: thread de capture + emplacement unique « dernière frame »,
+            # ni plage ni pas
+            cap = LatestFrameCapture(cap)
+            cursor = SourceCursor(cap, fps)
+        else:
+            # Plage et pas, frame_number = index source réel
+            cursor = SourceCursor(cap, fps, start, end, stride)
+            if start:
+                logger.info(f"Seek à {start:.2f}s -> frame {cursor.position + 1}")
 
         has_raw_display = raw_display_queue is not None
         logger.info(
-            f"FPS: {fps:.1f}, Realtime: {realtime}, Raw Display: {has_raw_display}"
+            f"FPS: {fps:.1f}, Realtime: {realtime}, Live: {live}, "
+            f"Raw Display: {has_raw_display}"
         )
 
+        # Identifiant du flux (multi-caméras) ajouté à chaque message
+        tag = {} if stream_id is None else {"stream_id": stream_id}
+
+        # Un processor par pipeline: même frame envoyée à chaque queue
+        output_queues = (
+            list(output_queue) if isinstance(output_queue, (list, tuple)) else [output_queue]
+        )
+
+        def _end_of_stream():
+            # Signal de fin à toutes les queues
+            for queue in output_queues:
+                queue.put({"end_of_stream": True, **tag}, stop_event, control=True)
+            if has_raw_display:
+                raw_display_queue.put(
+                    {"end_of_stream": True, **tag}, stop_event, control=True
+                )
+
         frame_count = 0
         last_time = time.time()
+        first_timestamp = None
 
         while not stop_event.is_set():
+            # Frames sautées (stride): déjà écartées par le décodeur, sinon
+            # grab() sans conversion ni retrieve
+            if not cursor.skip():
+                logger.info(cursor.end_reason)
+                _end_of_stream()
+                break
+
             # Timing pour mode realtime
             if frame_time > 0:
                 elapsed = time.time() - last_time
@@ -90,51 +341,102 @@ class VideoReader:
             last_time = time.time()
 
             # Lecture
-            ret, frame = cap.read()
+            with span("lecture", frame=cursor.position + 1):
+                ret, frame = cursor.read()
+            if ret is None:
+                # Mode live: aucune frame pendant le délai, la caméra n'a pas fini
+                logger.warning("Live: aucune nouvelle frame de la caméra, attente...")
+                continue
             if not ret:
-                logger.info("Fin de vidéo")
-                # Signal de fin aux deux queues
-                output_queue.put({"end_of_stream": True})
-                if has_raw_display:
-                    raw_display_queue.put({"end_of_stream": True})
+                logger.info(cursor.end_reason)
+                _end_of_stream()
                 break
+            # Mode live: la frame a pu attendre dans le thread de capture
+            frame_trace = new_trace(cap.capture_time if live else None) if trace else None
 
             frame_count += 1
+            frame_number = cap.frame_number if live else cursor.position
+            timestamp = cap.capture_time if live else time.time()
+
+            # PTS: horodatage source pour les fichiers, temps de capture
+            # (relatif à la première frame) pour les webcams
+            if is_webcam or live:
+                first_timestamp = first_timestamp or timestamp
+                pts = timestamp - first_timestamp
+            else:
+                pts = cursor.pts()
 
             data = {
-                "frame": frame,
-                "frame_number": frame_count,
-                "timestamp": time.time(),
+                "frame_number": frame_number,
+                "timestamp": timestamp,
+                "pts": pts,
+                **tag,
             }
+            if frame_ring is not None:
+                # Une seule copie en mémoire partagée, référence dans les queues
+                ref = frame_ring.put(frame, stop_event)
+                if ref is None:
+                    break
+                data["frame_ref"] = ref
+            else:
+                data["frame"] = frame
 
-            # Envoi vers queue de traitement (bloquant avec retries pour gérer la backpressure)
-            def _try_put(q, item, retries=3, timeout=0.5):
-                for _ in range(retries):
-                    try:
-                        q.put(item, timeout=timeout)
-                        return True
-                    except:
-                        if stop_event.is_set():
-                            return False
-                        continue
-                return False
-
-            _try_put(output_queue, data)
+            # Envoi vers queue(s) de traitement (politique de la queue: bloquante
+            # par défaut, sans perte). Horodatage avant le put : l'attente d'une
+            # place dans la queue compte dans le segment « queue »
+            if frame_trace is not None:
+                data["trace"] = stamp(dict(frame_trace), "reader_out")
+            for queue in output_queues:
+                queue.put(data, stop_event=stop_event)
 
             # Envoi vers queue raw display (si activée)
             if has_raw_display:
-                # envoyer une copie pour éviter partage d'objet entre processus
-                _try_put(raw_display_queue, data.copy())
+                # Frame réduite / compressée pour l'affichage (nouveau dict)
+                raw_data = {
+                    "frame_number": frame_number,
+                    "timestamp": timestamp,
+                    "pts": pts,
+                    **tag,
+                }
+                with span("encodage display_raw"):
+                    raw_data.update(raw_display_codec.encode(frame))
+                if frame_trace is not None:
+                    raw_data["trace"] = stamp(dict(frame_trace), "reader_out")
+                raw_display_queue.put(raw_data, stop_event=stop_event)
+
+            if metrics is not None:
+                metrics.frame()
+
+            if live and frame_count % 100 == 0:
+                logger.info(
+                    f"Live: {frame_count} frames envoyées, {cap.skipped} ignorées"
+                )
 
         cap.release()
         logger.info(f"Arrêté - {frame_count} frames lues")
+        if cursor.skipped:
+            how = "décodeur" if cursor.decoder_stride else "grab"
+            logger.info(f"Stride {stride}: {cursor.skipped} frames sautées ({how})")
+        if getattr(cap, "unreadable", 0):
+            logger.warning(f"{cap.unreadable} images illisibles sautées")
+        if live:
+            logger.info(
+                f"Live: {cap.skipped} frames capturées ignorées (dernière frame gagne)"
+            )
+        for queue in output_queues:
+            logger.info(queue.describe())
+        if has_raw_display:
+            logger.info(raw_display_queue.describe())
+        if metrics is not None:
+            metrics.publish()  # État final (RSS, horodatage)
+        stop_tracing()
 
     def start(self):
         """Démarre le processus de lecture"""
         # D'abord récupérer les infos (dans le process parent)
         logger = get_logger(__name__)
 
-        cap = cv2.VideoCapture(self.source)
+        cap = open_capture(self.source, **self.capture_options)
         if cap.isOpened():
             self._get_video_info(cap)
             cap.release()
@@ -143,8 +445,9 @@ class VideoReader:
             logger.warning(f"Impossible de lire les infos de {self.source}")
 
         # Lancer le processus de lecture
+        role = "reader" if self.stream_id is None else f"reader{self.stream_id}"
         self.process = Process(
-            target=VideoReader._reader_process,
+            target=profiled(VideoReader._reader_process, self.profile, role),
             args=(
                 self.source,
                 self.output_queue,
@@ -152,6 +455,17 @@ class VideoReader:
                 self.realtime,
                 self.is_webcam,
                 self.raw_display_queue,
+                self.raw_display_codec,
+                self.capture_options,
+                self.live,
+                self.start_time,
+                self.end_time,
+                self.stride,
+                self.stream_id,
+                self.frame_ring,
+                self.trace,
+                self.trace_dir,
+                self.metrics,
             ),
         )
         self.process.start()
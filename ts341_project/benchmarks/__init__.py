@@ -0,0 +1,10 @@
+"""
+Benchmarks de performance (scripts, exécutés avec python -m).
+
+    log_overhead        : coût par record du transport de logs
+    synthetic_video     : vidéos synthétiques de drones (vérité terrain incluse)
+    pipeline_throughput : débit, mémoire et durées par bloc de chaque pipeline
+    block_micro         : micro-benchmarks de chaque bloc (balayage de paramètres,
+                          implémentations alternatives)
+    results             : comparaison de deux fichiers de résultats (commits)
+"""
@@ -0,0 +1,624 @@
+"""
+Micro-benchmarks des blocs de traitement (image_block/ et video_block/), isolés.
+
+Chaque bloc est mesuré seul, sur des entrées synthétiques réalistes
+(synthetic_video : ciel, sprites de drones ; masques MOG2 nettoyés ; ROIs
+autour des sprites), pour chaque résolution, nombre de canaux et combinaison
+de paramètres (noyaux, orb_n_features, roi_size, mog2_history...). Après
+`warmup` appels (les blocs à mémoire voient la séquence dans l'ordre), chaque
+appel de process() est chronométré (GC désactivé) : médiane, moyenne,
+écart-type, p95, IQR, valeurs aberrantes.
+
+Les résultats sont écrits en JSON avec le commit (benchmark_results/ par
+défaut) ; comparaison entre deux exécutions :
+    python -m ts341_project.benchmarks.results ancien.json nouveau.json
+
+Implémentation alternative d'un bloc (mêmes paramètres, mêmes entrées) :
+les appels de la référence et des alternatives sont entrelacés, l'ordre
+tournant à chaque tour (AB BA AB... : la dérive de la machine et les effets
+d'ordre touchent toutes les implémentations) ; accélération (rapport des
+médianes, intervalle de confiance bootstrap 95 % apparié par tour) et écart
+maximal de sortie par rapport au bloc de référence.
+
+Usage:
+    python -m ts341_project.benchmarks.block_micro
+    python -m ts341_project.benchmarks.block_micro --blocks MorphologyBlock \\
+        --resolutions 1080p 4k --param kernel_size=3,7,11
+    python -m ts341_project.benchmarks.block_micro --blocks MorphologyBlock \\
+        --alternative MorphologyBlock=mon_module:FastMorphologyBlock
+"""
+
+import argparse
+import gc
+import importlib
+import itertools
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from ts341_project.ProcessingResult import ProcessingResult
+from ts341_project.benchmarks.results import (
+    compare,
+    environment,
+    format_comparison,
+    load_results,
+    save_results,
+)
+from ts341_project.benchmarks.synthetic_video import (
+    PATTERN_DIR,
+    RESOLUTIONS,
+    SceneConfig,
+    SyntheticVideo,
+)
+from ts341_project.logging_utils import setup_logging, shutdown_logging
+from ts341_project.pipeline.image_block import (
+    CannyEdgeBlock,
+    ColorFilterBlock,
+    ColorScaleBlock,
+    GaussianBlurBlock,
+    GrayscaleBlock,
+    HistogramEqualizationBlock,
+    MorphologyBlock,
+    RecorderTapBlock,
+    ThresholdBlock,
+)
+from ts341_project.pipeline.image_block.MetadataOverlayBlock import MetadataOverlayBlock
+from ts341_project.pipeline.image_block.ORBMatchingBlock import ORBMatchingBlock
+from ts341_project.pipeline.image_block.ResizeBlock import ResizeBlock
+from ts341_project.pipeline.video_block import (
+    BackgroundSubtractorBlock,
+    CustomDroneBlock,
+    MotionDetectionBlock,
+)
+from ts341_project.pipeline.video_block.ContourMatchingBlock import ContourMatchingBlock
+
+# Métriques comparées à la référence (sens: plus petit est meilleur)
+REGRESSION_METRICS = {"median_ms": "lower"}
+
+INPUTS = ("frame", "mask", "roi", "detections", "overlay")
+
+# Metadata d'une frame avec détections (entrée de MetadataOverlayBlock)
+_OVERLAY_METADATA = {
+    "num_detections": 3,
+    "num_confirmed_drones": 1,
+    "confidence": 0.82,
+    "coord_display": "x=412 y=188",
+    "drone_center": (412, 188),
+}
+
+
+def _build(cls, **params):
+    return cls(**params)
+
+
+@dataclass(frozen=True)
+class BlockCase:
+    """
+    Bloc mesuré et son balayage de paramètres.
+
+    Attributes:
+        cls: Classe du bloc de référence
+        factory: (classe, **paramètres) -> bloc (conversion des paramètres balayés)
+        sweep: Valeurs balayées par paramètre (produit cartésien)
+        channels: Canaux d'entrée mesurés (1 = gris, 3 = BGR)
+        input: 'frame' (image), 'mask' (masque binaire), 'roi' (ROI grise de
+               roi_size), 'detections' (frame + masque dans le scratch),
+               'overlay' (frame + metadata de détections)
+        sized: L'entrée suit la résolution (False: ROI de taille fixe)
+    """
+
+    cls: type
+    factory: Callable = _build
+    sweep: Dict[str, tuple] = field(default_factory=dict)
+    channels: Tuple[int, ...] = (3,)
+    input: str = "frame"
+    sized: bool = True
+
+    def __post_init__(self):
+        if self.input not in INPUTS:
+            raise ValueError(f"Entrée inconnue: {self.input} ({', '.join(INPUTS)})")
+
+    @property
+    def name(self) -> str:
+        return self.cls.__name__
+
+
+def _pattern_block(cls, roi_size=128, **params):
+    block = cls(pattern_dir=str(PATTERN_DIR), roi_size=(roi_size, roi_size), **params)
+    # Sans pattern (aucun descripteur à cette taille), process() ne matche rien
+    orb = getattr(block, "orb_block", block)
+    if not orb.patterns:
+        raise ValueError(
+            f"{cls.__name__}: aucun pattern avec descripteurs ORB en {roi_size}x{roi_size} "
+            f"({PATTERN_DIR})"
+        )
+    return block
+
+
+def _recorder(cls, kind="mask"):
+    directory = tempfile.mkdtemp(prefix="ts341_bench_")
+    block = cls(path=str(Path(directory) / "tap.tsrec"), kind=kind)
+    block.bench_directory = directory  # Supprimé après la mesure
+    return block
+
+
+BLOCK_CASES: Dict[str, BlockCase] = {
+    case.name: case
+    for case in (
+        # image_block/
+        BlockCase(GrayscaleBlock),
+        BlockCase(
+            GaussianBlurBlock,
+            factory=lambda cls, kernel_size: cls(kernel_size=(kernel_size, kernel_size)),
+            sweep={"kernel_size": (3, 5, 9, 15)},
+            channels=(1, 3),
+        ),
+        BlockCase(HistogramEqualizationBlock, channels=(1, 3)),
+        BlockCase(CannyEdgeBlock, channels=(1, 3)),
+        BlockCase(
+            ColorFilterBlock,
+            factory=lambda cls: cls(lower_hsv=(90, 40, 100), upper_hsv=(130, 255, 255)),
+        ),
+        BlockCase(ColorScaleBlock, channels=(1, 3)),
+        BlockCase(
+            MorphologyBlock,
+            sweep={"operation": ("opening", "closing"), "kernel_size": (3, 5, 9)},
+            input="mask",
+        ),
+        BlockCase(
+            ThresholdBlock, sweep={"threshold_type": ("binary", "tozero")}, channels=(1,)
+        ),
+        BlockCase(ResizeBlock, sweep={"target_width": (640, 1280)}),
+        BlockCase(MetadataOverlayBlock, input="overlay"),
+        BlockCase(RecorderTapBlock, factory=_recorder, input="mask"),
+        BlockCase(
+            ORBMatchingBlock,
+            factory=_pattern_block,
+            sweep={"orb_n_features": (100, 300, 1000), "roi_size": (96, 128, 256)},
+            input="roi",
+            sized=False,
+        ),
+        # video_block/
+        BlockCase(MotionDetectionBlock),
+        BlockCase(
+            BackgroundSubtractorBlock,
+            factory=lambda cls, mog2_history: cls(history=mog2_history),
+            sweep={"mog2_history": (100, 300, 500)},
+            channels=(1, 3),
+        ),
+        BlockCase(
+            ContourMatchingBlock,
+            factory=_pattern_block,
+            sweep={"orb_n_features": (100, 300, 1000), "roi_size": (96, 128)},
+            input="detections",
+        ),
+        BlockCase(
+            CustomDroneBlock,
+            factory=lambda cls, **params: cls(pattern_dir=str(PATTERN_DIR), **params),
+            sweep={"mog2_history": (100, 300, 500), "orb_n_features": (100, 300, 1000)},
+        ),
+    )
+}
+
+
+class BenchInputs:
+    """
+    Entrées synthétiques d'une résolution (générées une fois) : séquence BGR
+    et grise, masques de mouvement nettoyés, ROIs autour des sprites.
+    """
+
+    def __init__(self, resolution: str, frames: int = 40, seed: int = 0):
+        video = SyntheticVideo(
+            SceneConfig(
+                resolution=resolution, background="sky", frames=frames, sprites=3, seed=seed
+            )
+        )
+        self.bgr, self.boxes = [], []
+        for frame, boxes in video.frames():
+            self.bgr.append(frame)
+            self.boxes.append([entry["box"] for entry in boxes])
+        self.gray = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in self.bgr]
+        self.masks = self._motion_masks()
+        self._rois = {}
+
+    def _motion_masks(self) -> List[np.ndarray]:
+        """Masques comme dans CustomDroneBlock (MOG2, seuil, ouverture, fermeture)"""
+        subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=300, varThreshold=20, detectShadows=False
+        )
+        kernel = np.ones((3, 3), np.uint8)
+        masks = []
+        for frame in self.bgr:
+            mask = subtractor.apply(frame)
+            mask = cv2.threshold(mask, 250, 255, cv2.THRESH_BINARY)[1]
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+            masks.append(cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel))
+        # Les premières frames (modèle de fond vide) sont entièrement en mouvement
+        skip = min(5, len(masks) - 1)
+        return masks[skip:] + masks[:skip]
+
+    def rois(self, roi_size: int) -> List[np.ndarray]:
+        """ROIs grises (roi_size x roi_size) autour des sprites"""
+        if roi_size not in self._rois:
+            rois = []
+            for gray, boxes in zip(self.gray, self.boxes):
+                for x, y, w, h in boxes:
+                    margin = max(w, h) // 2
+                    top, left = max(0, y - margin), max(0, x - margin)
+                    roi = gray[top : y + h + margin, left : x + w + margin]
+                    rois.append(cv2.resize(roi, (roi_size, roi_size)))
+            self._rois[roi_size] = rois
+        return self._rois[roi_size]
+
+    def call(self, case: BlockCase, channels: int, params: dict, index: int):
+        """Arguments de process() pour l'appel `index` (préparés hors chronométrage)"""
+        n = len(self.bgr)
+        if case.input == "mask":
+            return self.masks[index % n], None
+        if case.input == "roi":
+            rois = self.rois(params.get("roi_size", 128))
+            return rois[index % len(rois)], None
+        if case.input == "detections":
+            frame = self.bgr[index % n].copy()  # Boîtes dessinées sur la frame
+            return frame, ProcessingResult(frame=frame, scratch={"fg_mask": self.masks[index % n]})
+        if case.input == "overlay":
+            frame = self.bgr[index % n]
+            return frame, ProcessingResult(frame=frame, metadata=dict(_OVERLAY_METADATA))
+        return (self.gray if channels == 1 else self.bgr)[index % n], None
+
+
+def summarize(samples: List[float]) -> dict:
+    """Statistiques d'une série de durées (secondes -> ms)"""
+    values = np.asarray(samples) * 1e3
+    q1, median, q3, p95 = np.percentile(values, [25, 50, 75, 95])
+    mean = float(values.mean())
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    iqr = q3 - q1
+    return {
+        "median_ms": float(median),
+        "mean_ms": mean,
+        "stdev_ms": stdev,
+        "min_ms": float(values.min()),
+        "p95_ms": float(p95),
+        "iqr_ms": float(iqr),
+        "rsd": stdev / mean if mean else 0.0,
+        "outliers": int(np.count_nonzero(values > q3 + 1.5 * iqr)),
+        "fps": 1e3 / median if median else 0.0,
+        "repeats": len(samples),
+    }
+
+
+def speedup(reference: List[float], candidate: List[float], resamples: int = 2000, seed: int = 0):
+    """
+    Accélération (médiane référence / médiane candidat) et intervalle de
+    confiance bootstrap 95 %.
+
+    Les mesures sont appariées par tour (même indice = même tour entrelacé) :
+    chaque rééchantillon tire des tours, pas des mesures indépendantes.
+    """
+    rng = np.random.default_rng(seed)
+    reference, candidate = np.asarray(reference), np.asarray(candidate)
+    if len(reference) != len(candidate):
+        raise ValueError("Mesures non appariées (nombres de tours différents)")
+    rounds = rng.integers(0, len(reference), (resamples, len(reference)))
+    ratios = np.median(reference[rounds], axis=1) / np.median(candidate[rounds], axis=1)
+    low, high = np.percentile(ratios, [2.5, 97.5])
+    return float(np.median(reference) / np.median(candidate)), (float(low), float(high))
+
+
+def time_blocks(
+    blocks: list,
+    inputs: BenchInputs,
+    case: BlockCase,
+    channels: int,
+    params: dict,
+    warmup: int,
+    repeats: int,
+):
+    """
+    Chronomètre process() de plusieurs implémentations, appels entrelacés
+    (GC désactivé).
+
+    À chaque tour, chaque bloc traite la même entrée, copiée pour lui juste
+    avant l'appel (hors chronométrage : chacun la trouve dans le cache, aucun
+    ne profite de la lecture faite par le précédent) ;
+    l'ordre des blocs tourne d'un tour à l'autre, chaque bloc passe en
+    premier aussi souvent que les autres. Chaque bloc voit la séquence dans
+    l'ordre (blocs à mémoire).
+
+    Returns:
+        (durées en secondes par bloc, dernier résultat par bloc)
+    """
+    for index in range(warmup):
+        for block in blocks:
+            block.process(*inputs.call(case, channels, params, index))
+
+    samples = [[] for _ in blocks]
+    outputs = [None] * len(blocks)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for index in range(warmup, warmup + repeats):
+            for i in np.roll(np.arange(len(blocks)), index):
+                frame, result = inputs.call(case, channels, params, index)
+                if result is None:
+                    frame = frame.copy()  # ('detections' : frame déjà copiée)
+                t0 = time.perf_counter()
+                outputs[i] = blocks[i].process(frame, result)
+                samples[i].append(time.perf_counter() - t0)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples, outputs
+
+
+def _close(block):
+    block.close()
+    directory = getattr(block, "bench_directory", None)
+    if directory is not None:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _output_diff(reference: ProcessingResult, candidate: ProcessingResult) -> float:
+    """Écart maximal entre deux frames de sortie (inf si formes différentes)"""
+    a, b = reference.frame, candidate.frame
+    if a.shape != b.shape:
+        return float("inf")
+    return float(np.abs(a.astype(np.int16) - b.astype(np.int16)).max()) if a.size else 0.0
+
+
+def _key(case: BlockCase, resolution: str, channels: int, params: dict) -> str:
+    parts = [case.name, resolution if case.sized else "roi"]
+    if len(case.channels) > 1:
+        parts.append(f"c{channels}")
+    parts.extend(f"{name}={value}" for name, value in params.items())
+    return " ".join(parts)
+
+
+def _load_class(target: str) -> type:
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_case(
+    case: BlockCase,
+    inputs: BenchInputs,
+    resolution: str,
+    channels: int,
+    params: dict,
+    warmup: int,
+    repeats: int,
+    alternatives: List[Tuple[str, type]] = (),
+) -> List[dict]:
+    """Mesure un bloc (et ses alternatives) pour une combinaison de paramètres"""
+    key = _key(case, resolution, channels, params)
+    base = {
+        "block": case.name,
+        "resolution": resolution if case.sized else None,
+        "channels": channels,
+        "params": params,
+    }
+
+    blocks = []
+    try:
+        for cls in [case.cls] + [cls for _, cls in alternatives]:
+            blocks.append(case.factory(cls, **params))
+        all_samples, outputs = time_blocks(
+            blocks, inputs, case, channels, params, warmup, repeats
+        )
+    finally:
+        for block in blocks:
+            _close(block)
+
+    samples, output = all_samples[0], outputs[0]
+    entries = [
+        {"key": key, "implementation": "reference", **base, **summarize(samples)}
+    ]
+
+    for (label, _), alt_samples, alt_output in zip(alternatives, all_samples[1:], outputs[1:]):
+        ratio, interval = speedup(samples, alt_samples)
+        entries.append(
+            {
+                "key": f"{key} [{label}]",
+                "implementation": label,
+                **base,
+                **summarize(alt_samples),
+                "speedup": ratio,
+                "speedup_ci95": interval,
+                "significant": interval[0] > 1.0 or interval[1] < 1.0,
+                "max_output_diff": _output_diff(output, alt_output),
+            }
+        )
+    return entries
+
+
+def _parse_value(text: str):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _sweep(case: BlockCase, overrides: Dict[str, tuple]) -> List[dict]:
+    sweep = {name: overrides.get(name, values) for name, values in case.sweep.items()}
+    names = list(sweep)
+    return [dict(zip(names, values)) for values in itertools.product(*sweep.values())]
+
+
+def format_results(results: List[dict]) -> str:
+    """Tableau des résultats (accélération pour les alternatives)"""
+    width = max(len(r["key"]) for r in results)
+    lines = [
+        f"{'bloc':<{width}s} {'médiane':>10s} {'p95':>10s} {'IQR':>9s} {'RSD':>6s}  "
+        f"{'FPS':>8s}"
+    ]
+    for r in results:
+        line = (
+            f"{r['key']:<{width}s} {r['median_ms']:>7.3f} ms {r['p95_ms']:>7.3f} ms "
+            f"{r['iqr_ms']:>6.3f} ms {r['rsd'] * 100:>5.1f}%  {r['fps']:>8.1f}"
+        )
+        if "speedup" in r:
+            low, high = r["speedup_ci95"]
+            line += (
+                f"  x{r['speedup']:.2f} [{low:.2f}-{high:.2f}]"
+                f"{'' if r['significant'] else ' (non significatif)'}"
+                f"  écart sortie={r['max_output_diff']:g}"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des blocs de traitement")
+    parser.add_argument(
+        "--blocks",
+        nargs="+",
+        choices=list(BLOCK_CASES),
+        default=list(BLOCK_CASES),
+        help="Blocs mesurés (défaut: tous)",
+    )
+    parser.add_argument(
+        "--resolutions",
+        nargs="+",
+        choices=list(RESOLUTIONS),
+        default=["480p", "1080p"],
+        help="Résolutions d'entrée (défaut: 480p 1080p)",
+    )
+    parser.add_argument(
+        "--channels",
+        nargs="+",
+        type=int,
+        choices=[1, 3],
+        help="Canaux mesurés (défaut: ceux de chaque bloc)",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NOM=V1,V2",
+        help="Valeurs balayées d'un paramètre (remplace le balayage par défaut)",
+    )
+    parser.add_argument("--warmup", type=int, default=5, help="Appels de chauffe (défaut: 5)")
+    parser.add_argument("--repeats", type=int, default=30, help="Appels mesurés (défaut: 30)")
+    parser.add_argument(
+        "--sequence",
+        type=int,
+        default=40,
+        help="Frames synthétiques par résolution (défaut: 40)",
+    )
+    parser.add_argument(
+        "--alternative",
+        action="append",
+        default=[],
+        metavar="BLOC=module:Classe",
+        help="Implémentation alternative d'un bloc, comparée à la référence",
+    )
+    parser.add_argument("--json", metavar="FICHIER", help="Fichier de résultats")
+    parser.add_argument(
+        "--output-dir",
+        default="benchmark_results",
+        help="Dossier des résultats si --json absent (défaut: benchmark_results)",
+    )
+    parser.add_argument("--baseline", metavar="FICHIER", help="Résultats de référence")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Ralentissement toléré par rapport à la référence (défaut: 0.10)",
+    )
+    args = parser.parse_args()
+
+    overrides = {}
+    for text in args.param:
+        name, _, values = text.partition("=")
+        overrides[name] = tuple(_parse_value(v) for v in values.split(",") if v)
+    alternatives: Dict[str, List[Tuple[str, type]]] = {}
+    for text in args.alternative:
+        block_name, _, target = text.partition("=")
+        if block_name not in BLOCK_CASES:
+            parser.error(f"Bloc inconnu: {block_name}")
+        alternatives.setdefault(block_name, []).append((target, _load_class(target)))
+
+    setup_logging(level=logging.WARNING)
+    results = []
+    inputs_by_resolution = {}
+    try:
+        for resolution in args.resolutions:
+            for name in args.blocks:
+                case = BLOCK_CASES[name]
+                # Entrée de taille fixe (ROI) : une seule résolution suffit
+                if not case.sized and resolution != args.resolutions[0]:
+                    continue
+                if resolution not in inputs_by_resolution:
+                    inputs_by_resolution[resolution] = BenchInputs(resolution, args.sequence)
+                inputs = inputs_by_resolution[resolution]
+                channels = [c for c in case.channels if not args.channels or c in args.channels]
+                for params, count in itertools.product(_sweep(case, overrides), channels):
+                    entries = run_case(
+                        case,
+                        inputs,
+                        resolution,
+                        count,
+                        params,
+                        args.warmup,
+                        args.repeats,
+                        alternatives.get(name, ()),
+                    )
+                    for entry in entries:
+                        print(f"{entry['key']}: {entry['median_ms']:.3f} ms", flush=True)
+                    results.extend(entries)
+    finally:
+        shutdown_logging()
+
+    print()
+    print(format_results(results))
+
+    path = args.json
+    if path is None:
+        env = environment()
+        label = (env["commit"] or "sans-commit") + ("-modifié" if env["dirty"] else "")
+        path = Path(args.output_dir) / f"blocks-{label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    settings = {
+        "resolutions": args.resolutions,
+        "warmup": args.warmup,
+        "repeats": args.repeats,
+        "sequence": args.sequence,
+        "alternatives": args.alternative,
+    }
+
+    regressions = []
+    if args.baseline:
+        reference = [r for r in results if r["implementation"] == "reference"]
+        rows = compare(
+            reference, load_results(args.baseline)["results"], REGRESSION_METRICS, args.tolerance
+        )
+        print()
+        print(format_comparison(rows))
+        regressions = [row for row in rows if row["regression"]]
+
+    save_results(
+        path,
+        "block_micro",
+        settings,
+        results,
+        metrics=REGRESSION_METRICS,
+        regressions=[row["key"] for row in regressions],
+    )
+    print(f"\nRésultats: {path}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Coût d'un record de log émis par un processus de travail.
+
+Compare l'ancien transport (Manager().Queue : un aller-retour vers le serveur
+du Manager par record) et le transport actuel (multiprocessing.Queue, par
+lots, avec ou sans limitation de débit). Pour chaque configuration, un
+processus enfant émet N records DEBUG depuis une boucle (comme les boucles
+de frames) ; on mesure le coût par record côté émetteur et le délai jusqu'à
+réception du dernier record par le listener. Le dernier lot part par le
+vidage de sortie du processus : 'reçus' doit valoir N (hors limitation).
+
+'queue' (lots de 1) et 'queue+lots' isolent l'effet des lots : le thread
+d'alimentation de la queue sérialise et écrit dans le pipe une fois par lot
+au lieu d'une fois par record, et partage le GIL avec la boucle émettrice ;
+sans lots il prend aussi du retard (livraison > émission).
+
+Usage:
+    python -m ts341_project.benchmarks.log_overhead [--records 20000] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+from ts341_project.logging_utils import BatchQueueListener, MultiprocessLogManager
+
+CONFIGS = {
+    "manager": dict(transport="manager", rate_limit=None),
+    "queue": dict(transport="queue", batch_size=1, rate_limit=None),
+    "queue+lots": dict(transport="queue", batch_size=64, rate_limit=None),
+    "queue+lots+limite": dict(transport="queue", batch_size=64, rate_limit=(20, 1.0)),
+}
+
+
+class _CountingHandler(logging.Handler):
+    """Compte les records reçus par le listener (sans formatage ni sortie)"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.last_time = 0.0
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self.count += 1
+            self.last_time = time.time()
+
+
+def _emit_records(handler, records, result_queue):
+    """Processus émetteur : boucle chaude qui logue à chaque itération"""
+    logger = logging.getLogger("ts341_project.benchmarks.emitter")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    start_wall = time.time()
+    t0 = time.perf_counter()
+    for i in range(records):
+        logger.debug("%d frames | %.1f FPS", i, 25.0)
+    elapsed = time.perf_counter() - t0
+    # Pas de flush explicite : le dernier lot part par le vidage de sortie du processus
+    result_queue.put((start_wall, elapsed))
+
+
+def run_config(name: str, records: int) -> dict:
+    """Mesure une configuration de transport"""
+    manager = MultiprocessLogManager(level=logging.DEBUG, **CONFIGS[name])
+    counter = _CountingHandler()
+    listener = BatchQueueListener(manager.log_queue, counter)
+    listener.start()
+
+    result_queue = Queue()
+    process = Process(target=_emit_records, args=(manager.handler, records, result_queue))
+    process.start()
+    while True:
+        try:
+            start_wall, elapsed = result_queue.get(timeout=1.0)
+            break
+        except Empty:
+            if not process.is_alive():
+                listener.stop()
+                raise RuntimeError(f"{name}: le processus émetteur s'est arrêté")
+    process.join()
+
+    # Attendre que le listener ait tout reçu (compteur stable)
+    previous = -1
+    while counter.count != previous:
+        previous = counter.count
+        time.sleep(0.3)
+    listener.stop()
+
+    return {
+        "config": name,
+        "records": records,
+        "received": counter.count,
+        "per_record_us": elapsed / records * 1e6,
+        "emit_s": elapsed,
+        "delivery_s": max(0.0, counter.last_time - start_wall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût par record du transport de logs")
+    parser.add_argument("--records", type=int, default=20000, help="Records émis (défaut: 20000)")
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        choices=list(CONFIGS),
+        default=list(CONFIGS),
+        help="Configurations mesurées",
+    )
+    parser.add_argument("--json", metavar="FICHIER", help="Écrire les résultats en JSON")
+    args = parser.parse_args()
+
+    results = [run_config(name, args.records) for name in args.configs]
+
+    print(f"{'configuration':<20s} {'µs/record':>10s} {'émission':>10s} {'livraison':>10s} {'reçus':>8s}")
+    for r in results:
+        print(
+            f"{r['config']:<20s} {r['per_record_us']:>10.2f} {r['emit_s']:>9.2f}s "
+            f"{r['delivery_s']:>9.2f}s {r['received']:>8d}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Débit de chaque pipeline sur des vidéos synthétiques (sans affichage ni sauvegarde).
+
+Pour chaque pipeline de AVAILABLE_PIPELINES et chaque scène (fond x
+résolution), la vidéo synthétique est générée (ou reprise du cache) puis
+traitée par l'orchestrateur complet (reader + processor, aucun sink). Les
+métriques partagées des processus (PipelineMetrics) donnent le débit, la
+mémoire résidente par étape et les percentiles de durée par bloc ; le tout
+est écrit en JSON.
+
+Régressions : comparaison à un fichier de résultats précédent (--baseline,
+FPS et mémoire, tolérance relative) et/ou FPS minimal (--min-fps). Code de
+sortie 1 si une régression est détectée.
+
+Usage:
+    python -m ts341_project.benchmarks.pipeline_throughput --json bench.json
+    python -m ts341_project.benchmarks.pipeline_throughput \\
+        --pipelines drone-detection --resolutions 1080p 4k --baseline bench.json
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from ts341_project.PipelineMetrics import MetricsExporter
+from ts341_project.VideoProcessor import VideoProcessor
+from ts341_project.benchmarks.results import (
+    compare,
+    format_comparison,
+    load_results,
+    save_results,
+)
+from ts341_project.benchmarks.synthetic_video import (
+    BACKGROUNDS,
+    RESOLUTIONS,
+    SceneConfig,
+    ensure_video,
+    load_ground_truth,
+)
+from ts341_project.logging_utils import setup_logging, shutdown_logging
+from ts341_project.pipeline import AVAILABLE_PIPELINES
+
+# Métriques comparées à la référence (sens: plus grand / plus petit est meilleur)
+REGRESSION_METRICS = {"fps": "higher", "rss_mb": "lower"}
+
+
+def _stage_report(snapshot: dict) -> dict:
+    """Étape: frames, RSS et durées par bloc (ms)"""
+    blocks = {
+        name: {
+            "p50_ms": values["p50"] * 1e3,
+            "p95_ms": values["p95"] * 1e3,
+            "p99_ms": values["p99"] * 1e3,
+            "mean_ms": values["sum"] / values["count"] * 1e3 if values["count"] else 0.0,
+            "count": int(values["count"]),
+        }
+        for name, values in snapshot["blocks"].items()
+    }
+    return {
+        "frames": snapshot["frames"],
+        "rss_mb": snapshot["rss_bytes"] / (1024 * 1024),
+        "blocks": blocks,
+    }
+
+
+def run_pipeline(pipeline: str, scene: SceneConfig, video_dir: str, reader_backend: str) -> dict:
+    """Traite une scène avec un pipeline et retourne ses mesures"""
+    video_path = ensure_video(scene, video_dir)
+    truth = load_ground_truth(video_path)["frames"]
+
+    processor = VideoProcessor(
+        source=str(video_path),
+        pipeline=pipeline,
+        enable_display=False,
+        enable_storage=False,
+        reader_backend=reader_backend,
+    )
+    # Exporteur sans sortie (ni port ni fichier) : lecture directe des blocs partagés
+    processor.metrics = MetricsExporter(queues=processor.queues)
+
+    t0 = time.perf_counter()
+    processor.start()
+    processor.wait()
+    wall = time.perf_counter() - t0
+    processor.stop()
+
+    stages = {m.stage: m.snapshot() for m in processor.metrics.stages}
+    processing = stages["processor"]
+    frames = processing["frames"]
+    # Débit établi : de la première à la dernière frame traitée
+    # (démarrage des processus et construction du pipeline exclus)
+    span = processing["updated"] - processing["started"]
+    fps = (frames - 1) / span if frames > 1 and span > 0 else 0.0
+
+    report = {name: _stage_report(snapshot) for name, snapshot in stages.items()}
+    return {
+        "key": f"{pipeline}/{scene.background}/{scene.resolution}",
+        "pipeline": pipeline,
+        "scene": scene.name,
+        "background": scene.background,
+        "resolution": scene.resolution,
+        "frames": frames,
+        "fps": fps,
+        "wall_s": wall,
+        "time_to_first_frame_s": processor.time_to_first_frame,
+        "rss_mb": sum(stage["rss_mb"] for stage in report.values()),
+        "detections_per_frame": processing["detections"] / frames if frames else 0.0,
+        "truth_per_frame": sum(len(boxes) for boxes in truth) / len(truth) if truth else 0.0,
+        "stages": report,
+    }
+
+
+def _slowest_block(result: dict) -> str:
+    blocks = {
+        name: values
+        for name, values in result["stages"]["processor"]["blocks"].items()
+        if name != "pipeline"  # Durée totale du pipeline
+    }
+    if not blocks:
+        return "-"
+    name, values = max(blocks.items(), key=lambda item: item[1]["p95_ms"])
+    return f"{name} p95={values['p95_ms']:.2f} ms"
+
+
+def format_results(results: List[dict]) -> str:
+    """Tableau des résultats"""
+    width = max(len(r["key"]) for r in results)
+    lines = [
+        f"{'pipeline/fond/résolution':<{width}s} {'FPS':>8s} {'1re frame':>10s} "
+        f"{'RSS':>9s}  bloc le plus lent"
+    ]
+    for r in results:
+        first = r["time_to_first_frame_s"]
+        lines.append(
+            f"{r['key']:<{width}s} {r['fps']:>8.1f} "
+            f"{(f'{first:.2f}s' if first is not None else '-'):>10s} "
+            f"{r['rss_mb']:>6.0f} Mo  {_slowest_block(r)}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit des pipelines sur vidéos synthétiques")
+    parser.add_argument(
+        "--pipelines",
+        nargs="+",
+        choices=list(AVAILABLE_PIPELINES.keys()),
+        default=list(AVAILABLE_PIPELINES.keys()),
+        help="Pipelines mesurés (défaut: tous)",
+    )
+    parser.add_argument(
+        "--resolutions",
+        nargs="+",
+        choices=list(RESOLUTIONS),
+        default=["480p", "1080p"],
+        help="Résolutions (défaut: 480p 1080p)",
+    )
+    parser.add_argument(
+        "--backgrounds",
+        nargs="+",
+        choices=BACKGROUNDS,
+        default=list(BACKGROUNDS),
+        help="Fonds (défaut: tous)",
+    )
+    parser.add_argument("--frames", type=int, default=120, help="Frames par vidéo (défaut: 120)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des scènes (défaut: 0)")
+    parser.add_argument(
+        "--video-dir",
+        default="benchmark_videos",
+        help="Cache des vidéos générées (défaut: benchmark_videos)",
+    )
+    parser.add_argument(
+        "--reader-backend", choices=["opencv", "ffmpeg"], default="opencv", help="Lecture"
+    )
+    parser.add_argument("--json", metavar="FICHIER", help="Écrire les résultats en JSON")
+    parser.add_argument(
+        "--baseline", metavar="FICHIER", help="Résultats de référence (régressions FPS / RSS)"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Dégradation tolérée par rapport à la référence (défaut: 0.15)",
+    )
+    parser.add_argument("--min-fps", type=float, help="FPS minimal de chaque mesure")
+    args = parser.parse_args()
+
+    setup_logging(level=logging.WARNING)
+    results = []
+    try:
+        for resolution in args.resolutions:
+            for background in args.backgrounds:
+                scene = SceneConfig(
+                    resolution=resolution,
+                    background=background,
+                    frames=args.frames,
+                    seed=args.seed,
+                )
+                for pipeline in args.pipelines:
+                    result = run_pipeline(pipeline, scene, args.video_dir, args.reader_backend)
+                    print(
+                        f"{result['key']}: {result['fps']:.1f} FPS "
+                        f"({result['frames']} frames)",
+                        flush=True,
+                    )
+                    results.append(result)
+    finally:
+        shutdown_logging()
+
+    print()
+    print(format_results(results))
+
+    regressions = []
+    if args.min_fps is not None:
+        for r in results:
+            if r["fps"] < args.min_fps:
+                regressions.append(f"{r['key']}: {r['fps']:.1f} FPS < {args.min_fps:.1f}")
+    if args.baseline:
+        rows = compare(
+            results,
+            load_results(args.baseline)["results"],
+            REGRESSION_METRICS,
+            args.tolerance,
+        )
+        print()
+        print(format_comparison(rows))
+        regressions.extend(
+            f"{row['key']}: {row['metric']} {row['baseline']:.2f} -> {row['value']:.2f}"
+            for row in rows
+            if row["regression"]
+        )
+
+    if args.json:
+        save_results(
+            args.json,
+            "pipeline_throughput",
+            {
+                "frames": args.frames,
+                "seed": args.seed,
+                "reader_backend": args.reader_backend,
+                "tolerance": args.tolerance,
+                "min_fps": args.min_fps,
+            },
+            results,
+            metrics=REGRESSION_METRICS,
+            regressions=regressions,
+        )
+        print(f"\nRésultats: {Path(args.json)}")
+
+    if regressions:
+        print("\nRégressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Résultats de benchmark : environnement d'exécution, fichiers JSON et
+comparaison à une référence (autre commit, autre machine, autre implémentation).
+
+Chaque résultat est un dict identifié par sa clé 'key' ; la comparaison
+porte sur des métriques numériques dont le sens est donné ('higher' : plus
+grand est meilleur, 'lower' : plus petit est meilleur) ; un fichier de
+résultats enregistre les siennes ('metrics').
+
+Comparaison de deux fichiers (code de sortie 1 si régression) :
+    python -m ts341_project.benchmarks.results ancien.json nouveau.json [--tolerance 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+SENSES = ("higher", "lower")
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def environment() -> dict:
+    """Commit, machine et versions (pour situer un résultat)"""
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+        "numpy": np.__version__,
+    }
+
+
+def save_results(
+    path: str, kind: str, settings: dict, results: List[dict], **extra
+) -> dict:
+    """Écrit un fichier de résultats (environnement + réglages + résultats + extra)"""
+    document = {
+        "kind": kind,
+        "environment": environment(),
+        "settings": settings,
+        "results": results,
+        **extra,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False))
+    return document
+
+
+def load_results(path: str) -> dict:
+    """Lit un fichier de résultats"""
+    return json.loads(Path(path).read_text())
+
+
+def compare(
+    results: List[dict],
+    baseline: List[dict],
+    metrics: Dict[str, str],
+    tolerance: float = 0.15,
+) -> List[dict]:
+    """
+    Compare des résultats à une référence (résultats de même clé).
+
+    Args:
+        results: Résultats courants
+        baseline: Résultats de référence
+        metrics: {métrique: 'higher' | 'lower'}
+        tolerance: Dégradation relative tolérée (0.15 = 15 %)
+
+    Returns:
+        Une ligne par (clé, métrique) présente des deux côtés :
+        {'key', 'metric', 'value', 'baseline', 'change', 'regression'}
+        ('change' relatif, positif = meilleur)
+    """
+    for metric, sense in metrics.items():
+        if sense not in SENSES:
+            raise ValueError(f"Sens inconnu pour {metric}: {sense} ({', '.join(SENSES)})")
+
+    reference = {entry["key"]: entry for entry in baseline}
+    rows = []
+    for entry in results:
+        previous = reference.get(entry["key"])
+        if previous is None:
+            continue
+        for metric, sense in metrics.items():
+            value, base = entry.get(metric), previous.get(metric)
+            if value is None or base is None or base == 0:
+                continue
+            change = (value - base) / abs(base)
+            if sense == "lower":
+                change = -change
+            rows.append(
+                {
+                    "key": entry["key"],
+                    "metric": metric,
+                    "value": value,
+                    "baseline": base,
+                    "change": change,
+                    "regression": change < -tolerance,
+                }
+            )
+    return rows
+
+
+def format_comparison(rows: List[dict], title: str = "Comparaison à la référence") -> str:
+    """Tableau de comparaison (régressions marquées)"""
+    if not rows:
+        return f"{title}: aucun résultat commun"
+    width = max(len(row["key"]) for row in rows)
+    lines = [f"{title}:"]
+    for row in rows:
+        flag = "  RÉGRESSION" if row["regression"] else ""
+        lines.append(
+            f"  {row['key']:<{width}s}  {row['metric']:<14s} "
+            f"{row['baseline']:>10.3f} -> {row['value']:>10.3f}  "
+            f"{row['change'] * 100:+6.1f} %{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _describe(document: dict) -> str:
+    env = document.get("environment", {})
+    commit = env.get("commit") or "?"
+    if env.get("dirty"):
+        commit += " (modifié)"
+    return f"{commit} {env.get('created', '')} {env.get('host', '')}".strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare deux fichiers de résultats de benchmark")
+    parser.add_argument("baseline", help="Résultats de référence (ex: commit précédent)")
+    parser.add_argument("current", help="Résultats comparés")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Dégradation relative tolérée (défaut: 0.15)",
+    )
+    parser.add_argument(
+        "--metric",
+        action="append",
+        default=[],
+        metavar="NOM:SENS",
+        help="Métrique comparée, SENS = higher | lower (défaut: celles du fichier)",
+    )
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    if baseline.get("kind") != current.get("kind"):
+        parser.error(f"Fichiers de types différents: {baseline.get('kind')} / {current.get('kind')}")
+    metrics = dict(metric.split(":", 1) for metric in args.metric) or current.get("metrics")
+    if not metrics:
+        parser.error("Aucune métrique à comparer (--metric NOM:SENS)")
+
+    rows = compare(current["results"], baseline["results"], metrics, args.tolerance)
+    print(f"Référence: {_describe(baseline)}")
+    print(f"Comparé:   {_describe(current)}")
+    print(format_comparison(rows, title="Comparaison"))
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) (tolérance {args.tolerance * 100:.0f} %)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
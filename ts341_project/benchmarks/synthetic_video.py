@@ -0,0 +1,385 @@
+"""
+Vidéos synthétiques déterministes pour les benchmarks (aucune vidéo d'exemple requise).
+
+Les sprites de pipeline/patterns/*.png (détourés de leur fond de ciel) volent
+au-dessus d'un fond généré :
+    sky      : dégradé de ciel et nuages qui dérivent lentement
+    texture  : texture fine avec panoramique de la caméra (mouvement global)
+    foliage  : feuillage agité par le vent (mouvement local sur toute l'image)
+en 480p, 720p, 1080p ou 4K. Même configuration (graine comprise) = mêmes frames.
+Les boîtes vraies de chaque sprite sont écrites à côté de la vidéo
+(<nom>.json) ; une vidéo déjà générée est réutilisée.
+
+Usage:
+    python -m ts341_project.benchmarks.synthetic_video --resolution 1080p \\
+        --background foliage --frames 120 -o benchmark_videos/
+"""
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+RESOLUTIONS = {
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+BACKGROUNDS = ("sky", "texture", "foliage")
+
+PATTERN_DIR = Path(__file__).resolve().parent.parent / "pipeline" / "patterns"
+
+# Variantes de bruit capteur précalculées (cyclées)
+_NOISE_FRAMES = 4
+
+
+@dataclass(frozen=True)
+class SceneConfig:
+    """
+    Scène synthétique.
+
+    Attributes:
+        resolution: Clé de RESOLUTIONS ('480p', '720p', '1080p', '4k')
+        background: Fond ('sky', 'texture', 'foliage')
+        frames: Nombre de frames
+        fps: Cadence de la vidéo
+        sprites: Nombre de sprites simultanés
+        seed: Graine (fond, trajectoires, choix des sprites)
+    """
+
+    resolution: str = "480p"
+    background: str = "sky"
+    frames: int = 120
+    fps: float = 25.0
+    sprites: int = 2
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.resolution not in RESOLUTIONS:
+            raise ValueError(
+                f"Résolution inconnue: {self.resolution} ({', '.join(RESOLUTIONS)})"
+            )
+        if self.background not in BACKGROUNDS:
+            raise ValueError(f"Fond inconnu: {self.background} ({', '.join(BACKGROUNDS)})")
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(largeur, hauteur)"""
+        return RESOLUTIONS[self.resolution]
+
+    @property
+    def name(self) -> str:
+        """Nom de fichier (unique par configuration)"""
+        return (
+            f"{self.background}-{self.resolution}-{self.frames}f-"
+            f"{self.sprites}s-{self.fps:g}fps-seed{self.seed}"
+        )
+
+
+@dataclass
+class Sprite:
+    """Sprite détouré : image BGR, masque (0-1) et boîte du masque"""
+
+    name: str
+    image: np.ndarray
+    mask: np.ndarray
+    box: Tuple[int, int, int, int]  # (x, y, w, h) dans le sprite
+
+    def scaled(self, factor: float) -> "Sprite":
+        width = max(4, int(round(self.image.shape[1] * factor)))
+        height = max(4, int(round(self.image.shape[0] * factor)))
+        image = cv2.resize(self.image, (width, height), interpolation=cv2.INTER_AREA)
+        mask = cv2.resize(self.mask, (width, height), interpolation=cv2.INTER_LINEAR)
+        return Sprite(self.name, image, mask, _mask_box(mask))
+
+
+def _mask_box(mask: np.ndarray) -> Tuple[int, int, int, int]:
+    points = cv2.findNonZero((mask > 0.5).astype(np.uint8))
+    if points is None:
+        return (0, 0, mask.shape[1], mask.shape[0])
+    return tuple(int(v) for v in cv2.boundingRect(points))
+
+
+def load_sprites(pattern_dir: Path = PATTERN_DIR) -> List[Sprite]:
+    """
+    Sprites des patterns, détourés : les pixels proches de la couleur médiane
+    du bord (le ciel autour de l'objet) deviennent transparents.
+    """
+    sprites = []
+    for path in sorted(Path(pattern_dir).glob("*.png")):
+        image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            continue
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        bgr = image[..., :3]
+        alpha = image[..., 3] / 255.0 if image.shape[2] == 4 else 1.0
+
+        border = np.concatenate([bgr[0], bgr[-1], bgr[:, 0], bgr[:, -1]])
+        background = np.median(border, axis=0)
+        distance = np.abs(bgr.astype(np.float32) - background).max(axis=2)
+        mask = (np.clip((distance - 12.0) / 24.0, 0.0, 1.0) * alpha).astype(np.float32)
+        if mask.max() < 0.5:
+            continue
+
+        x, y, w, h = _mask_box(mask)
+        mask = mask[y : y + h, x : x + w]
+        sprites.append(
+            Sprite(path.stem, bgr[y : y + h, x : x + w].copy(), mask, _mask_box(mask))
+        )
+    return sprites
+
+
+def _value_noise(rng, height: int, width: int, cell: int, octaves: int = 1) -> np.ndarray:
+    """Bruit lisse multi-octaves (0-1), interpolation bicubique d'une grille aléatoire"""
+    noise = np.zeros((height, width), np.float32)
+    amplitude = 0.0
+    for octave in range(octaves):
+        step = max(2, cell >> octave)
+        grid = rng.random((height // step + 2, width // step + 2), dtype=np.float32)
+        layer = cv2.resize(
+            grid, (grid.shape[1] * step, grid.shape[0] * step), interpolation=cv2.INTER_CUBIC
+        )
+        weight = 0.5**octave
+        noise += weight * layer[:height, :width]
+        amplitude += weight
+    return np.clip(noise / amplitude, 0.0, 1.0)
+
+
+class _Track:
+    """Trajectoire d'un sprite : vitesse constante, rebonds et oscillation verticale"""
+
+    def __init__(self, rng, sprite: Sprite, width: int, height: int, frames: int):
+        self.sprite = sprite
+        self.max_x = width - sprite.image.shape[1]
+        self.max_y = height - sprite.image.shape[0]
+        self.x = rng.uniform(0, self.max_x)
+        self.y = rng.uniform(0, self.max_y)
+        speed = rng.uniform(0.5, 2.5) * height / 480
+        angle = rng.uniform(0, 2 * np.pi)
+        self.vx, self.vy = speed * np.cos(angle), speed * np.sin(angle)
+        self.wobble = rng.uniform(0, 6) * height / 480
+        self.period = rng.uniform(30, 90)
+        self.first_frame = int(rng.uniform(0, 0.3) * frames)
+
+    def position(self, index: int) -> Tuple[int, int]:
+        y = self.y + self.wobble * np.sin(2 * np.pi * index / self.period)
+        return int(self.x), int(min(max(y, 0), self.max_y))
+
+    def advance(self):
+        self.x += self.vx
+        self.y += self.vy
+        if not 0 <= self.x <= self.max_x:
+            self.vx = -self.vx
+            self.x = min(max(self.x, 0), self.max_x)
+        if not 0 <= self.y <= self.max_y:
+            self.vy = -self.vy
+            self.y = min(max(self.y, 0), self.max_y)
+
+
+class SyntheticVideo:
+    """
+    Générateur de frames d'une scène (frame BGR + boîtes vraies).
+
+    Exemple:
+        >>> video = SyntheticVideo(SceneConfig("1080p", "foliage", frames=60))
+        >>> for frame, boxes in video.frames():
+        ...     pass
+        >>> video.write("benchmark_videos/")  # vidéo + vérité terrain
+    """
+
+    def __init__(self, config: SceneConfig, pattern_dir: Path = PATTERN_DIR):
+        self.config = config
+        self.sprites = load_sprites(pattern_dir)
+        if not self.sprites:
+            raise RuntimeError(f"Aucun sprite utilisable dans {pattern_dir}")
+
+    def _background(self, rng, width: int, height: int):
+        """Fond de la scène : fonction index -> frame BGR (uint8)"""
+        frames = self.config.frames
+        scale = height / 480
+
+        if self.config.background == "sky":
+            drift = 0.5 * scale
+            canvas_width = width + int(np.ceil(drift * frames)) + 1
+            t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+            top = np.array([200, 150, 90], np.float32)
+            horizon = np.array([235, 215, 190], np.float32)
+            sky = top * (1 - t) + horizon * t
+            clouds = _value_noise(rng, height, canvas_width, cell=max(8, height // 3), octaves=4)
+            clouds = np.clip((clouds - 0.5) * 3.0, 0.0, 0.85)[..., None]
+            canvas = (sky * (1 - clouds) + 245.0 * clouds).astype(np.uint8)
+            return lambda i: canvas[:, int(i * drift) : int(i * drift) + width]
+
+        if self.config.background == "texture":
+            pan_x, pan_y = 1.5 * scale, 0.6 * scale
+            canvas_width = width + int(np.ceil(pan_x * frames)) + 1
+            canvas_height = height + int(np.ceil(pan_y * frames)) + 1
+            fine = _value_noise(
+                rng, canvas_height, canvas_width, cell=max(2, int(4 * scale)), octaves=3
+            )
+            coarse = _value_noise(
+                rng, canvas_height, canvas_width, cell=max(8, int(64 * scale)), octaves=2
+            )
+            level = (0.6 * fine + 0.4 * coarse)[..., None]
+            tint = np.array([110, 125, 140], np.float32)
+            canvas = np.clip(tint * (0.5 + level), 0, 255).astype(np.uint8)
+
+            def texture(i):
+                x, y = int(i * pan_x), int(i * pan_y)
+                return canvas[y : y + height, x : x + width]
+
+            return texture
+
+        # Feuillage : feuilles (taches claires) sur fond sombre, déformées par le vent
+        leaves = _value_noise(rng, height, width, cell=max(4, int(12 * scale)), octaves=3)
+        shade = _value_noise(rng, height, width, cell=max(8, int(80 * scale)), octaves=1)
+        dark = np.array([30, 70, 35], np.float32)
+        light = np.array([70, 160, 90], np.float32)
+        level = np.clip((leaves - 0.35) * 2.0, 0, 1) * (0.6 + 0.4 * shade)
+        canvas = (dark + (light - dark) * level[..., None]).astype(np.uint8)
+        grid_x, grid_y = np.meshgrid(
+            np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32)
+        )
+        amplitude = 3.0 * scale
+        wavelength = 90.0 * scale
+
+        def foliage(i):
+            phase = 2 * np.pi * i / 40.0
+            map_x = grid_x + amplitude * np.sin(grid_y / wavelength + phase)
+            map_y = grid_y + 0.5 * amplitude * np.sin(grid_x / wavelength + 0.7 * phase)
+            return cv2.remap(canvas, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
+
+        return foliage
+
+    def frames(self) -> Iterator[Tuple[np.ndarray, list]]:
+        """
+        Frames de la scène.
+
+        Yields:
+            (frame BGR, [{'sprite': nom, 'box': [x, y, w, h]}, ...])
+        """
+        config = self.config
+        width, height = config.size
+        rng = np.random.default_rng(config.seed)
+        background = self._background(rng, width, height)
+
+        tracks = []
+        for index in rng.choice(len(self.sprites), size=config.sprites):
+            sprite = self.sprites[index].scaled(height / 720 * rng.uniform(0.8, 1.4))
+            tracks.append(_Track(rng, sprite, width, height, config.frames))
+
+        noise = [
+            rng.normal(0, 2.0, (height, width, 3)).astype(np.int16) for _ in range(_NOISE_FRAMES)
+        ]
+
+        for i in range(config.frames):
+            frame = background(i).astype(np.float32)
+            boxes = []
+            for track in tracks:
+                if i >= track.first_frame:
+                    sprite = track.sprite
+                    x, y = track.position(i)
+                    h, w = sprite.mask.shape
+                    mask = sprite.mask[..., None]
+                    roi = frame[y : y + h, x : x + w]
+                    roi[:] = roi * (1 - mask) + sprite.image * mask
+                    bx, by, bw, bh = sprite.box
+                    boxes.append({"sprite": sprite.name, "box": [x + bx, y + by, bw, bh]})
+                track.advance()
+            out = np.clip(frame.astype(np.int16) + noise[i % _NOISE_FRAMES], 0, 255)
+            yield out.astype(np.uint8), boxes
+
+    def write(self, directory: str, codec: str = "MJPG") -> Path:
+        """
+        Écrit la vidéo (<nom>.avi) et la vérité terrain (<nom>.json).
+
+        Returns:
+            Chemin de la vidéo
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.config.name}.avi"
+        width, height = self.config.size
+        writer = cv2.VideoWriter(
+            str(path), cv2.VideoWriter_fourcc(*codec), self.config.fps, (width, height)
+        )
+        if not writer.isOpened():
+            raise RuntimeError(f"Impossible d'ouvrir la sortie: {path}")
+
+        ground_truth = []
+        try:
+            for frame, boxes in self.frames():
+                writer.write(frame)
+                ground_truth.append(boxes)
+        finally:
+            writer.release()
+
+        ground_truth_path(path).write_text(
+            json.dumps(
+                {
+                    "config": asdict(self.config),
+                    "width": width,
+                    "height": height,
+                    "frames": ground_truth,
+                }
+            )
+        )
+        return path
+
+
+def ground_truth_path(video_path: Path) -> Path:
+    """Fichier de vérité terrain d'une vidéo générée"""
+    return Path(video_path).with_suffix(".json")
+
+
+def ensure_video(config: SceneConfig, directory: str) -> Path:
+    """Vidéo de la scène, générée si absente (ou générée avec une autre configuration)"""
+    path = Path(directory) / f"{config.name}.avi"
+    truth = ground_truth_path(path)
+    if path.exists() and truth.exists():
+        try:
+            if json.loads(truth.read_text())["config"] == asdict(config):
+                return path
+        except (ValueError, KeyError):
+            pass
+    return SyntheticVideo(config).write(directory)
+
+
+def load_ground_truth(video_path: Path) -> dict:
+    """Vérité terrain d'une vidéo générée"""
+    return json.loads(ground_truth_path(video_path).read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère une vidéo synthétique de drones")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="480p")
+    parser.add_argument("--background", choices=BACKGROUNDS, default="sky")
+    parser.add_argument("--frames", type=int, default=120, help="Nombre de frames (défaut: 120)")
+    parser.add_argument("--fps", type=float, default=25.0, help="Cadence (défaut: 25)")
+    parser.add_argument("--sprites", type=int, default=2, help="Sprites simultanés (défaut: 2)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine (défaut: 0)")
+    parser.add_argument(
+        "-o", "--output-dir", default="benchmark_videos", help="Dossier de sortie"
+    )
+    args = parser.parse_args()
+
+    config = SceneConfig(
+        resolution=args.resolution,
+        background=args.background,
+        frames=args.frames,
+        fps=args.fps,
+        sprites=args.sprites,
+        seed=args.seed,
+    )
+    path = ensure_video(config, args.output_dir)
+    print(f"{path} ({ground_truth_path(path)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+StreamRecorder - Enregistrement compact de flux intermédiaires (masques, couches debug)
+
+Format de fichier `.tsrec` (little-endian) :
+
+    En-tête (32 octets)
+        magic "TSREC1\\0\\0", version u16, kind u8, réservé u8,
+        width u32, height u32, chunk_frames u32, réservé (8 octets)
+
+    Chunks (répétés)
+        magic "CHNK", n u32, payload_size u64
+        table de n entrées (frame_number i64, offset u32, length u32)
+        payloads concaténés (offset relatif au début des payloads du chunk)
+
+Les masques binaires sont bit-packés (1 bit/pixel) puis compressés en RLE,
+les couches grayscale sont encodées en PNG (sans perte). Le fichier est lu
+par memory-mapping : l'accès à une frame ne lit que son payload.
+"""
+
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+MAGIC = b"TSREC1\x00\x00"
+CHUNK_MAGIC = b"CHNK"
+VERSION = 1
+
+KIND_MASK = "mask"
+KIND_GRAY = "gray"
+_KIND_CODES = {KIND_MASK: 0, KIND_GRAY: 1}
+_KIND_NAMES = {code: name for name, code in _KIND_CODES.items()}
+
+_HEADER = struct.Struct("<8sHBBIII8x")
+_CHUNK_HEADER = struct.Struct("<4sIQ")
+_ENTRY_DTYPE = np.dtype([("frame_number", "<i8"), ("offset", "<u4"), ("length", "<u4")])
+
+# Une entrée RLE = (longueur du run, valeur de l'octet)
+_RUN_DTYPE = np.dtype([("length", "<u4"), ("value", "u1")])
+
+
+def encode_mask(mask: np.ndarray) -> bytes:
+    """Bit-pack (pixel > 0) puis compression RLE des octets."""
+    bits = np.packbits(mask.reshape(-1) > 0)
+    if bits.size == 0:
+        return b""
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bits)) + 1))
+    runs = np.empty(starts.size, dtype=_RUN_DTYPE)
+    runs["length"] = np.diff(np.append(starts, bits.size))
+    runs["value"] = bits[starts]
+    return runs.tobytes()
+
+
+def decode_mask(payload, width: int, height: int) -> np.ndarray:
+    """Inverse de encode_mask : retourne un masque uint8 (0/255) de taille (h, w)."""
+    runs = np.frombuffer(payload, dtype=_RUN_DTYPE)
+    bits = np.repeat(runs["value"], runs["length"])
+    mask = np.unpackbits(bits, count=width * height)
+    return (mask.reshape(height, width) * 255).astype(np.uint8)
+
+
+class StreamRecorder:
+    """
+    Enregistreur de flux intermédiaire par chunks.
+
+    Le fichier est ouvert paresseusement à la première écriture pour que
+    l'enregistreur reste picklable (il peut vivre dans un bloc de pipeline
+    envoyé à un processus).
+    """
+
+    def __init__(self, path: str, kind: str = KIND_MASK, chunk_frames: int = 64):
+        """
+        Args:
+            path: Fichier de sortie (.tsrec)
+            kind: 'mask' (binaire bit-packé + RLE) ou 'gray' (PNG sans perte)
+            chunk_frames: Nombre de frames par chunk écrit sur disque
+        """
+        if kind not in _KIND_CODES:
+            raise ValueError(f"Type de flux inconnu: {kind} ({', '.join(_KIND_CODES)})")
+
+        self.path = Path(path)
+        self.kind = kind
+        self.chunk_frames = chunk_frames
+        self.width = 0
+        self.height = 0
+        self.frame_count = 0
+        self.bytes_written = 0
+
+        self._file = None
+        self._pending: List[tuple] = []
+
+    def _open(self, frame: np.ndarray):
+        self.height, self.width = frame.shape[:2]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                _KIND_CODES[self.kind],
+                0,
+                self.width,
+                self.height,
+                self.chunk_frames,
+            )
+        )
+        self.bytes_written = _HEADER.size
+
+    def _encode(self, frame: np.ndarray) -> bytes:
+        if self.kind == KIND_MASK:
+            return encode_mask(frame)
+
+        ok, buffer = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise RuntimeError("Encodage PNG impossible")
+        return buffer.tobytes()
+
+    def write(self, frame: np.ndarray, frame_number: Optional[int] = None):
+        """
+        Ajoute une frame au flux.
+
+        Args:
+            frame: Masque ou couche grayscale (même taille pour tout le flux)
+            frame_number: Index source de la frame (par défaut: rang d'écriture)
+        """
+        if self._file is None:
+            self._open(frame)
+
+        if frame.shape[:2] != (self.height, self.width):
+            raise ValueError(
+                f"Taille {frame.shape[:2]} différente du flux ({self.height}, {self.width})"
+            )
+
+        if frame_number is None:
+            frame_number = self.frame_count
+
+        self._pending.append((frame_number, self._encode(frame)))
+        self.frame_count += 1
+
+        if len(self._pending) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Écrit le chunk en cours sur disque."""
+        if self._file is None or not self._pending:
+            return
+
+        entries = np.empty(len(self._pending), dtype=_ENTRY_DTYPE)
+        offset = 0
+        for i, (frame_number, payload) in enumerate(self._pending):
+            entries[i] = (frame_number, offset, len(payload))
+            offset += len(payload)
+
+        chunk = [_CHUNK_HEADER.pack(CHUNK_MAGIC, len(self._pending), offset), entries.tobytes()]
+        chunk.extend(payload for _, payload in self._pending)
+        data = b"".join(chunk)
+
+        self._file.write(data)
+        self._file.flush()
+        self.bytes_written += len(data)
+        self._pending = []
+
+    def close(self):
+        """Vide le dernier chunk et ferme le fichier."""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file"] = None
+        state["_pending"] = []
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class StreamRecording:
+    """
+    Lecteur d'un fichier `.tsrec` avec accès aléatoire par index de frame.
+
+    Seules les en-têtes de chunks sont parcourues à l'ouverture ; les
+    payloads sont lus à la demande depuis le memory-map.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        magic, version, kind, _, width, height, chunk_frames = _HEADER.unpack_from(
+            self._data, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un fichier .tsrec")
+        if version != VERSION:
+            raise ValueError(f"Version .tsrec non supportée: {version}")
+
+        self.kind = _KIND_NAMES[kind]
+        self.width = width
+        self.height = height
+        self.chunk_frames = chunk_frames
+
+        self._offsets, self._lengths, self.frame_numbers = self._scan_chunks()
+        self._by_frame_number = {
+            int(n): i for i, n in enumerate(self.frame_numbers)
+        }
+
+    def _scan_chunks(self):
+        offsets, lengths, numbers = [], [], []
+        pos = _HEADER.size
+        size = self._data.size
+
+        while pos + _CHUNK_HEADER.size <= size:
+            magic, n, payload_size = _CHUNK_HEADER.unpack_from(self._data, pos)
+            table_start = pos + _CHUNK_HEADER.size
+            payload_start = table_start + n * _ENTRY_DTYPE.itemsize
+            # Chunk tronqué (écriture interrompue) : on s'arrête au dernier chunk complet
+            if magic != CHUNK_MAGIC or payload_start + payload_size > size:
+                break
+
+            entries = np.frombuffer(
+                self._data, dtype=_ENTRY_DTYPE, count=n, offset=table_start
+            )
+            offsets.append(payload_start + entries["offset"].astype(np.int64))
+            lengths.append(entries["length"].astype(np.int64))
+            numbers.append(entries["frame_number"])
+            pos = payload_start + payload_size
+
+        if not offsets:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        return np.concatenate(offsets), np.concatenate(lengths), np.concatenate(numbers)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def payload_size(self) -> int:
+        """Taille totale des payloads compressés (octets)."""
+        return int(self._lengths.sum())
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} hors du flux ({len(self)} frames)")
+
+        start = int(self._offsets[index])
+        payload = self._data[start : start + int(self._lengths[index])]
+
+        if self.kind == KIND_MASK:
+            return decode_mask(payload, self.width, self.height)
+        return cv2.imdecode(np.asarray(payload), cv2.IMREAD_UNCHANGED)
+
+    def get_frame(self, frame_number: int) -> np.ndarray:
+        """Retourne la frame enregistrée avec ce frame_number source."""
+        if frame_number not in self._by_frame_number:
+            raise KeyError(f"frame_number {frame_number} absent de {self.path}")
+        return self[self._by_frame_number[frame_number]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        """Libère le memory-map."""
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,9 @@
+"""
+Module de debug : enregistrement compact des flux intermédiaires.
+
+Fournit l'enregistreur de masques / couches grayscale et son lecteur.
+"""
+
+from .StreamRecorder import StreamRecorder, StreamRecording
+
+__all__ = ["StreamRecorder", "StreamRecording"]
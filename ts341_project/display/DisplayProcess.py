@@ -4,9 +4,18 @@ NewDisplayProcess - Affichage dans un processus dédié
 Affiche les frames traitées en temps réel
 """
 
-from multiprocessing import Process, Queue, Event
+from multiprocessing import Process, Event
+from queue import Empty
+from typing import Iterable
 import cv2
 from ts341_project.logging_utils import get_logger
+from ts341_project.FrameCodec import FrameCodec
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.memory_utils import memory_report
+from ts341_project.LatencyHistogram import LatencyRecorder
+from ts341_project.LatencyTrace import record_trace, stamp
+from ts341_project.TimelineTrace import span, start_tracing, stop_tracing
+from ts341_project.ProcessProfiler import profiled
 
 
 class NewDisplayProcess:
@@ -16,10 +25,14 @@ class NewDisplayProcess:
 
     def __init__(
         self,
-        display_queue: Queue,
+        display_queue: DeliveryQueue,
         stop_event: Event,
         window_name: str = "Video Processing",
         max_height: int = 1080,
+        streams: Iterable[int] = None,
+        trace_dir: str = None,
+        metrics=None,
+        profile=None,
     ):
         """
         Args:
@@ -27,73 +40,142 @@ class NewDisplayProcess:
             stop_event: Event d'arrêt
             window_name: Nom de la fenêtre
             max_height: Hauteur max (redimensionnement auto si plus grand)
+            streams: Flux attendus (multi-caméras) : une fenêtre par flux,
+                     arrêt quand tous ont envoyé end_of_stream
+            trace_dir: Dossier de la chronologie (TimelineTrace), None = désactivée
+            metrics: Bloc de métriques partagé de l'étape (PipelineMetrics), None = désactivé
+            profile: Profilage du processus (ProcessProfiler.ProfileConfig), None = désactivé
         """
         self.display_queue = display_queue
         self.stop_event = stop_event
         self.window_name = window_name
         self.max_height = max_height
+        self.streams = None if streams is None else list(streams)
+        self.ready_event = Event()  # Fenêtre créée
+        self.trace_dir = trace_dir
+        self.metrics = metrics
+        self.profile = profile
 
     @staticmethod
-    def _display_process(display_queue, stop_event, window_name, max_height):
+    def _display_process(
+        display_queue,
+        stop_event,
+        window_name,
+        max_height,
+        streams,
+        ready_event,
+        trace_dir,
+        metrics,
+    ):
         """Processus d'affichage"""
         logger = get_logger(__name__)
+        start_tracing(trace_dir, f"display ({window_name})")
         logger.info(f"Démarrage - Fenêtre: {window_name}")
 
+        # Une fenêtre par flux (créée à la première frame)
+        windows = {}
+        active_streams = {None} if streams is None else set(streams)
+
+        def _window(stream_id) -> str:
+            if stream_id not in windows:
+                name = window_name if stream_id is None else f"{window_name} [{stream_id}]"
+                cv2.namedWindow(name, cv2.WINDOW_NORMAL)
+                windows[stream_id] = name
+            return windows[stream_id]
+
         try:
-            cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+            if streams is None:
+                _window(None)
         except Exception as e:
             logger.error(f"ERREUR fenêtre: {e}")
             return
+        ready_event.set()
 
         frame_count = 0
+        errors = 0  # Frames jetées sur exception (décodage, affichage)
+        latencies = LatencyRecorder()  # Frames tracées (VideoReader trace=True)
 
         while not stop_event.is_set():
             try:
                 data = display_queue.get(timeout=0.5)
+            except Empty:
+                continue  # Queue vide
+
+            try:
+                trace = stamp(data.get("trace"), "sink_in")
 
                 # Fin de stream ?
+                stream_id = data.get("stream_id")
                 if isinstance(data, dict) and data.get("end_of_stream"):
                     logger.info("END_OF_STREAM reçu")
-                    break
+                    active_streams.discard(stream_id)
+                    if not active_streams:
+                        break
+                    if stream_id in windows:
+                        cv2.destroyWindow(windows.pop(stream_id))
+                    continue
 
-                # Afficher
-                frame = data["frame"]
+                # Afficher (frame brute ou JPEG, 1 ou 3 canaux : imshow gère les deux)
+                frame = FrameCodec.decode(data)
 
-                # Redimensionner si nécessaire
+                # Redimensionner si nécessaire (normalement déjà fait par le producteur)
                 h, w = frame.shape[:2]
                 if h > max_height:
                     scale = max_height / h
                     frame = cv2.resize(frame, (int(w * scale), max_height))
 
-                cv2.imshow(window_name, frame)
+                with span("affichage", frame=data.get("frame_number")):
+                    cv2.imshow(_window(stream_id), frame)
 
-                # ESC pour quitter
-                key = cv2.waitKey(1)
+                    # ESC pour quitter
+                    key = cv2.waitKey(1)
                 if key == 27:
                     logger.info("ESC pressé")
                     stop_event.set()
                     break
 
+                if trace is not None:
+                    record_trace(latencies, stamp(trace, "sink_out"), "affichage")
                 frame_count += 1
+                if metrics is not None:
+                    metrics.frame()
 
                 if frame_count % 100 == 0:
                     logger.debug(f"{frame_count} frames affichées")
+                    logger.debug(memory_report([display_queue]))
 
-            except:
-                continue  # Queue vide
+            except Exception:
+                errors += 1
+                logger.exception(f"Frame {data.get('frame_number')} non affichée (erreur)")
+                if metrics is not None:
+                    metrics.error()
 
-        cv2.destroyWindow(window_name)
+        for name in windows.values():
+            cv2.destroyWindow(name)
         logger.info(f"Arrêté - {frame_count} frames affichées")
+        if errors:
+            logger.warning(f"{errors} frame(s) non affichée(s) sur erreur")
+        if latencies.histograms:
+            logger.info(latencies.report(f"Latence capture -> affichage ({window_name})"))
+        if metrics is not None:
+            metrics.publish()  # État final (RSS, horodatage)
+        stop_tracing()
 
     def start(self):
         """Démarre le processus"""
         self.process = Process(
-            target=NewDisplayProcess._display_process,
+            target=profiled(
+                NewDisplayProcess._display_process, self.profile, f"display-{self.window_name}"
+            ),
             args=(
                 self.display_queue,
                 self.stop_event,
                 self.window_name,
                 self.max_height,
+                self.streams,
+                self.ready_event,
+                self.trace_dir,
+                self.metrics,
             ),
         )
         self.process.start()
@@ -1,16 +1,29 @@
 """
 Système de logging centralisé pour architecture multiprocessus.
 
-Utilise un processus dédié qui collecte les logs de tous les autres processus
-via une Queue partagée.
+Les processus envoient leurs logs au processus principal via une
+multiprocessing.Queue simple (pas de serveur Manager : un put est un append
+local, la sérialisation se fait dans le thread d'alimentation de la queue).
+Les records sont regroupés par lots dans chaque processus (envoi toutes les
+`batch_size` lignes ou `flush_interval` secondes), et les messages fréquents
+d'une même ligne de code sont limités en débit.
+
+Mesure du coût par record (ancien transport Manager vs queue + lots) :
+    python -m ts341_project.benchmarks.log_overhead
 """
 
+import json
 import logging
 import multiprocessing as mp
+import os
+import threading
 from multiprocessing import Queue
+from multiprocessing.util import Finalize
 from logging.handlers import QueueHandler, QueueListener
 import sys
-from typing import Optional
+from typing import Optional, Tuple
+
+TRANSPORTS = ("queue", "manager")
 
 
 class CustomFormatter(logging.Formatter):
@@ -30,6 +43,148 @@ class CustomFormatter(logging.Formatter):
         return super().format(record)
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Une ligne JSON par record (fichier structuré, exploitable par jq / ELK)."""
+
+    def format(self, record):
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "pid": record.process,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limite le débit des messages fréquents, par ligne de code.
+
+    Au plus `burst` records par `period` secondes pour une même ligne de code ;
+    le suivant accepté indique combien ont été supprimés. Les WARNING et plus
+    ne sont jamais limités.
+    """
+
+    def __init__(self, burst: int = 20, period: float = 1.0):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self._windows = {}  # (fichier, ligne) -> [début de fenêtre, acceptés, supprimés]
+
+    def filter(self, record) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = record.created
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.period:
+            suppressed = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} (+{suppressed} messages similaires supprimés)"
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class BatchingQueueHandler(QueueHandler):
+    """
+    QueueHandler qui envoie des lots de records.
+
+    Le lot part quand il atteint `batch_size` records, quand un record
+    WARNING+ arrive, ou au plus tard `flush_interval` secondes après (thread
+    de fond). Compatible fork : un processus enfant repart d'un lot vide et
+    vide le sien à sa sortie.
+
+    Le vidage de sortie passe par un finaliseur multiprocessing de priorité
+    EXIT_PRIORITY, supérieure à celle de la fermeture de la queue
+    (Queue._finalize_close, priorité 10, enregistrée au premier put) : à
+    priorité égale les finaliseurs s'exécutent du plus récent au plus ancien,
+    la fermeture passerait avant le dernier lot et celui-ci serait perdu.
+    """
+
+    EXIT_PRIORITY = 20
+
+    def __init__(self, queue, batch_size: int = 64, flush_interval: float = 0.2):
+        super().__init__(queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pid = None
+        self._buffer = []
+        self._wakeup = None
+        self._thread = None
+
+    def _init_process(self):
+        """Lot et thread de vidage propres au processus courant (le verrou est
+        réinitialisé au fork par le module logging)"""
+        self._pid = os.getpid()
+        self._buffer = []
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="log-flush", daemon=True)
+        self._thread.start()
+        # Vidage à la sortie du processus (avant la fermeture des queues)
+        Finalize(self, self._flush_at_exit, exitpriority=self.EXIT_PRIORITY)
+
+    def _flush_at_exit(self):
+        """Arrête le thread de vidage puis envoie le dernier lot"""
+        self._wakeup.set()
+        self._thread.join(timeout=1.0)
+        self.flush()
+
+    def _flush_loop(self):
+        wakeup = self._wakeup
+        while True:
+            wakeup.wait(self.flush_interval)
+            if wakeup.is_set():
+                return
+            self.flush()
+
+    def emit(self, record):
+        try:
+            if self._pid != os.getpid():
+                self._init_process()
+            prepared = self.prepare(record)
+            with self.lock:
+                self._buffer.append(prepared)
+                full = len(self._buffer) >= self.batch_size
+            if full or record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if self._pid != os.getpid():
+            return
+        with self.lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self.enqueue(batch)
+
+    def close(self):
+        self.flush()
+        if self._wakeup is not None and self._pid == os.getpid():
+            self._wakeup.set()
+        super().close()
+
+
+class BatchQueueListener(QueueListener):
+    """QueueListener acceptant des records seuls ou des lots (listes)"""
+
+    def handle(self, record):
+        if isinstance(record, list):
+            for item in record:
+                super().handle(item)
+        else:
+            super().handle(record)
+
+
 class MultiprocessLogManager:
     """
     Gestionnaire de logs pour environnement multiprocessus.
@@ -38,17 +193,49 @@ class MultiprocessLogManager:
     et un QueueListener pour les écrire de manière thread-safe.
     """
 
-    def __init__(self, level: int = logging.INFO, log_file: Optional[str] = None):
+    def __init__(
+        self,
+        level: int = logging.INFO,
+        log_file: Optional[str] = None,
+        json_file: Optional[str] = None,
+        transport: str = "queue",
+        batch_size: int = 64,
+        flush_interval: float = 0.2,
+        rate_limit: Optional[Tuple[int, float]] = (20, 1.0),
+    ):
         """
         Args:
             level: Niveau de log (logging.DEBUG, INFO, WARNING, ERROR, CRITICAL)
             log_file: Chemin optionnel pour sauvegarder les logs dans un fichier
+            json_file: Fichier optionnel de logs structurés (une ligne JSON par record)
+            transport: 'queue' (multiprocessing.Queue + lots) ou 'manager'
+                       (ancien transport : Manager().Queue, un aller-retour
+                       par record, gardé pour comparaison)
+            batch_size: Records par lot (transport 'queue')
+            flush_interval: Délai max avant envoi d'un lot incomplet (secondes)
+            rate_limit: (burst, période) : au plus `burst` records DEBUG/INFO
+                        par `période` secondes et par ligne de code ; None = illimité
         """
-        self.log_queue = mp.Manager().Queue(-1)
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transport de logs inconnu: {transport} ({', '.join(TRANSPORTS)})")
+
         self.level = level
         self.log_file = log_file
+        self.json_file = json_file
+        self.transport = transport
         self.listener = None
 
+        if transport == "manager":
+            self.log_queue = mp.Manager().Queue(-1)
+            self.handler = QueueHandler(self.log_queue)
+        else:
+            self.log_queue = Queue()
+            self.handler = BatchingQueueHandler(
+                self.log_queue, batch_size=batch_size, flush_interval=flush_interval
+            )
+        if rate_limit is not None:
+            self.handler.addFilter(RateLimitFilter(*rate_limit))
+
     def start(self):
         """Démarre le listener qui collecte les logs."""
         # Configuration des handlers
@@ -74,16 +261,26 @@ class MultiprocessLogManager:
             )
             handlers.append(file_handler)
 
+        # Handler JSON lines (optionnel)
+        if self.json_file:
+            json_handler = logging.FileHandler(self.json_file)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+
         # Créer et démarrer le listener
-        self.listener = QueueListener(
+        self.listener = BatchQueueListener(
             self.log_queue, *handlers, respect_handler_level=True
         )
         self.listener.start()
 
     def stop(self):
-        """Arrête le listener."""
+        """Arrête le listener (après envoi du lot en cours du processus principal)."""
+        self.handler.flush()
         if self.listener:
             self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
 
     def get_logger(self, name: str) -> logging.Logger:
         """
@@ -93,15 +290,18 @@ class MultiprocessLogManager:
             name: Nom du logger (généralement __name__ du module)
 
         Returns:
-            Logger configuré avec QueueHandler
+            Logger configuré avec le handler de la queue
         """
         logger = logging.getLogger(name)
         logger.setLevel(self.level)
 
-        # Éviter les doublons si déjà configuré
-        if not logger.handlers:
-            queue_handler = QueueHandler(self.log_queue)
-            logger.addHandler(queue_handler)
+        # Éviter les doublons si déjà configuré (et remplacer le handler d'un
+        # gestionnaire précédent)
+        if self.handler not in logger.handlers:
+            for handler in list(logger.handlers):
+                if isinstance(handler, QueueHandler):
+                    logger.removeHandler(handler)
+            logger.addHandler(self.handler)
 
         return logger
 
@@ -111,7 +311,7 @@ _global_log_manager: Optional[MultiprocessLogManager] = None
 
 
 def setup_logging(
-    level: int = logging.INFO, log_file: Optional[str] = None
+    level: int = logging.INFO, log_file: Optional[str] = None, **options
 ) -> MultiprocessLogManager:
     """
     Configure le système de logging global pour le multiprocessing.
@@ -121,6 +321,8 @@ def setup_logging(
     Args:
         level: Niveau de log
         log_file: Fichier de log optionnel
+        **options: Options de MultiprocessLogManager (json_file, transport,
+                   batch_size, flush_interval, rate_limit)
 
     Returns:
         Instance du MultiprocessLogManager
@@ -130,7 +332,7 @@ def setup_logging(
     if _global_log_manager is not None:
         _global_log_manager.stop()
 
-    _global_log_manager = MultiprocessLogManager(level=level, log_file=log_file)
+    _global_log_manager = MultiprocessLogManager(level=level, log_file=log_file, **options)
     _global_log_manager.start()
 
     return _global_log_manager
@@ -0,0 +1,70 @@
+"""
+Utilitaires de comptabilité mémoire pour l'architecture multiprocessus.
+
+RSS du processus courant et rapport des octets bufferisés dans les queues,
+loggés avec les lignes de FPS.
+"""
+
+import os
+import sys
+from typing import Iterable
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def get_rss_bytes() -> int:
+    """
+    Retourne la mémoire résidente (RSS) du processus courant en octets.
+
+    Lit /proc/self/statm sous Linux ; sinon retombe sur le pic RSS
+    (resource.getrusage), ou 0 si indisponible.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def format_bytes(n: float) -> str:
+    """Formate une taille en octets (Ko, Mo, Go)."""
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if abs(n) < 1024 or unit == "Go":
+            return f"{n:.0f} {unit}" if unit == "o" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} Go"
+
+
+def memory_report(queues: Iterable = ()) -> str:
+    """
+    Rapport mémoire du processus courant et des queues qu'il voit.
+
+    Args:
+        queues: DeliveryQueue dont on veut les frames/octets en vol
+
+    Returns:
+        Ex: "RSS 312.4 Mo | en vol: 5 frames, 31.1 Mo (processor 3 / 18.7 Mo, ...)"
+    """
+    queues = [q for q in queues if q is not None]
+    report = f"RSS {format_bytes(get_rss_bytes())}"
+    if not queues:
+        return report
+
+    stats = [q.stats() for q in queues]
+    frames = sum(s["depth"] for s in stats)
+    buffered = sum(s["bytes"] for s in stats)
+    details = ", ".join(
+        f"{s['name']} {s['depth']} / {format_bytes(s['bytes'])}" for s in stats
+    )
+    return (
+        f"{report} | en vol: {frames} frames, {format_bytes(buffered)} ({details})"
+    )
@@ -0,0 +1,252 @@
+"""
+ActivityTriage - Premier passage rapide sur les enregistrements longs
+
+Décode la vidéo (ou la plage [start, end]) en très basse résolution (niveaux
+de gris, réduits dans le processus de lecture) avec un pas temporel, calcule un score de mouvement MOG2 (comme mog2.py) par tranche de
+temps et en déduit les intervalles d'activité. Le pipeline complet ne tourne
+ensuite que sur ces intervalles (plus des marges).
+"""
+
+import json
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Event
+from queue import Empty
+from typing import List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.VideoReader import VideoReader
+from ts341_project.logging_utils import get_logger
+from ts341_project.sources import open_capture
+
+
+@dataclass
+class TriageReport:
+    """
+    Résultat du premier passage.
+
+    Attributes:
+        source: Vidéo analysée
+        duration: Durée analysée (secondes, fin - début de la plage)
+        intervals: Intervalles d'activité [(début, fin)] en secondes (temps
+                   source), marges incluses, dans la plage analysée
+        bucket_scores: Score de mouvement max par tranche (fraction de pixels)
+        bucket_seconds: Durée d'une tranche
+        frames_analyzed: Frames décodées par le premier passage
+        elapsed: Durée du premier passage (secondes)
+        start: Début de la plage analysée (secondes)
+    """
+
+    source: str
+    duration: float
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+    bucket_scores: List[float] = field(default_factory=list)
+    bucket_seconds: float = 2.0
+    frames_analyzed: int = 0
+    elapsed: float = 0.0
+    start: float = 0.0
+
+    @property
+    def active_duration(self) -> float:
+        return sum(end - start for start, end in self.intervals)
+
+    @property
+    def skipped_ratio(self) -> float:
+        """Part de la vidéo que le pipeline complet ne traitera pas"""
+        if self.duration <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.active_duration / self.duration)
+
+    def summary(self) -> str:
+        lines = [
+            f"Triage: {len(self.intervals)} intervalle(s) actif(s), "
+            f"{self.active_duration:.1f}s / {self.duration:.1f}s "
+            f"({self.skipped_ratio:.0%} ignoré)",
+            f"  Premier passage: {self.frames_analyzed} frames en {self.elapsed:.1f}s",
+        ]
+        for start, end in self.intervals:
+            lines.append(f"  [{_format_time(start)} -> {_format_time(end)}]")
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """Sauvegarde le rapport en JSON"""
+        data = asdict(self)
+        data["active_duration"] = self.active_duration
+        data["skipped_ratio"] = self.skipped_ratio
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def _format_time(seconds: float) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:05.2f}"
+
+
+class ActivityTriage:
+    """
+    Détection rapide des intervalles d'activité d'une vidéo.
+
+    Le décodage passe par VideoReader (processus dédié, grab() pour les frames
+    sautées) ; le score est calculé dans le processus appelant.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, int],
+        width: int = 160,
+        sample_fps: float = 2.0,
+        bucket_seconds: float = 2.0,
+        threshold: float = 0.002,
+        margin: float = 2.0,
+        var_threshold: int = 64,
+        backend: str = None,
+        start: float = None,
+        end: float = None,
+    ):
+        """
+        Args:
+            source: Chemin de la vidéo
+            width: Largeur d'analyse (pixels)
+            sample_fps: Frames analysées par seconde de vidéo (fixe le stride)
+            bucket_seconds: Durée d'une tranche de score
+            threshold: Fraction de pixels en mouvement pour qu'une tranche soit active
+            margin: Marge ajoutée de chaque côté d'un intervalle (secondes)
+            var_threshold: varThreshold du MOG2
+            backend: Backend de décodage ; défaut: 'ffmpeg' s'il est installé
+                     (réduit et convertit au décodage), sinon 'opencv' (réduit
+                     et convertit juste après, dans le processus de lecture)
+            start: Début de la plage analysée (secondes, None = début)
+            end: Fin de la plage analysée (secondes, None = fin de la vidéo)
+        """
+        self.source = source
+        self.width = width
+        self.sample_fps = sample_fps
+        self.bucket_seconds = bucket_seconds
+        self.threshold = threshold
+        self.margin = margin
+        self.var_threshold = var_threshold
+        self.backend = backend or ("ffmpeg" if shutil.which("ffmpeg") else "opencv")
+        self.start = start or 0.0
+        self.end = end
+        self.logger = get_logger(__name__)
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """Réduction + niveaux de gris (déjà faits au décodage avec ffmpeg)"""
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = frame.shape[:2]
+        if w > self.width:
+            frame = cv2.resize(
+                frame,
+                (self.width, max(1, int(h * self.width / w))),
+                interpolation=cv2.INTER_AREA,
+            )
+        return frame
+
+    def _intervals(self, scores: List[float], end_time: float) -> List[Tuple[float, float]]:
+        """Tranches actives -> intervalles fusionnés, marges incluses, dans la plage"""
+        intervals = []
+        for i, score in enumerate(scores):
+            if score < self.threshold:
+                continue
+            start = max(self.start, i * self.bucket_seconds - self.margin)
+            end = min(end_time, (i + 1) * self.bucket_seconds + self.margin)
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+        return intervals
+
+    def run(self) -> TriageReport:
+        """Premier passage complet sur la vidéo"""
+        t0 = time.time()
+
+        # FPS de la source -> stride d'échantillonnage
+        cap = open_capture(self.source, backend=self.backend)
+        if not cap.isOpened():
+            raise RuntimeError(f"Impossible d'ouvrir la source: {self.source}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        end_time = total_frames / fps if total_frames > 0 else 0.0
+        if self.end is not None:
+            end_time = min(end_time, self.end) if end_time else self.end
+        stride = max(1, int(round(fps / self.sample_fps)))
+
+        stop_event = Event()
+        queue = DeliveryQueue(maxsize=32, policy="block", name="triage")
+        reader = VideoReader(
+            self.source,
+            queue,
+            stop_event,
+            backend=self.backend,
+            decode_width=self.width,
+            pixel_format="gray",
+            stride=stride,
+            start=self.start or None,
+            end=self.end,
+        )
+        reader.start()
+        self.logger.info(
+            f"Triage: {self.width}px gris ({self.backend}), 1 frame sur {stride}, "
+            f"tranches de {self.bucket_seconds}s"
+        )
+
+        back_sub = cv2.createBackgroundSubtractorMOG2(
+            varThreshold=self.var_threshold, detectShadows=False
+        )
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        scores: List[float] = []
+        frames = 0
+        last_time = 0.0
+
+        try:
+            while True:
+                try:
+                    data = queue.get(timeout=1.0)
+                except Empty:
+                    if not reader.process.is_alive():
+                        break
+                    continue
+                if data.get("end_of_stream"):
+                    break
+
+                gray = self._prepare(data["frame"])
+                fg_mask = back_sub.apply(gray)
+                frames += 1
+                # Première frame: le modèle de fond n'est pas encore appris
+                if frames == 1:
+                    continue
+
+                fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
+                score = cv2.countNonZero(fg_mask) / fg_mask.size
+
+                last_time = (data["frame_number"] - 1) / fps
+                bucket = int(last_time / self.bucket_seconds)
+                if bucket >= len(scores):
+                    scores.extend([0.0] * (bucket + 1 - len(scores)))
+                scores[bucket] = max(scores[bucket], score)
+        finally:
+            reader.stop()
+
+        end_time = max(end_time, last_time)
+        report = TriageReport(
+            source=str(self.source),
+            duration=max(0.0, end_time - self.start),
+            intervals=self._intervals(scores, end_time),
+            bucket_scores=scores,
+            bucket_seconds=self.bucket_seconds,
+            frames_analyzed=frames,
+            elapsed=time.time() - t0,
+            start=self.start,
+        )
+        self.logger.info(
+            f"Triage terminé: {len(report.intervals)} intervalles, "
+            f"{report.skipped_ratio:.0%} de la vidéo ignoré"
+        )
+        return report
@@ -0,0 +1,10 @@
+"""
+Détection de mouvement.
+
+Les scripts mog2.py et optical_flow.py sont des exemples autonomes ;
+ActivityTriage est utilisé par new_main.py (--triage).
+"""
+
+from .ActivityTriage import ActivityTriage, TriageReport
+
+__all__ = ["ActivityTriage", "TriageReport"]
@@ -3,7 +3,7 @@
 new_main.py - Point d'entrée pour la nouvelle architecture multiprocessus
 
 Usage:
-    python new_main.py [source] [options]
+    python new_main.py source [source ...] [options]
 
 Exemples:
     # Webcam avec affichage
@@ -20,6 +20,9 @@ Exemples:
 
     # Webcam avec pipeline de traitement
     python new_main.py 0 --pipeline grayscale
+
+    # Enregistrement long: premier passage rapide, détection sur les intervalles actifs
+    python new_main.py archive.mp4 --triage --pipeline drone-detection --save out.mp4
 """
 
 import sys
@@ -30,9 +33,14 @@ import logging
 
 # Imports depuis le package ts341_project
 from ts341_project.VideoProcessor import VideoProcessor
-from ts341_project.pipeline import AVAILABLE_PIPELINES
+from ts341_project.DeliveryQueue import POLICIES
+from ts341_project.MultiStreamProcessor import MultiStreamProcessor
+from ts341_project.pipeline import AVAILABLE_PIPELINES, PipelineConfig
 from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
 from ts341_project.logging_utils import setup_logging, shutdown_logging
+from ts341_project.movement_detection import ActivityTriage
+from ts341_project.sources import default_cache_dir, is_image_sequence
+from ts341_project.sources.ImageSequenceCapture import list_images
 
 
 # ============================================================================
@@ -40,6 +48,62 @@ from ts341_project.logging_utils import setup_logging, shutdown_logging
 # ============================================================================
 
 
+def parse_time(value: str) -> float:
+    """Convertit '90', '90.5', '1:30' ou '0:01:30' en secondes"""
+    seconds = 0.0
+    try:
+        for part in value.split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Temps invalide: {value}")
+    return seconds
+
+
+def triage_ranges(report, start: float, end: float, output_path: str) -> list:
+    """
+    Intervalles actifs du triage restreints à [start, end].
+
+    Returns:
+        Liste de (début, fin, fichier de sortie), un fichier numéroté par intervalle
+    """
+    ranges = []
+    for interval_start, interval_end in report.intervals:
+        interval_start = max(interval_start, start or 0.0)
+        interval_end = min(interval_end, end) if end is not None else interval_end
+        if interval_end > interval_start:
+            ranges.append((interval_start, interval_end))
+
+    path = Path(output_path)
+    return [
+        (s, e, str(path.with_name(f"{path.stem}_{i:03d}{path.suffix}")))
+        for i, (s, e) in enumerate(ranges, 1)
+    ]
+
+
+def parse_source(value: str) -> tuple:
+    """
+    Résout une source de la ligne de commande.
+
+    Returns:
+        (source, type) : int pour une webcam, chemin sinon (quitte si introuvable)
+    """
+    try:
+        return int(value), "Webcam"
+    except ValueError:
+        pass
+
+    if is_image_sequence(value):
+        if not list_images(value):
+            print(f"Aucune image trouvée: {value}")
+            sys.exit(1)
+        return value, "Séquence d'images"
+
+    if not Path(value).exists():
+        print(f"Fichier introuvable: {value}")
+        sys.exit(1)
+    return value, "Fichier"
+
+
 def parse_args():
     """Parse les arguments en ligne de commande"""
     parser = argparse.ArgumentParser(
@@ -53,12 +117,29 @@ Exemples:
   %(prog)s video.mp4 --save out.mp4 --no-display  # Headless (sauvegarde uniquement)
   %(prog)s 0 --pipeline dual                    # Webcam avec affichage dual
   %(prog)s 0 --pipeline edges                   # Webcam avec détection contours
+  %(prog)s 0 --live --pipeline drone-detection  # Webcam, toujours la frame la plus récente
+  %(prog)s video.mp4 --start 10:00 --end 20:00 --stride 5  # Minutes 10-20, 1 frame sur 5
+  %(prog)s video.mp4 --triage -p drone-detection  # Pipeline uniquement sur les intervalles actifs
+  %(prog)s "dataset/*.png" -p drone-detection    # Séquence d'images (décodage parallèle)
+  %(prog)s cam1.mp4 cam2.mp4 cam3.mp4 --workers 2 -p drone-detection --save out.mp4
+  %(prog)s video.mp4 -p drone-detection -p edges  # Deux pipelines, un seul décodage
         """,
     )
 
     parser.add_argument(
         "source",
-        help="Source vidéo: 0 pour webcam, ou chemin vers fichier vidéo",
+        nargs="+",
+        help=(
+            "Source vidéo: 0 pour webcam, chemin vers fichier vidéo, ou séquence "
+            "d'images (dossier, motif glob entre guillemets, fichier index .txt). "
+            "Plusieurs sources: traitement multi-caméras dans un seul orchestrateur"
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Multi-caméras: nombre de processus de traitement partagés (défaut: CPU/2)",
     )
 
     parser.add_argument(
@@ -83,9 +164,12 @@ Exemples:
     parser.add_argument(
         "--pipeline",
         "-p",
-        default="passthrough",
+        action="append",
         choices=list(AVAILABLE_PIPELINES.keys()),
-        help="Pipeline de traitement (défaut: passthrough)",
+        help=(
+            "Pipeline de traitement (défaut: passthrough). Répétable: plusieurs "
+            "pipelines sur un seul décodage, une fenêtre et un fichier par pipeline"
+        ),
     )
 
     parser.add_argument(
@@ -95,6 +179,70 @@ Exemples:
         help="Mode temps réel (limiter FPS pour webcam)",
     )
 
+    parser.add_argument(
+        "--live",
+        "-l",
+        action="store_true",
+        help="Mode live (webcam): toujours traiter la frame la plus récente",
+    )
+
+    parser.add_argument(
+        "--start",
+        type=parse_time,
+        metavar="TEMPS",
+        help="Début de la plage à traiter (secondes ou MM:SS)",
+    )
+
+    parser.add_argument(
+        "--end",
+        type=parse_time,
+        metavar="TEMPS",
+        help="Fin de la plage à traiter (secondes ou MM:SS)",
+    )
+
+    parser.add_argument(
+        "--stride",
+        type=int,
+        default=1,
+        help="Traiter une frame sur N (les autres sont sautées sans décodage complet)",
+    )
+
+    parser.add_argument(
+        "--triage",
+        action="store_true",
+        help=(
+            "Premier passage rapide (basse résolution, mouvement MOG2) puis "
+            "pipeline complet uniquement sur les intervalles actifs"
+        ),
+    )
+
+    parser.add_argument(
+        "--triage-only",
+        action="store_true",
+        help="Afficher les intervalles actifs sans lancer le pipeline",
+    )
+
+    parser.add_argument(
+        "--triage-threshold",
+        type=float,
+        default=0.002,
+        help="Fraction de pixels en mouvement pour qu'une tranche soit active (défaut: 0.002)",
+    )
+
+    parser.add_argument(
+        "--triage-margin",
+        type=float,
+        default=2.0,
+        metavar="SECONDES",
+        help="Marge autour de chaque intervalle actif (défaut: 2s)",
+    )
+
+    parser.add_argument(
+        "--triage-report",
+        metavar="PATH",
+        help="Sauvegarder le rapport de triage en JSON",
+    )
+
     parser.add_argument(
         "--codec",
         "-c",
@@ -117,29 +265,209 @@ Exemples:
         help="Hauteur max d'affichage (défaut: 720)",
     )
 
+    parser.add_argument(
+        "--display-codec",
+        choices=["raw", "jpeg"],
+        default="raw",
+        help="Encodage des frames d'affichage entre processus (défaut: raw)",
+    )
+
+    parser.add_argument(
+        "--delivery",
+        action="append",
+        default=[],
+        metavar="CONSUMER=POLICY",
+        help=(
+            "Politique de livraison d'un consommateur (processor, display, "
+            "display_raw, storage) : block, drop_newest ou drop_oldest. "
+            "Ex: --delivery display=drop_newest"
+        ),
+    )
+
+    parser.add_argument(
+        "--queue-budget",
+        type=float,
+        default=64.0,
+        metavar="MO",
+        help="Budget mémoire par queue en Mo, capacité calculée depuis la résolution (défaut: 64)",
+    )
+
+    parser.add_argument(
+        "--backend",
+        choices=["opencv", "ffmpeg"],
+        default="opencv",
+        help="Backend de décodage (ffmpeg: multi-thread, mise à l'échelle au décodage)",
+    )
+
+    parser.add_argument(
+        "--decode-width",
+        type=int,
+        help="Largeur de décodage (backend ffmpeg, défaut: celle du pipeline)",
+    )
+
+    parser.add_argument(
+        "--decode-format",
+        choices=["bgr24", "gray"],
+        help="Format de pixel décodé (backend ffmpeg, défaut: celui du pipeline)",
+    )
+
+    parser.add_argument(
+        "--frame-cache",
+        nargs="?",
+        const=str(default_cache_dir()),
+        metavar="DIR",
+        help=(
+            "Cache des frames décodées (memmap) pour les passages répétés sur le "
+            f"même clip (défaut: {default_cache_dir()})"
+        ),
+    )
+
+    parser.add_argument(
+        "--record-mask",
+        metavar="PATH",
+        help="Enregistrer le masque MOG2 (pipeline drone-detection) dans un fichier .tsrec",
+    )
+
+    parser.add_argument(
+        "--block-timing",
+        nargs="?",
+        type=float,
+        const=10.0,
+        metavar="SECONDES",
+        help=(
+            "Histogrammes de durée par bloc et sous-étape (p50/p95/p99), "
+            "logués toutes les N secondes (défaut: 10) et à l'arrêt"
+        ),
+    )
+
+    parser.add_argument(
+        "--latency-trace",
+        action="store_true",
+        help=(
+            "Latence de bout en bout par frame (capture -> affichage / disque), "
+            "détaillée par étape (attente en queue, traitement), loguée à l'arrêt"
+        ),
+    )
+
+    parser.add_argument(
+        "--timeline",
+        nargs="?",
+        const="timeline.json",
+        metavar="FICHIER",
+        help=(
+            "Chronologie des processus (lecture, attentes en queue, pipeline et "
+            "blocs, affichage, écriture) au format Chrome trace, à ouvrir dans "
+            "https://ui.perfetto.dev (défaut: timeline.json)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help=(
+            "Servir les métriques Prometheus sur http://127.0.0.1:PORT/metrics "
+            "(FPS par étape, queues, percentiles par bloc, détections/s, RSS)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FICHIER",
+        help="Écrire les métriques Prometheus dans un fichier, réécrit périodiquement",
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=5.0,
+        metavar="SECONDES",
+        help="Période d'écriture de --metrics-file (défaut: 5)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=["cprofile", "sample"],
+        help=(
+            "Profiler chaque processus (reader, processor, affichage, stockage) : "
+            "cprofile (défaut) ou sample (échantillonnage de pile, coût quasi nul). "
+            "Rapport fusionné écrit à l'arrêt"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        metavar="DOSSIER",
+        help="Dossier des profils, un sous-dossier par exécution (défaut: profiles)",
+    )
+
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Niveau de log (défaut: INFO)",
+    )
+
+    parser.add_argument(
+        "--log-json",
+        metavar="FICHIER",
+        help="Logs structurés en plus de la console (une ligne JSON par record)",
+    )
+
     return parser.parse_args()
 
 
 def main():
     """Point d'entrée principal"""
-    # Initialiser le système de logging en premier
-    setup_logging(level=logging.INFO)
-
     args = parse_args()
 
-    # Déterminer la source
-    try:
-        source = int(args.source)
-        source_type = "Webcam"
-    except ValueError:
-        source = args.source
-        source_type = "Fichier"
-        if not Path(source).exists():
-            print(f"Fichier introuvable: {source}")
+    # Initialiser le système de logging en premier
+    setup_logging(level=getattr(logging, args.log_level), json_file=args.log_json)
+
+    # Déterminer la (les) source(s)
+    sources = [parse_source(value) for value in args.source]
+    source, source_type = sources[0]
+    multi_stream = len(sources) > 1
+
+    # Pipeline désigné par son nom : construit dans le processus de traitement
+    pipeline_names = args.pipeline or ["passthrough"]
+    args.pipeline = ", ".join(pipeline_names)
+    pipeline: Union[str, list, PipelineConfig, ProcessingPipeline, Type[ProcessingPipeline]] = (
+        pipeline_names[0] if len(pipeline_names) == 1 else pipeline_names
+    )
+    if len(pipeline_names) > 1 and multi_stream:
+        print("Plusieurs pipelines ne sont pas compatibles avec plusieurs sources")
+        sys.exit(1)
+
+    if args.record_mask:
+        if args.pipeline != "drone-detection":
+            print("--record-mask n'est disponible qu'avec le pipeline drone-detection")
             sys.exit(1)
+        if args.triage or multi_stream:
+            print("--record-mask n'est pas compatible avec --triage ni plusieurs sources")
+            sys.exit(1)
+        pipeline = PipelineConfig(args.pipeline, {"mask_record_path": args.record_mask})
+
+    args.triage = args.triage or args.triage_only
+    if args.triage and (source_type == "Webcam" or args.live or multi_stream):
+        print("--triage n'est disponible que pour un fichier vidéo unique")
+        sys.exit(1)
 
-    # Créer le pipeline (str sera converti en ProcessingPipeline par VideoProcessor)
-    pipeline: Union[str, ProcessingPipeline, Type[ProcessingPipeline]] = args.pipeline
+    # Politiques de livraison par consommateur
+    delivery_policies = {}
+    for item in args.delivery:
+        consumer, _, policy = item.partition("=")
+        if consumer not in VideoProcessor.DEFAULT_DELIVERY_POLICIES or policy not in POLICIES:
+            print(
+                f"--delivery invalide: {item} (consommateurs: "
+                f"{', '.join(VideoProcessor.DEFAULT_DELIVERY_POLICIES)} ; "
+                f"politiques: {', '.join(POLICIES)})"
+            )
+            sys.exit(1)
+        delivery_policies[consumer] = policy
 
     # Configuration
     enable_display = not args.no_display
@@ -155,7 +483,11 @@ def main():
     print("=" * 60)
     print("Nouvelle Architecture Multiprocessus")
     print("=" * 60)
-    print(f"Source:     {source_type} ({source})")
+    for stream_id, (stream_source, stream_type) in enumerate(sources):
+        label = f"Source {stream_id}:" if multi_stream else "Source:"
+        print(f"{label:<12}{stream_type} ({stream_source})")
+    if multi_stream:
+        print(f"Workers:    {args.workers or 'auto'}")
     print(f"Pipeline:   {args.pipeline}")
     print(f"Display Processed: {'ok' if enable_display else 'no'}")
     if enable_display_raw:
@@ -165,12 +497,25 @@ def main():
         print(f"  Fichier:  {output_path}")
         print(f"  Codec:    {args.codec}")
     print(f"Realtime:   {'ok' if args.realtime else 'no'}")
+    print(f"Backend:    {args.backend}")
+    if args.frame_cache:
+        print(f"Cache:      {args.frame_cache}")
+    print(f"Live:       {'ok' if args.live else 'no'}")
+    if args.start is not None or args.end is not None or args.stride > 1:
+        print(f"Plage:      {args.start or 0}s -> {args.end or 'fin'}, stride {args.stride}")
+    if args.triage:
+        print(f"Triage:     seuil {args.triage_threshold}, marge {args.triage_margin}s")
+    if args.record_mask:
+        print(f"Masque:     {args.record_mask}")
+    if delivery_policies:
+        print(f"Livraison:  {delivery_policies}")
     if enable_display or enable_display_raw:
         if enable_display:
             print(f"Window Processed: {args.window}")
         if enable_display_raw:
             print(f"Window Raw:       Raw (Live)")
         print(f"Max Height:       {args.max_height}")
+        print(f"Display Codec:    {args.display_codec}")
     print("=" * 60)
     print()
 
@@ -180,21 +525,76 @@ def main():
         print("Appuyez sur CTRL+C pour arrêter")
     print()
 
+    # Plages à traiter: toute la vidéo, ou les intervalles actifs du triage
+    ranges = [(args.start, args.end, output_path)]
+    processor_options = dict(
+        pipeline=pipeline,
+        enable_display=enable_display,
+        enable_display_raw=enable_display_raw,
+        enable_storage=enable_storage,
+        display_window=args.window,
+        max_display_height=args.max_height,
+        realtime=args.realtime,
+        codec=args.codec,
+        display_codec=args.display_codec,
+        delivery_policies=delivery_policies,
+        queue_budget_mb=args.queue_budget,
+        reader_backend=args.backend,
+        decode_width=args.decode_width,
+        decode_pixel_format=args.decode_format,
+        frame_cache=args.frame_cache,
+        live=args.live,
+        stride=args.stride,
+        block_timing=args.block_timing,
+        latency_trace=args.latency_trace,
+        timeline_path=args.timeline,
+        metrics_port=args.metrics_port,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+    )
+
     # Lancer le traitement
     try:
-        with VideoProcessor(
-            source=source,
-            pipeline=pipeline,
-            enable_display=enable_display,
-            enable_display_raw=enable_display_raw,
-            enable_storage=enable_storage,
-            output_path=output_path,
-            display_window=args.window,
-            max_display_height=args.max_height,
-            realtime=args.realtime,
-            codec=args.codec,
-        ) as processor:
-            processor.wait()
+        if args.triage:
+            report = ActivityTriage(
+                source,
+                threshold=args.triage_threshold,
+                margin=args.triage_margin,
+                start=args.start,
+                end=args.end,
+            ).run()
+            print(report.summary())
+            print()
+            if args.triage_report:
+                report.save(args.triage_report)
+
+            ranges = triage_ranges(report, args.start, args.end, output_path)
+            if args.triage_only:
+                ranges = []
+
+        if multi_stream:
+            ranges = []
+            with MultiStreamProcessor(
+                sources=[stream_source for stream_source, _ in sources],
+                workers=args.workers,
+                output_path=output_path,
+                start=args.start,
+                end=args.end,
+                **processor_options,
+            ) as processor:
+                processor.wait()
+
+        for start, end, range_output in ranges:
+            with VideoProcessor(
+                source=source,
+                output_path=range_output,
+                start=start,
+                end=end,
+                **processor_options,
+            ) as processor:
+                processor.wait()
 
     except KeyboardInterrupt:
         print("\nInterruption utilisateur (CTRL+C)")
@@ -213,8 +613,11 @@ def main():
     print()
     print("=" * 60)
     print("Traitement terminé")
-    if enable_storage:
-        print(f"Fichier sauvegardé: {output_path}")
+    if enable_storage and multi_stream:
+        print(f"Fichiers sauvegardés: {output_path} (un par flux, suffixe _cam<id>)")
+    elif enable_storage:
+        for _, _, range_output in ranges:
+            print(f"Fichier sauvegardé: {range_output}")
     print("=" * 60)
 
 
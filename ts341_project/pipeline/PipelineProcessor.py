@@ -3,12 +3,27 @@
 Consomme les frames, applique le pipeline, distribue aux consommateurs
 """
 
-from multiprocessing import Process, Queue, Event
+from multiprocessing import Process, Event, Value
+from queue import Empty
+import copy
 import time
-from typing import Union, Type
+from typing import Union, Type, Dict, Iterable, Optional
 
 from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
+from ts341_project.pipeline.PipelineRegistry import (
+    PipelineConfig,
+    create_pipeline,
+    get_spec,
+)
+from ts341_project.ResultSchema import MetadataSchema
+from ts341_project.FrameCodec import FrameCodec
+from ts341_project.DeliveryQueue import DeliveryQueue
 from ts341_project.logging_utils import get_logger
+from ts341_project.LatencyHistogram import LatencyRecorder
+from ts341_project.LatencyTrace import stamp
+from ts341_project.TimelineTrace import BlockTraceRecorder, span, start_tracing, stop_tracing
+from ts341_project.ProcessProfiler import profiled
+from ts341_project.memory_utils import memory_report
 
 
 class PipelineProcessor:
@@ -20,93 +35,284 @@ class PipelineProcessor:
     def __init__(
         self,
         pipeline: Union[
-            str, ProcessingPipeline, Type[ProcessingPipeline]
-        ],  # ProcessingPipeline, str (nom), ou classe de pipeline
-        input_queue: Queue,
-        output_queues: dict,  # {'display': Queue, 'storage': Queue}
+            str, PipelineConfig, ProcessingPipeline, Type[ProcessingPipeline]
+        ],  # str (nom), PipelineConfig, ProcessingPipeline, ou classe de pipeline
+        input_queue: DeliveryQueue,
+        output_queues: dict,  # {'display': DeliveryQueue, 'storage': DeliveryQueue}
         stop_event: Event,
+        metadata_fields: Dict[str, Optional[Iterable[str]]] = None,
+        codecs: Dict[str, FrameCodec] = None,
+        streams: Iterable[int] = None,
+        name: str = None,
+        frame_ring=None,
+        started_at: float = None,
+        timing_interval: float = None,
+        trace_dir: str = None,
+        metrics=None,
+        profile=None,
     ):
         """
         Args:
-            pipeline: ProcessingPipeline instance, str (nom de pipeline), ou classe
+            pipeline: str (nom de pipeline), PipelineConfig, classe, ou instance de
+                      ProcessingPipeline. Sauf pour une instance, le pipeline est
+                      construit dans le processus de traitement (rien de lourd
+                      n'est picklé)
             input_queue: Queue d'entrée (frames brutes)
             output_queues: Dict de queues de sortie
             stop_event: Event d'arrêt
+            metadata_fields: Champs de metadata souscrits par consommateur
+                            ({'display': [], 'storage': None}, None = tous les champs)
+            codecs: Encodage des frames par consommateur (défaut: brut, taille native)
+            streams: Flux traités par ce worker (multi-caméras). Une instance de
+                     pipeline par flux (état séparé, ex: un MOG2 par caméra) ;
+                     None = flux unique non tagué
+            name: Nom du worker dans les logs
+            frame_ring: SharedFrameRing si les frames arrivent par référence
+                        ('frame_ref', plusieurs pipelines sur un même décodage)
+            started_at: Instant de démarrage de l'orchestrateur (time.time()),
+                        référence du délai jusqu'à la première frame traitée
+            timing_interval: Active les histogrammes de durée par bloc (p50/p95/p99),
+                             logués toutes les `timing_interval` secondes et à l'arrêt
+            trace_dir: Dossier de la chronologie (TimelineTrace), None = désactivée
+            metrics: Bloc de métriques partagé (PipelineMetrics) : frames, détections,
+                     RSS et percentiles par bloc. None = désactivé
+            profile: Profilage du processus (ProcessProfiler.ProfileConfig), None = désactivé
         """
-        # Importer ici pour éviter les imports circulaires
-        from ts341_project.pipeline.Pipelines import create_pipeline
-
-        # Convertir en instance de ProcessingPipeline si nécessaire
-        self.pipeline = create_pipeline(pipeline)
+        # Description légère du pipeline, construit dans le processus
+        # (une instance indépendante par flux)
+        if isinstance(pipeline, str):
+            pipeline = PipelineConfig(get_spec(pipeline).name)
+        if streams is None:
+            self.pipeline_configs = {None: pipeline}
+        else:
+            self.pipeline_configs = {
+                stream_id: copy.deepcopy(pipeline)
+                if isinstance(pipeline, ProcessingPipeline)
+                else pipeline
+                for stream_id in streams
+            }
+        self.name = name
+        self.started_at = started_at
+        self.timing_interval = timing_interval
+        self.trace_dir = trace_dir
+        self.metrics = metrics
+        self.profile = profile
+        self.ready_event = Event()
+        self.first_frame_time = Value("d", 0.0)  # time.time() de la première frame traitée
+        self.frame_ring = frame_ring
         self.input_queue = input_queue
         self.output_queues = output_queues
         self.stop_event = stop_event
 
+        metadata_fields = metadata_fields or {}
+        self.schemas = {
+            name: MetadataSchema(metadata_fields.get(name)) for name in output_queues
+        }
+        codecs = codecs or {}
+        self.codecs = {name: codecs.get(name, FrameCodec()) for name in output_queues}
+
+    @property
+    def time_to_first_frame(self) -> float:
+        """Délai démarrage -> première frame traitée (secondes, None si aucune)"""
+        first_frame_time = self.first_frame_time.value
+        if not first_frame_time or self.started_at is None:
+            return None
+        return first_frame_time - self.started_at
+
     @staticmethod
-    def _processor_process(pipeline, input_queue, output_queues, stop_event):
+    def _processor_process(
+        pipeline_configs,
+        input_queue,
+        output_queues,
+        stop_event,
+        schemas,
+        codecs,
+        worker_name,
+        frame_ring,
+        ready_event,
+        started_at,
+        first_frame_time,
+        timing_interval,
+        trace_dir,
+        metrics,
+    ):
         """Processus de traitement"""
         logger = get_logger(__name__)
-        logger.info("Démarré")
+        prefix = f"{worker_name}: " if worker_name else ""
+        tracer = start_tracing(
+            trace_dir, "processor" if worker_name is None else f"processor {worker_name}"
+        )
+
+        # Construction des pipelines ici (patterns, ORB...), puis signal prêt
+        build_start = time.time()
+        try:
+            pipelines = {
+                stream_id: create_pipeline(config)
+                for stream_id, config in pipeline_configs.items()
+            }
+        except Exception as e:
+            logger.error(f"{prefix}Construction du pipeline impossible: {e}")
+            return
+        # Durées par bloc (un enregistreur pour tous les flux du worker),
+        # loguées (timing_interval) et/ou publiées dans les métriques
+        timings = None
+        if timing_interval or metrics is not None:
+            timings = LatencyRecorder()
+            last_timing_report = time.time()
+        # Chronologie: les durées par bloc deviennent des intervalles
+        block_recorder = timings if tracer is None else BlockTraceRecorder(tracer, timings)
+        if block_recorder is not None:
+            for pipeline in pipelines.values():
+                pipeline.enable_timing(block_recorder)
+
+        ready_event.set()
+        logger.info(f"{prefix}Démarré - pipeline prêt en {time.time() - build_start:.2f}s")
+        if None not in pipelines:
+            logger.info(f"{prefix}Flux {sorted(pipelines)}")
+        for name, schema in schemas.items():
+            logger.debug(f"Metadata -> {name}: {schema}")
 
         frame_count = 0
+        errors = 0  # Frames jetées sur exception (bloc, codec...)
         start_time = time.time()
+        active_streams = set(pipelines)
 
         while not stop_event.is_set():
             try:
                 # Récupérer frame
                 data = input_queue.get(timeout=0.5)
+            except Empty:
+                continue  # Queue vide, on continue
+
+            try:
+                trace = stamp(data.get("trace"), "processor_in")
+                stream_id = data.get("stream_id")
+                tag = {} if stream_id is None else {"stream_id": stream_id}
 
                 # Fin de stream ?
                 if isinstance(data, dict) and data.get("end_of_stream"):
-                    logger.info("END_OF_STREAM reçu")
-                    # Propager aux consommateurs
-                    for name, queue in output_queues.items():
+                    suffix = f" (flux {stream_id})" if tag else ""
+                    logger.info(f"{prefix}END_OF_STREAM reçu{suffix}")
+                    # Propager aux consommateurs (fin de ce flux)
+                    for queue in output_queues.values():
                         if queue is not None:
-                            try:
-                                queue.put({"end_of_stream": True}, timeout=1.0)
-                            except:
-                                pass
-                    break
-
-                # Traiter
-                frame = data["frame"]
+                            queue.put(
+                                {"end_of_stream": True, **tag}, stop_event, control=True
+                            )
+                    active_streams.discard(stream_id)
+                    if not active_streams:
+                        break
+                    continue
+
+                # Traiter (pipeline du flux: état propre à chaque caméra)
+                if "frame_ref" in data:
+                    # Copie locale du slot partagé (libéré aussitôt)
+                    frame = frame_ring.get(data["frame_ref"])
+                else:
+                    frame = data["frame"]
                 frame_number = data["frame_number"]
 
-                result = pipeline.process(frame)
+                frame_start = time.monotonic()
+                result = pipelines[stream_id].process(frame, data.get("pts"), frame_number)
+                stamp(trace, "processed")
                 frame_count += 1
+                if frame_count == 1:
+                    first_frame_time.value = time.time()
+                    if started_at is not None:
+                        logger.info(
+                            f"{prefix}Première frame traitée "
+                            f"{first_frame_time.value - started_at:.2f}s après le démarrage"
+                        )
 
-                # Distribuer
-                output_data = {
-                    "frame": result.frame,
-                    "frame_number": frame_number,
-                    "metadata": result.metadata,
-                }
-
+                # Distribuer (metadata filtrées et frame encodée par consommateur,
+                # scratch jamais envoyé)
                 for name, queue in output_queues.items():
                     if queue is not None:
-                        try:
-                            queue.put_nowait(output_data)
-                        except:
-                            pass  # Queue pleine
+                        output_data = {
+                            "frame_number": frame_number,
+                            "timestamp": data.get("timestamp"),
+                            "pts": result.pts,
+                            "metadata": schemas[name].pack(result.metadata),
+                            **tag,
+                        }
+                        with span(f"encodage {name}"):
+                            output_data.update(codecs[name].encode(result.frame))
+                        if trace is not None:
+                            # Trace propre à chaque consommateur (jamais modifiée après put)
+                            output_data["trace"] = stamp(dict(trace), "processor_out")
+                        # Politique de la queue: bloquante (sans perte) ou jetée
+                        # (comptabilisée dans les stats de la queue)
+                        queue.put(output_data, stop_event=stop_event)
+                if tracer is not None:
+                    # Frame complète : pipeline (blocs) + encodage + envoi
+                    tracer.complete(
+                        "frame", "frame", frame_start, time.monotonic(), {"frame": frame_number}
+                    )
+
+                if metrics is not None:
+                    metrics.frame(result.metadata.get("num_detections", 0), timings)
+
+                if timing_interval and time.time() - last_timing_report >= timing_interval:
+                    logger.info(timings.report(f"{prefix}Durées par bloc"))
+                    last_timing_report = time.time()
 
                 # Stats
                 if frame_count % 100 == 0:
                     elapsed = time.time() - start_time
                     fps = frame_count / elapsed
-                    logger.info(f"{frame_count} frames | {fps:.1f} FPS")
+                    logger.info(f"{prefix}{frame_count} frames | {fps:.1f} FPS")
+                    logger.info(
+                        memory_report([input_queue, *output_queues.values()])
+                    )
+                    for queue in [input_queue, *output_queues.values()]:
+                        if queue is not None:
+                            logger.debug(queue.describe())
 
-            except:
-                continue  # Queue vide, on continue
+            except Exception:
+                # Frame jetée, mais jamais en silence
+                errors += 1
+                logger.exception(f"{prefix}Frame {data.get('frame_number')} jetée sur erreur")
+                if metrics is not None:
+                    metrics.error()
+
+        for pipeline in pipelines.values():
+            pipeline.close()
 
         elapsed = time.time() - start_time
         fps = frame_count / elapsed if elapsed > 0 else 0
-        logger.info(f"Arrêté - {frame_count} frames, {fps:.1f} FPS")
+        logger.info(f"{prefix}Arrêté - {frame_count} frames, {fps:.1f} FPS")
+        if errors:
+            logger.warning(f"{prefix}{errors} frame(s) jetée(s) sur erreur")
+        if timing_interval:
+            logger.info(timings.report(f"{prefix}Durées par bloc (total)"))
+        for queue in output_queues.values():
+            if queue is not None:
+                logger.info(queue.describe())
+        if metrics is not None:
+            metrics.publish(timings)  # État final (percentiles sur toutes les frames)
+        stop_tracing()
 
     def start(self):
         """Démarre le processus"""
+        role = "processor" if self.name is None else f"processor-{self.name}"
         self.process = Process(
-            target=PipelineProcessor._processor_process,
-            args=(self.pipeline, self.input_queue, self.output_queues, self.stop_event),
+            target=profiled(PipelineProcessor._processor_process, self.profile, role),
+            args=(
+                self.pipeline_configs,
+                self.input_queue,
+                self.output_queues,
+                self.stop_event,
+                self.schemas,
+                self.codecs,
+                self.name,
+                self.frame_ring,
+                self.ready_event,
+                self.started_at,
+                self.first_frame_time,
+                self.timing_interval,
+                self.trace_dir,
+                self.metrics,
+            ),
         )
         self.process.start()
         return self
@@ -0,0 +1,289 @@
+"""
+PipelineRegistry - Registre paresseux des pipelines pré-configurés
+
+Les noms, descriptions, formats d'entrée et paramètres des pipelines sont des
+métadonnées statiques : lister les pipelines (CLI, interface Streamlit)
+n'importe ni OpenCV ni les blocs, et n'instancie rien. La classe d'un pipeline
+n'est importée qu'au premier create_pipeline() qui la demande.
+
+Vérification (métadonnées cohérentes avec les classes + budget d'import) :
+    python -m ts341_project.pipeline.check_registry
+"""
+
+import importlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PipelineSpec:
+    """
+    Métadonnées d'un pipeline enregistré.
+
+    Attributes:
+        name: Nom court (CLI, interface)
+        target: Classe du pipeline, 'module:Classe' (importée à la demande)
+        description: Description affichée
+        params: Paramètres du constructeur et leurs valeurs par défaut
+        input_width: Largeur d'entrée attendue (None = native)
+        input_pixel_format: Format d'entrée attendu ('bgr24' ou 'gray')
+    """
+
+    name: str
+    target: str
+    description: str
+    params: Dict[str, object] = field(default_factory=dict)
+    input_width: Optional[int] = None
+    input_pixel_format: str = "bgr24"
+
+    def load(self) -> type:
+        """Importe et retourne la classe du pipeline"""
+        module_name, class_name = self.target.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create(self, **kwargs):
+        """Instancie le pipeline"""
+        return self.load()(**kwargs)
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Pipeline à construire : nom enregistré + arguments du constructeur.
+
+    Léger à transmettre à un processus (rien de lourd n'est picklé, y compris
+    avec la méthode de démarrage 'spawn') ; le pipeline est construit par le
+    processus qui l'utilise.
+    """
+
+    name: str
+    kwargs: Dict[str, object] = field(default_factory=dict)
+
+    def build(self):
+        """Instancie le pipeline"""
+        return get_spec(self.name).create(**self.kwargs)
+
+
+_PIPELINES_MODULE = "ts341_project.pipeline.Pipelines"
+
+PIPELINE_SPECS: Dict[str, PipelineSpec] = {}
+
+
+def register_pipeline(spec: PipelineSpec) -> PipelineSpec:
+    """Ajoute (ou remplace) un pipeline dans le registre"""
+    PIPELINE_SPECS[spec.name] = spec
+    return spec
+
+
+for _spec in (
+    PipelineSpec("passthrough", f"{_PIPELINES_MODULE}:PassthroughPipeline", "Passthrough"),
+    PipelineSpec(
+        "grayscale",
+        f"{_PIPELINES_MODULE}:GrayscalePipeline",
+        "Grayscale",
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "edges",
+        f"{_PIPELINES_MODULE}:EdgeDetectionPipeline",
+        "Edge Detection (Canny)",
+        params={"threshold1": 50, "threshold2": 150},
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "blur",
+        f"{_PIPELINES_MODULE}:BlurPipeline",
+        "Gaussian Blur (kernel=15)",
+        params={"kernel_size": 15, "sigma": 0},
+    ),
+    PipelineSpec(
+        "threshold",
+        f"{_PIPELINES_MODULE}:ThresholdPipeline",
+        "Threshold (binary)",
+        params={"threshold": 127, "threshold_type": "binary"},
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "histogram",
+        f"{_PIPELINES_MODULE}:HistogramEqualizationPipeline",
+        "Histogram Equalization",
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "edge-enhance",
+        f"{_PIPELINES_MODULE}:EdgeEnhancementPipeline",
+        "Edge Enhancement (Blur + Canny)",
+        params={"blur_kernel": 5, "canny_low": 50, "canny_high": 150},
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "morphology",
+        f"{_PIPELINES_MODULE}:MorphologyPipeline",
+        "Morphology (opening)",
+        params={"operation": "opening", "kernel_size": 5},
+        input_pixel_format="gray",
+    ),
+    PipelineSpec(
+        "drone-detection",
+        f"{_PIPELINES_MODULE}:DroneDetectionPipeline",
+        "Drone Detection",
+        params={"pattern_dir": None, "mask_record_path": None},
+        input_width=1280,
+    ),
+):
+    register_pipeline(_spec)
+
+
+class _PipelineClasses(Mapping):
+    """Vue {nom: classe} du registre : la classe est importée à l'accès"""
+
+    def __getitem__(self, name: str) -> type:
+        return PIPELINE_SPECS[name].load()
+
+    def __iter__(self):
+        return iter(PIPELINE_SPECS)
+
+    def __len__(self) -> int:
+        return len(PIPELINE_SPECS)
+
+
+AVAILABLE_PIPELINES = _PipelineClasses()
+
+
+def get_spec(name: str) -> PipelineSpec:
+    """Spec d'un pipeline enregistré (ValueError si inconnu)"""
+    if name not in PIPELINE_SPECS:
+        available = ", ".join(PIPELINE_SPECS)
+        raise ValueError(
+            f"Pipeline '{name}' inconnu. Pipelines disponibles: {available}"
+        )
+    return PIPELINE_SPECS[name]
+
+
+def _target_of(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def create_pipeline(pipeline_name, **kwargs):
+    """
+    Crée un pipeline selon le nom ou retourne la pipeline si c'est déjà une instance.
+
+    Args:
+        pipeline_name: Nom du pipeline (str), PipelineConfig, instance de
+                      ProcessingPipeline, ou classe de pipeline
+        **kwargs: Arguments spécifiques au pipeline
+
+    Returns:
+        Instance du pipeline
+
+    Exemples:
+        >>> create_pipeline("grayscale")
+        >>> create_pipeline("edges", threshold1=100, threshold2=200)
+        >>> create_pipeline(EdgeDetectionPipeline(100, 200))
+        >>> create_pipeline(EdgeDetectionPipeline, threshold1=100, threshold2=200)
+    """
+    # Si c'est un string, créer depuis le registre (import de la classe seule)
+    if isinstance(pipeline_name, str):
+        return get_spec(pipeline_name).create(**kwargs)
+    if isinstance(pipeline_name, PipelineConfig):
+        return get_spec(pipeline_name.name).create(**{**pipeline_name.kwargs, **kwargs})
+
+    from ts341_project.pipeline.ProcessingPipeline import ProcessingPipeline
+
+    # Si c'est déjà une instance de ProcessingPipeline, la retourner
+    if isinstance(pipeline_name, ProcessingPipeline):
+        return pipeline_name
+
+    # Si c'est une classe, l'instancier
+    if isinstance(pipeline_name, type) and issubclass(
+        pipeline_name, ProcessingPipeline
+    ):
+        return pipeline_name(**kwargs)
+
+    # Sinon erreur
+    raise TypeError(
+        f"pipeline_name doit être un str, un PipelineConfig, une classe ou une instance "
+        f"de ProcessingPipeline, "
+        f"pas {type(pipeline_name)}"
+    )
+
+
+def pipeline_input_format(pipeline):
+    """
+    Retourne (largeur, format de pixel) attendus en entrée par un pipeline.
+
+    Args:
+        pipeline: Nom (str), PipelineConfig, classe ou instance de ProcessingPipeline
+    """
+    if isinstance(pipeline, PipelineConfig):
+        pipeline = pipeline.name
+    if isinstance(pipeline, str):
+        spec = PIPELINE_SPECS.get(pipeline)
+        if spec is None:
+            return None, "bgr24"
+        return spec.input_width, spec.input_pixel_format
+    return pipeline.input_width, pipeline.input_pixel_format
+
+
+def pipeline_label(pipeline) -> str:
+    """Nom court d'un pipeline (nom enregistré, ou nom de classe)"""
+    if isinstance(pipeline, str):
+        return pipeline
+    if isinstance(pipeline, PipelineConfig):
+        return pipeline.name
+    cls = pipeline if isinstance(pipeline, type) else type(pipeline)
+    target = _target_of(cls)
+    for name, spec in PIPELINE_SPECS.items():
+        if spec.target == target:
+            return name
+    return cls.__name__
+
+
+def named_pipelines(pipelines) -> dict:
+    """
+    Normalise un ou plusieurs pipelines en dict {nom: pipeline}.
+
+    Args:
+        pipelines: Pipeline unique (str, classe, instance), liste de pipelines,
+                   ou dict {nom: pipeline}
+
+    Returns:
+        {None: pipeline} pour un pipeline unique, sinon {nom: pipeline}
+        (noms dédoublonnés: 'edges', 'edges_2', ...)
+    """
+    if isinstance(pipelines, dict):
+        return dict(pipelines)
+    if not isinstance(pipelines, (list, tuple)):
+        return {None: pipelines}
+    if len(pipelines) == 1:
+        return {None: pipelines[0]}
+
+    named = {}
+    for pipeline in pipelines:
+        label = base = pipeline_label(pipeline)
+        index = 2
+        while label in named:
+            label = f"{base}_{index}"
+            index += 1
+        named[label] = pipeline
+    return named
+
+
+def shared_input_format(pipelines) -> tuple:
+    """
+    (largeur, format de pixel) d'un décodage partagé par plusieurs pipelines.
+
+    La largeur est la plus grande demandée (None si un pipeline veut la
+    résolution native) ; le gris n'est utilisé que si tous les pipelines le demandent.
+    """
+    formats = [pipeline_input_format(p) for p in pipelines]
+    widths = [width for width, _ in formats]
+    width = None if None in widths else max(widths)
+    pixel_format = "gray" if all(fmt == "gray" for _, fmt in formats) else "bgr24"
+    return width, pixel_format
+
+
+def list_pipelines() -> List[Tuple[str, str]]:
+    """Retourne la liste des pipelines disponibles avec leurs descriptions (sans import)"""
+    return [(name, spec.description) for name, spec in PIPELINE_SPECS.items()]
@@ -4,6 +4,9 @@ Pipelines.py - Définition des pipelines de traitement pré-configurés
 
 Utilise les blocks existants dans image_block/ et video_block/
 Toutes les pipelines héritent de ProcessingPipeline.
+
+Chaque pipeline est déclaré dans PipelineRegistry (nom, description, format
+d'entrée, paramètres) : ce module n'est importé qu'à la création d'un pipeline.
 """
 
 import cv2
@@ -20,7 +23,17 @@ from ts341_project.pipeline.image_block.MorphologyBlock import MorphologyBlock
 from ts341_project.pipeline.image_block.HistogramEqualizationBlock import (
     HistogramEqualizationBlock,
 )
-from ts341_project.pipeline.image_block.ColorScaleBlock import ColorScaleBlock
+
+# Factory et registre (métadonnées statiques, voir PipelineRegistry.py)
+from ts341_project.pipeline.PipelineRegistry import (  # noqa: F401
+    AVAILABLE_PIPELINES,
+    create_pipeline,
+    list_pipelines,
+    named_pipelines,
+    pipeline_input_format,
+    pipeline_label,
+    shared_input_format,
+)
 
 
 # ============================================================================
@@ -38,22 +51,28 @@ class PassthroughPipeline(ProcessingPipeline):
 class DroneDetectionPipeline(ProcessingPipeline):
     """Pipeline de détection de drone utilisant CustomDroneBlock"""
 
-    def __init__(self, pattern_dir: str = None):
+    # CustomDroneBlock travaille à 1280 de large : inutile de décoder plus grand
+    input_width = 1280
+
+    def __init__(self, pattern_dir: str = None, mask_record_path: str = None):
         super().__init__(
             blocks=[
-                CustomDroneBlock(pattern_dir=pattern_dir),
+                CustomDroneBlock(
+                    pattern_dir=pattern_dir, mask_record_path=mask_record_path
+                ),
             ]
         )
         self.name = "Drone Detection"
 
 class GrayscalePipeline(ProcessingPipeline):
-    """Pipeline de conversion en niveaux de gris avec affichage couleur"""
+    """Pipeline de conversion en niveaux de gris (frame 1 canal, étendue en BGR par les sinks)"""
+
+    input_pixel_format = "gray"
 
     def __init__(self):
         super().__init__(
             blocks=[
                 GrayscaleBlock(),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = "Grayscale"
@@ -62,11 +81,12 @@ class GrayscalePipeline(ProcessingPipeline):
 class EdgeDetectionPipeline(ProcessingPipeline):
     """Pipeline de détection de contours (Canny)"""
 
+    input_pixel_format = "gray"
+
     def __init__(self, threshold1=50, threshold2=150):
         super().__init__(
             blocks=[
                 CannyEdgeBlock(threshold1, threshold2),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = "Edge Detection (Canny)"
@@ -91,12 +111,13 @@ class BlurPipeline(ProcessingPipeline):
 class ThresholdPipeline(ProcessingPipeline):
     """Pipeline de seuillage"""
 
+    input_pixel_format = "gray"
+
     def __init__(self, threshold=127, threshold_type="binary"):
         super().__init__(
             blocks=[
                 GrayscaleBlock(),
                 ThresholdBlock(threshold, 255, threshold_type),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = f"Threshold ({threshold_type})"
@@ -105,12 +126,13 @@ class ThresholdPipeline(ProcessingPipeline):
 class HistogramEqualizationPipeline(ProcessingPipeline):
     """Pipeline d'égalisation d'histogramme"""
 
+    input_pixel_format = "gray"
+
     def __init__(self):
         super().__init__(
             blocks=[
                 GrayscaleBlock(),
                 HistogramEqualizationBlock(),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = "Histogram Equalization"
@@ -124,6 +146,8 @@ class HistogramEqualizationPipeline(ProcessingPipeline):
 class EdgeEnhancementPipeline(ProcessingPipeline):
     """Pipeline avancé: Flou + Détection de contours"""
 
+    input_pixel_format = "gray"
+
     def __init__(self, blur_kernel=5, canny_low=50, canny_high=150):
         # GaussianBlurBlock attend un tuple
         kernel = (
@@ -133,7 +157,6 @@ class EdgeEnhancementPipeline(ProcessingPipeline):
             blocks=[
                 GaussianBlurBlock(kernel, 0),
                 CannyEdgeBlock(canny_low, canny_high),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = "Edge Enhancement (Blur + Canny)"
@@ -142,93 +165,14 @@ class EdgeEnhancementPipeline(ProcessingPipeline):
 class MorphologyPipeline(ProcessingPipeline):
     """Pipeline de morphologie mathématique"""
 
+    input_pixel_format = "gray"
+
     def __init__(self, operation="opening", kernel_size=5):
         super().__init__(
             blocks=[
                 GrayscaleBlock(),
                 ThresholdBlock(127, 255, "binary"),
                 MorphologyBlock(operation, kernel_size),
-                ColorScaleBlock(),  # Conversion BGR pour affichage
             ]
         )
         self.name = f"Morphology ({operation})"
-
-
-# ============================================================================
-# FACTORY DE PIPELINES
-# ============================================================================
-
-AVAILABLE_PIPELINES = {
-    "passthrough": PassthroughPipeline,
-    "grayscale": GrayscalePipeline,
-    "edges": EdgeDetectionPipeline,
-    "blur": BlurPipeline,
-    "threshold": ThresholdPipeline,
-    "histogram": HistogramEqualizationPipeline,
-    "edge-enhance": EdgeEnhancementPipeline,
-    "morphology": MorphologyPipeline,
-    "drone-detection": DroneDetectionPipeline,
-}
-
-
-def create_pipeline(pipeline_name, **kwargs):
-    """
-    Crée un pipeline selon le nom ou retourne la pipeline si c'est déjà une instance.
-
-    Args:
-        pipeline_name: Nom du pipeline (str), instance de ProcessingPipeline,
-                      ou classe de pipeline
-        **kwargs: Arguments spécifiques au pipeline
-
-    Returns:
-        Instance du pipeline
-
-    Exemples:
-        >>> create_pipeline("grayscale")
-        >>> create_pipeline("edges", threshold1=100, threshold2=200)
-        >>> create_pipeline(EdgeDetectionPipeline(100, 200))
-        >>> create_pipeline(EdgeDetectionPipeline, threshold1=100, threshold2=200)
-    """
-    # Si c'est déjà une instance de ProcessingPipeline, la retourner
-    if isinstance(pipeline_name, ProcessingPipeline):
-        return pipeline_name
-
-    # Si c'est une classe, l'instancier
-    if isinstance(pipeline_name, type) and issubclass(
-        pipeline_name, ProcessingPipeline
-    ):
-        return pipeline_name(**kwargs)
-
-    # Si c'est un string, créer depuis AVAILABLE_PIPELINES
-    if isinstance(pipeline_name, str):
-        if pipeline_name not in AVAILABLE_PIPELINES:
-            available = ", ".join(AVAILABLE_PIPELINES.keys())
-            raise ValueError(
-                f"Pipeline '{pipeline_name}' inconnu. "
-                f"Pipelines disponibles: {available}"
-            )
-
-        pipeline_class = AVAILABLE_PIPELINES[pipeline_name]
-        return pipeline_class(**kwargs)
-
-    # Sinon erreur
-    raise TypeError(
-        f"pipeline_name doit être un str, une classe ou une instance de ProcessingPipeline, "
-        f"pas {type(pipeline_name)}"
-    )
-
-
-def list_pipelines():
-    """Retourne la liste des pipelines disponibles avec leurs descriptions"""
-    pipelines_info = []
-    for name, pipeline_class in AVAILABLE_PIPELINES.items():
-        # Créer une instance temporaire pour obtenir le nom
-        try:
-            instance = pipeline_class()
-            description = instance.name
-        except Exception:
-            description = pipeline_class.__doc__ or "No description"
-
-        pipelines_info.append((name, description))
-
-    return pipelines_info
@@ -5,14 +5,23 @@ from multiprocessing.pool import ThreadPool
 
 from ts341_project.pipeline.image_block import ProcessingBlock
 from ts341_project.ProcessingResult import ProcessingResult
+from ts341_project.LatencyHistogram import LatencyRecorder
 
 
 class ProcessingPipeline:
     """
     Pipeline qui enchaîne plusieurs briques de traitement.
     Support du multi-threading pour paralléliser certains traitements.
+
+    Les attributs de classe `input_width` / `input_pixel_format` décrivent
+    l'entrée dont le pipeline a besoin : un backend de lecture capable de
+    mettre à l'échelle au décodage (ffmpeg) les utilise directement.
     """
 
+    # Entrée attendue (None = résolution native) et format ('bgr24' ou 'gray')
+    input_width = None
+    input_pixel_format = "bgr24"
+
     def __init__(
         self,
         blocks: List[ProcessingBlock] = None,
@@ -29,6 +38,7 @@ class ProcessingPipeline:
         self.use_multicore = use_multicore
         self.num_workers = num_workers
         self.pool = None
+        self.timings = None  # LatencyRecorder si enable_timing()
 
         if self.use_multicore:
             self.pool = ThreadPool(processes=num_workers)
@@ -38,26 +48,68 @@ class ProcessingPipeline:
         self.blocks.append(block)
         return self
 
-    def process(self, frame: np.ndarray) -> ProcessingResult:
+    def enable_timing(self, recorder: LatencyRecorder = None) -> LatencyRecorder:
+        """
+        Active les histogrammes de durée par bloc (et par sous-étape des blocs
+        composites, ex: CustomDroneBlock).
+
+        Returns:
+            LatencyRecorder recevant les mesures
+        """
+        self.timings = recorder or LatencyRecorder()
+        seen = {}
+        for block in self.blocks:
+            name = type(block).__name__
+            seen[name] = seen.get(name, 0) + 1
+            if seen[name] > 1:
+                name = f"{name}#{seen[name]}"
+            block.enable_timing(self.timings, name)
+        return self.timings
+
+    def process(
+        self, frame: np.ndarray, pts: float = None, frame_number: int = None
+    ) -> ProcessingResult:
         """
         Traite une frame à travers tout le pipeline.
         Args:
             frame: Image d'entrée
+            pts: Horodatage source de la frame (secondes)
+            frame_number: Index source de la frame (1-based)
         Returns:
             ProcessingResult avec l'image traitée et les métadonnées
         """
         start_time = time.time()
-        result = ProcessingResult(frame=frame)
+        result = ProcessingResult(frame=frame, pts=pts, frame_number=frame_number)
 
         # Traitement séquentiel (les briques dépendent les unes des autres)
-        for block in self.blocks:
-            result = block.process(result.frame, result)
+        if self.timings is None:
+            for block in self.blocks:
+                result = block.process(result.frame, result)
+        else:
+            for block in self.blocks:
+                t = time.perf_counter()
+                result = block.process(result.frame, result)
+                self.timings.record(block.timing_name, time.perf_counter() - t)
 
         result.processing_time = time.time() - start_time
+        if self.timings is not None:
+            self.timings.record("pipeline", result.processing_time)
         return result
 
-    def __call__(self, frame: np.ndarray) -> ProcessingResult:
-        return self.process(frame)
+    def __call__(
+        self, frame: np.ndarray, pts: float = None, frame_number: int = None
+    ) -> ProcessingResult:
+        return self.process(frame, pts, frame_number)
+
+    def reset(self):
+        """Remet à zéro l'état des briques avant une nouvelle vidéo (pipeline réutilisé)"""
+        for block in self.blocks:
+            block.reset()
+
+    def close(self):
+        """Ferme les ressources des briques (enregistreurs de debug, etc.)"""
+        for block in self.blocks:
+            block.close()
 
     def __del__(self):
         if hasattr(self, "pool") and self.pool:
@@ -1,27 +1,63 @@
 """
 Module pipeline pour le traitement de flux vidéo
+
+L'import du paquet ne charge que le registre (métadonnées des pipelines) ; les
+classes de pipeline, les blocs et OpenCV sont importés au premier accès (PEP 562).
 """
 
-from .ProcessingPipeline import ProcessingPipeline
-from .Pipelines import (
+import importlib
+
+from .PipelineRegistry import (
+    AVAILABLE_PIPELINES,
+    PIPELINE_SPECS,
+    PipelineConfig,
+    PipelineSpec,
     create_pipeline,
+    get_spec,
     list_pipelines,
-    AVAILABLE_PIPELINES,
-    PassthroughPipeline,
-    GrayscalePipeline,
-    EdgeDetectionPipeline,
-    BlurPipeline,
-    ThresholdPipeline,
-    HistogramEqualizationPipeline,
-    EdgeEnhancementPipeline,
-    MorphologyPipeline,
+    named_pipelines,
+    register_pipeline,
 )
 
+# Attributs importés à la demande : nom -> sous-module
+_LAZY_ATTRIBUTES = {
+    "ProcessingPipeline": ".ProcessingPipeline",
+    "PassthroughPipeline": ".Pipelines",
+    "GrayscalePipeline": ".Pipelines",
+    "EdgeDetectionPipeline": ".Pipelines",
+    "BlurPipeline": ".Pipelines",
+    "ThresholdPipeline": ".Pipelines",
+    "HistogramEqualizationPipeline": ".Pipelines",
+    "EdgeEnhancementPipeline": ".Pipelines",
+    "MorphologyPipeline": ".Pipelines",
+    "DroneDetectionPipeline": ".Pipelines",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     "ProcessingPipeline",
     "create_pipeline",
     "list_pipelines",
     "AVAILABLE_PIPELINES",
+    "PIPELINE_SPECS",
+    "PipelineConfig",
+    "PipelineSpec",
+    "get_spec",
+    "register_pipeline",
+    "named_pipelines",
     "PassthroughPipeline",
     "GrayscalePipeline",
     "EdgeDetectionPipeline",
@@ -30,5 +66,5 @@ __all__ = [
     "HistogramEqualizationPipeline",
     "EdgeEnhancementPipeline",
     "MorphologyPipeline",
-    "DualDisplayPipeline",
+    "DroneDetectionPipeline",
 ]
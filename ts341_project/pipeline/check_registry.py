@@ -0,0 +1,116 @@
+"""
+check_registry - Vérifications du registre des pipelines
+
+- Les métadonnées du registre (format d'entrée, paramètres, description)
+  correspondent aux classes (description = `.name` d'une instance par défaut).
+- `import ts341_project.pipeline` + list_pipelines() reste sous un budget de
+  temps et ne charge ni OpenCV, ni numpy, ni les classes de pipeline.
+
+Usage:
+    python -m ts341_project.pipeline.check_registry [--budget-ms 100]
+"""
+
+import argparse
+import inspect
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from ts341_project.pipeline.PipelineRegistry import PIPELINE_SPECS, list_pipelines
+
+# Modules lourds qu'un import du paquet pipeline ne doit pas charger
+HEAVY_MODULES = ("cv2", "numpy", "ts341_project.pipeline.Pipelines")
+
+
+def verify_specs() -> List[str]:
+    """
+    Compare les métadonnées du registre aux classes (import de toutes les
+    classes, instanciation avec les paramètres par défaut).
+    """
+    problems = []
+    for name, spec in PIPELINE_SPECS.items():
+        try:
+            cls = spec.load()
+        except (ImportError, AttributeError) as e:
+            problems.append(f"{name}: classe introuvable ({spec.target}: {e})")
+            continue
+
+        if (cls.input_width, cls.input_pixel_format) != (
+            spec.input_width,
+            spec.input_pixel_format,
+        ):
+            problems.append(
+                f"{name}: format d'entrée {spec.input_width}/{spec.input_pixel_format} "
+                f"!= classe {cls.input_width}/{cls.input_pixel_format}"
+            )
+
+        defaults = {
+            param.name: param.default
+            for param in list(inspect.signature(cls.__init__).parameters.values())[1:]
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+        }
+        if defaults != spec.params:
+            problems.append(f"{name}: paramètres {spec.params} != classe {defaults}")
+            continue
+
+        # La description du registre recopie le nom affiché par l'instance
+        instance_name = spec.create(**spec.params).name
+        if instance_name != spec.description:
+            problems.append(
+                f"{name}: description '{spec.description}' != nom de l'instance '{instance_name}'"
+            )
+    return problems
+
+
+def check_import_budget(
+    module: str = "ts341_project.pipeline", budget_ms: float = 100.0
+) -> List[str]:
+    """
+    Importe `module` et liste les pipelines dans un interpréteur neuf.
+
+    Returns:
+        Problèmes détectés : budget de temps dépassé, module lourd chargé
+    """
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        f"{module}.list_pipelines()\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    root = str(Path(__file__).resolve().parents[2])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    ).stdout.splitlines()
+
+    elapsed_ms, modules = float(output[0]), set(output[1].split())
+    problems = [f"{name} importé par '{module}'" for name in HEAVY_MODULES if name in modules]
+    if elapsed_ms > budget_ms:
+        problems.append(f"Import de '{module}': {elapsed_ms:.1f} ms > budget {budget_ms:.0f} ms")
+    print(f"Import de '{module}' + list_pipelines(): {elapsed_ms:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifications du registre des pipelines")
+    parser.add_argument(
+        "--budget-ms", type=float, default=100.0, help="Budget d'import (ms, défaut: 100)"
+    )
+    args = parser.parse_args()
+
+    for name, description in list_pipelines():
+        print(f"  {name:16s} {description}")
+    # Budget mesuré avant verify_specs (qui importe toutes les classes ici)
+    problems = check_import_budget(budget_ms=args.budget_ms) + verify_specs()
+    for problem in problems:
+        print(f"ERREUR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
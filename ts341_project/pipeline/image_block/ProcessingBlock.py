@@ -1,3 +1,4 @@
+import time
 import numpy as np
 from abc import ABC, abstractmethod
 
@@ -10,6 +11,10 @@ class ProcessingBlock(ABC):
     Retourne maintenant un ProcessingResult avec l'image et les métadonnées.
     """
 
+    # Mesure des sous-étapes (désactivée par défaut) : LatencyRecorder + préfixe
+    timings = None
+    timing_name = None
+
     @abstractmethod
     def process(
         self, frame: np.ndarray, result: ProcessingResult = None
@@ -24,6 +29,37 @@ class ProcessingBlock(ABC):
         """
         pass
 
+    def enable_timing(self, recorder, name: str = None):
+        """
+        Active la mesure des sous-étapes du bloc.
+
+        Args:
+            recorder: LatencyRecorder qui reçoit les durées ('<name>.<étape>')
+            name: Préfixe des mesures (défaut: nom de la classe)
+        """
+        self.timings = recorder
+        self.timing_name = name or type(self).__name__
+
+    def _tick(self, step: str = None, start: float = 0.0) -> float:
+        """
+        Horodatage d'une sous-étape : enregistre la durée de `step` depuis
+        `start` et retourne l'instant courant (0 si la mesure est désactivée).
+        """
+        if self.timings is None:
+            return 0.0
+        now = time.perf_counter()
+        if step is not None:
+            self.timings.record(f"{self.timing_name}.{step}", now - start)
+        return now
+
+    def reset(self):
+        """Remet à zéro l'état propre à une vidéo (entre deux jobs). Par défaut: rien."""
+        pass
+
+    def close(self):
+        """Libère les ressources du bloc (fichiers, enregistreurs...). Par défaut: rien."""
+        pass
+
     def __call__(
         self, frame: np.ndarray, result: ProcessingResult = None
     ) -> ProcessingResult:
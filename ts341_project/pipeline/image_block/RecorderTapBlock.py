@@ -0,0 +1,50 @@
+import numpy as np
+
+from ts341_project.debug.StreamRecorder import StreamRecorder
+from ts341_project.pipeline.image_block.ProcessingBlock import ProcessingBlock
+from ts341_project.ProcessingResult import ProcessingResult
+
+
+class RecorderTapBlock(ProcessingBlock):
+    """Enregistre une couche intermédiaire dans un fichier .tsrec sans modifier le résultat.
+
+    Par défaut la frame courante est enregistrée ; avec `metadata_key`, c'est
+    la couche `result.scratch[metadata_key]` (ex: 'fg_mask'), ou à défaut
+    `result.metadata[metadata_key]`, qui est enregistrée.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        kind: str = "mask",
+        metadata_key: str = None,
+        chunk_frames: int = 64,
+    ):
+        """
+        Args:
+            path: Fichier de sortie (.tsrec)
+            kind: 'mask' (binaire) ou 'gray' (sans perte)
+            metadata_key: Clé de metadata à enregistrer au lieu de la frame
+            chunk_frames: Nombre de frames par chunk
+        """
+        self.metadata_key = metadata_key
+        self.recorder = StreamRecorder(path, kind=kind, chunk_frames=chunk_frames)
+
+    def process(
+        self, frame: np.ndarray, result: ProcessingResult = None
+    ) -> ProcessingResult:
+        if result is None:
+            result = ProcessingResult(frame=frame)
+
+        if self.metadata_key is None:
+            layer = frame
+        else:
+            layer = result.scratch.get(
+                self.metadata_key, result.metadata.get(self.metadata_key)
+            )
+        if layer is not None:
+            self.recorder.write(layer, result.frame_number)
+        return result
+
+    def close(self):
+        self.recorder.close()
@@ -11,6 +11,7 @@ from .ColorFilterBlock import ColorFilterBlock
 from .ColorScaleBlock import ColorScaleBlock
 from .MorphologyBlock import MorphologyBlock
 from .ThresholdBlock import ThresholdBlock
+from .RecorderTapBlock import RecorderTapBlock
 
 __all__ = [
     "ProcessingBlock",
@@ -22,4 +23,5 @@ __all__ = [
     "ColorScaleBlock",
     "MorphologyBlock",
     "ThresholdBlock",
+    "RecorderTapBlock",
 ]
@@ -28,10 +28,23 @@ class BackgroundSubtractorBlock(StatefulProcessingBlock):
         """
         super().__init__(preprocessing=preprocessing, postprocessing=postprocessing)
 
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=history, varThreshold=var_threshold, detectShadows=detect_shadows
+        self.history = history
+        self.var_threshold = var_threshold
+        self.detect_shadows = detect_shadows
+        self.bg_subtractor = self._create_subtractor()
+
+    def _create_subtractor(self):
+        return cv2.createBackgroundSubtractorMOG2(
+            history=self.history,
+            varThreshold=self.var_threshold,
+            detectShadows=self.detect_shadows,
         )
 
+    def reset(self):
+        """Nouveau modèle de fond (le fond appris appartient à la vidéo précédente)"""
+        super().reset()
+        self.bg_subtractor = self._create_subtractor()
+
     def process_with_memory(
         self, frame: np.ndarray, result: ProcessingResult
     ) -> ProcessingResult:
@@ -5,14 +5,16 @@ from pathlib import Path
 from ts341_project.pipeline.image_block.ProcessingBlock import ProcessingBlock
 from ts341_project.ProcessingResult import ProcessingResult
 from ts341_project.pipeline.image_block.ORBMatchingBlock import ORBMatchingBlock
+from ts341_project.ResultSchema import detection_label
 
 
 class ContourMatchingBlock(ProcessingBlock):
-    """Détecte les contours sur un masque fourni dans `result.metadata['fg_mask']`,
+    """Détecte les contours sur un masque fourni dans `result.scratch['fg_mask']`,
     réalise le matching ORB avec des patterns et dessine les boîtes/labels sur la frame.
 
     Ce bloc attend que `result.frame` soit la frame couleur (BGR) sur laquelle dessiner
-    et que `result.metadata['fg_mask']` contienne le masque binaire des régions en mouvement.
+    et que `result.scratch['fg_mask']` contienne le masque binaire des régions en mouvement
+    (`result.metadata['fg_mask']` est encore accepté pour compatibilité).
     """
 
     def __init__(
@@ -36,13 +38,16 @@ class ContourMatchingBlock(ProcessingBlock):
         if result is None:
             result = ProcessingResult(frame=frame)
 
-        # On s'attend à trouver le masque dans result.metadata
-        fg_mask = result.metadata.get("fg_mask")
+        # On s'attend à trouver le masque dans result.scratch
+        fg_mask = result.scratch.get("fg_mask", result.metadata.get("fg_mask"))
         if fg_mask is None:
             # Rien à faire
             result.metadata.setdefault("drone_detections", [])
             return result
 
+        t = self._tick()
+        orb_time = 0.0
+
         # Trouver les contours sur le masque
         contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
@@ -59,13 +64,15 @@ class ContourMatchingBlock(ProcessingBlock):
             roi_small = cv2.resize(roi_gray, self.roi_size)
 
             # Use ORBMatchingBlock to test the ROI
+            t_orb = self._tick()
             orb_result = self.orb_block.process(roi_small)
+            orb_time += self._tick() - t_orb
             orb_meta = orb_result.metadata.get("orb_match", {"match_found": False, "num_matches": 0})
             match_found = orb_meta.get("match_found", False)
             num_matches = orb_meta.get("num_matches", 0)
 
             color = (0, 0, 255) if match_found else (0, 255, 0)
-            label = f"Drone détecté ({num_matches})" if match_found else "Poss. Drone"
+            label = detection_label(match_found, num_matches)
 
             cv2.rectangle(result.frame, (x, y), (x + w, y + h), color, 2)
             cv2.putText(result.frame, label, (x, y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
@@ -118,4 +125,10 @@ class ContourMatchingBlock(ProcessingBlock):
             h = result.frame.shape[0]
             cv2.putText(result.frame, text, (10, h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
+        # Contours (ORB exclu) et ORB cumulé sur les ROI de la frame
+        if self.timings is not None:
+            self.timings.record(
+                f"{self.timing_name}.contours", self._tick() - t - orb_time
+            )
+            self.timings.record(f"{self.timing_name}.orb", orb_time)
         return result
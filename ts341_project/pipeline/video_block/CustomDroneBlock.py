@@ -18,6 +18,7 @@ from ts341_project.pipeline.video_block.BackgroundSubtractorBlock import (
     BackgroundSubtractorBlock,
 )
 from ts341_project.pipeline.video_block.ContourMatchingBlock import ContourMatchingBlock
+from ts341_project.debug.StreamRecorder import StreamRecorder
 
 
 class CustomDroneBlock(StatefulProcessingBlock):
@@ -37,6 +38,7 @@ class CustomDroneBlock(StatefulProcessingBlock):
         orb_n_features: int = 300,  # keypoints
         min_contour_size: int = 5,  # ignorer petits objets
         resize_width: int = 1280,  # Frame traitée forcée à largeur 1280
+        mask_record_path: str = None,
     ):
         """
         Args:
@@ -46,6 +48,7 @@ class CustomDroneBlock(StatefulProcessingBlock):
             mog2_var_threshold: Seuil de variance pour MOG2
             orb_n_features: Nombre de features ORB à détecter
             min_contour_size: Taille minimale des contours à analyser
+            mask_record_path: Fichier .tsrec optionnel où enregistrer le masque MOG2 nettoyé
         """
         # IMPORTANT: désactiver le preprocessing par défaut; on définit notre pipeline
         # de prétraitement en sous-blocs (Resize, éventuellement Gray si nécessaire)
@@ -81,6 +84,11 @@ class CustomDroneBlock(StatefulProcessingBlock):
         # Bloc de post-traitement pour afficher les métadonnées
         self.metadata_overlay = MetadataOverlayBlock(font_scale=0.7, thickness=2)
 
+        # Enregistrement optionnel du masque (debug / réglage des paramètres)
+        self.mask_recorder = (
+            StreamRecorder(mask_record_path, kind="mask") if mask_record_path else None
+        )
+
     def _load_patterns(self, pattern_dir: str):
         """Charge les patterns de drone pour le matching ORB (lecture en gray, resize 128x128)"""
         pattern_path = Path(pattern_dir)
@@ -99,6 +107,24 @@ class CustomDroneBlock(StatefulProcessingBlock):
             # pattern loading moved to ContourMatchingBlock
             pass
 
+    def enable_timing(self, recorder, name: str = None):
+        """Mesure resize, MOG2, morphologie, contours, ORB et overlay"""
+        super().enable_timing(recorder, name)
+        # Contours et ORB mesurés par le bloc de contours, sous le même préfixe
+        self.contour_block.enable_timing(recorder, self.timing_name)
+
+    def reset(self):
+        """Oublie le fond MOG2 ; les patterns et l'ORB restent chargés."""
+        super().reset()
+        self.bg_block.reset()
+        self.contour_block.reset()
+
+    def close(self):
+        """Ferme l'enregistreur de masque s'il est actif."""
+        super().close()
+        if self.mask_recorder is not None:
+            self.mask_recorder.close()
+
     def process_with_memory(
         self, frame: np.ndarray, result: ProcessingResult
     ) -> ProcessingResult:
@@ -115,6 +141,8 @@ class CustomDroneBlock(StatefulProcessingBlock):
         # 1) Resize a été appliqué en preprocessing via StatefulProcessingBlock
         # `frame` ici est déjà redimensionné si ResizeBlock était dans preprocessing
 
+        t = self._tick()
+
         # Travailler sur une copie couleur pour annotation
         color_frame = frame.copy()
 
@@ -124,6 +152,7 @@ class CustomDroneBlock(StatefulProcessingBlock):
         # 2) Soustraction de fond via BackgroundSubtractorBlock
         bg_result = self.bg_block.process(color_frame)
         fg_mask = bg_result.frame
+        t = self._tick("mog2", t)
 
         # 3) Nettoyage du masque: seuillage + morphologie (ouverture + fermeture)
         fg_mask = (
@@ -141,15 +170,21 @@ class CustomDroneBlock(StatefulProcessingBlock):
             .process(fg_mask)
             .frame
         )
+        self._tick("morphology", t)
 
-        # Stocker le masque dans les metadata pour que le bloc de contours y accède
-        result.metadata["fg_mask"] = fg_mask
+        # Stocker le masque dans le scratch pour que le bloc de contours y accède
+        # (donnée interne, jamais envoyée aux consommateurs)
+        result.scratch["fg_mask"] = fg_mask
+        if self.mask_recorder is not None:
+            self.mask_recorder.write(fg_mask, result.frame_number)
 
         # Déléguer l'étape finale (contours + matching + annotation) au nouveau bloc
         result.frame = color_frame
         result = self.contour_block.process(result.frame, result)
 
         # 4) Post-traitement: afficher les métadonnées sur la frame
+        t = self._tick()
         result = self.metadata_overlay.process(result.frame, result)
+        self._tick("overlay", t)
 
         return result
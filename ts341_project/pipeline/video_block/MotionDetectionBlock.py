@@ -38,6 +38,11 @@ class MotionDetectionBlock(StatefulProcessingBlock):
         self.min_area = min_area
         self.draw_boxes = draw_boxes
 
+    def reset(self):
+        """Oublie la frame précédente"""
+        super().reset()
+        self.previous_frame = None
+
     def process_with_memory(
         self, frame: np.ndarray, result: ProcessingResult
     ) -> ProcessingResult:
@@ -63,10 +63,22 @@ class StatefulProcessingBlock(ProcessingBlock):
         """
         result_frame = frame
         for block in blocks:
+            t = self._tick()
             temp_result = block.process(result_frame)
             result_frame = temp_result.frame
+            self._tick(type(block).__name__, t)
         return result_frame
 
+    def reset(self):
+        """Remet à zéro les briques de pré/post-traitement (les sous-classes oublient leur mémoire)."""
+        for block in self.preprocessing + self.postprocessing:
+            block.reset()
+
+    def close(self):
+        """Ferme les briques de pré/post-traitement."""
+        for block in self.preprocessing + self.postprocessing:
+            block.close()
+
     @abstractmethod
     def process_with_memory(
         self, frame: np.ndarray, result: ProcessingResult
@@ -0,0 +1,278 @@
+"""
+FFmpegCapture - Décodage vidéo via un processus ffmpeg
+
+Lance `ffmpeg` (décodage multi-thread + filtres scale/format) et lit les frames
+rawvideo directement depuis le pipe dans des tableaux NumPy. Expose la même
+interface que cv2.VideoCapture (isOpened, read, grab, get, set, release).
+
+Avec un pas (`stride`), la sélection est faite dans ffmpeg (filtre select,
+avant scale/format) : les frames sautées sont décodées (dépendances entre
+frames) mais ni converties ni transférées dans le pipe.
+"""
+
+import json
+import shutil
+import subprocess
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Formats de sortie supportés -> nombre de canaux
+PIXEL_FORMATS = {"bgr24": 3, "gray": 1}
+
+
+def _probe(source: str) -> Optional[dict]:
+    """Propriétés du premier flux vidéo via ffprobe (None si indisponible)."""
+    if shutil.which("ffprobe") is None:
+        return None
+
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=width,height,r_frame_rate,avg_frame_rate,nb_frames",
+        "-of",
+        "json",
+        str(source),
+    ]
+    try:
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        streams = json.loads(res.stdout).get("streams", [])
+    except (OSError, ValueError):
+        return None
+    if res.returncode != 0 or not streams:
+        return None
+
+    stream = streams[0]
+
+    def _rate(value: str) -> float:
+        num, _, den = (value or "0/1").partition("/")
+        try:
+            return float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            return 0.0
+
+    nb_frames = stream.get("nb_frames", "0")
+    return {
+        "width": int(stream["width"]),
+        "height": int(stream["height"]),
+        "fps": _rate(stream.get("avg_frame_rate")) or _rate(stream.get("r_frame_rate")),
+        "frame_count": int(nb_frames) if str(nb_frames).isdigit() else 0,
+    }
+
+
+def _probe_opencv(source: str) -> Optional[dict]:
+    """Repli si ffprobe est absent : propriétés lues par OpenCV."""
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        return None
+    info = {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+    }
+    cap.release()
+    return info
+
+
+class FFmpegCapture:
+    """
+    Capture vidéo par pipe ffmpeg avec mise à l'échelle au décodage.
+
+    Le processus ffmpeg n'est lancé qu'à la première lecture : construire
+    l'objet pour lire les propriétés ne coûte qu'un ffprobe.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        width: int = None,
+        pixel_format: str = "bgr24",
+        threads: int = 0,
+        stride: int = 1,
+    ):
+        """
+        Args:
+            source: Chemin (ou URL) de la vidéo
+            width: Largeur de sortie (hauteur calculée, paire), None = native
+            pixel_format: 'bgr24' (3 canaux) ou 'gray' (gray8, 1 canal)
+            threads: Threads de décodage ffmpeg (0 = automatique)
+            stride: Une frame sur `stride` livrée par read(), comptée à partir
+                    de la position de lecture (début ou seek) ; la position
+                    (CAP_PROP_POS_FRAMES) reste un index de frame source
+        """
+        if pixel_format not in PIXEL_FORMATS:
+            raise ValueError(
+                f"Format de pixel non supporté: {pixel_format} ({', '.join(PIXEL_FORMATS)})"
+            )
+
+        self.source = str(source)
+        self.pixel_format = pixel_format
+        self.channels = PIXEL_FORMATS[pixel_format]
+        self.threads = threads
+        self.stride = max(1, int(stride))
+
+        self._proc = None
+        self._position = 0
+        self._seek_time = 0.0
+        self._scratch = None
+        self._opened = shutil.which("ffmpeg") is not None
+
+        info = (_probe(self.source) or _probe_opencv(self.source)) if self._opened else None
+        if info is None or info["width"] <= 0:
+            self._opened = False
+            info = {"width": 0, "height": 0, "fps": 0.0, "frame_count": 0}
+
+        self.source_width = info["width"]
+        self.source_height = info["height"]
+        self.fps = info["fps"]
+        self.frame_count = info["frame_count"]
+
+        # Même arrondi que le filtre scale=W:-2 (hauteur paire)
+        if width and self.source_width:
+            self.width = int(width)
+            self.height = int(round(self.source_height * width / self.source_width / 2)) * 2
+        else:
+            self.width, self.height = self.source_width, self.source_height
+
+        self.frame_shape = (
+            (self.height, self.width)
+            if self.channels == 1
+            else (self.height, self.width, self.channels)
+        )
+        self.frame_bytes = self.width * self.height * self.channels
+
+    def _command(self) -> list:
+        filters = []
+        if self.stride > 1:
+            # Avant scale/format : les frames écartées ne sont pas converties
+            filters.append(f"select=not(mod(n\\,{self.stride}))")
+        if (self.width, self.height) != (self.source_width, self.source_height):
+            filters.append(f"scale={self.width}:{self.height}:flags=area")
+        filters.append(f"format={self.pixel_format}")
+
+        # -ss avant -i : seek au keyframe précédent puis décodage jusqu'à la cible
+        seek = ["-ss", f"{self._seek_time:.3f}"] if self._seek_time > 0 else []
+        # Pas de duplication de frames pour combler les trous du select
+        vsync = ["-vsync", "passthrough"] if self.stride > 1 else []
+
+        return [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostdin",
+            "-threads",
+            str(self.threads),
+            *seek,
+            "-i",
+            self.source,
+            "-vf",
+            ",".join(filters),
+            *vsync,
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            self.pixel_format,
+            "-",
+        ]
+
+    def _ensure_started(self):
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                self._command(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=self.frame_bytes,
+            )
+
+    def _read_into(self, buffer: memoryview) -> bool:
+        """Remplit entièrement le buffer depuis le pipe (False en fin de flux)."""
+        self._ensure_started()
+        filled = 0
+        while filled < len(buffer):
+            n = self._proc.stdout.readinto(buffer[filled:])
+            if not n:
+                return False
+            filled += n
+        self._position += self.stride
+        return True
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, out: np.ndarray = None):
+        """
+        Lit la frame suivante.
+
+        Args:
+            out: Buffer préalloué (frame_shape, uint8) à remplir. Par défaut un
+                 nouveau tableau est alloué : les frames partent dans une
+                 multiprocessing.Queue qui les sérialise en différé, un buffer
+                 réutilisé serait écrasé avant d'être envoyé.
+
+        Returns:
+            (ret, frame) comme cv2.VideoCapture.read
+        """
+        if not self._opened:
+            return False, None
+        frame = out if out is not None else np.empty(self.frame_shape, dtype=np.uint8)
+        if not self._read_into(memoryview(frame).cast("B")):
+            return False, None
+        return True, frame
+
+    def grab(self) -> bool:
+        """Avance d'une frame livrée (de `stride` frames source) sans la convertir en tableau."""
+        if not self._opened:
+            return False
+        if self._scratch is None:
+            self._scratch = bytearray(self.frame_bytes)
+        return self._read_into(memoryview(self._scratch))
+
+    def get(self, prop: int) -> float:
+        """Sous-ensemble des propriétés cv2.CAP_PROP_*"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return 1000.0 * self._position / self.fps if self.fps else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """Seek (CAP_PROP_POS_FRAMES / CAP_PROP_POS_MSEC) : relance ffmpeg avec -ss."""
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            if not self.fps:
+                return False
+            prop, value = cv2.CAP_PROP_POS_FRAMES, value * self.fps / 1000.0
+        if prop != cv2.CAP_PROP_POS_FRAMES or not self.fps:
+            return False
+
+        self._stop_process()
+        self._position = int(value)
+        self._seek_time = self._position / self.fps
+        return True
+
+    def release(self):
+        self._stop_process()
+
+    def _stop_process(self):
+        if self._proc is not None:
+            self._proc.stdout.close()
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
@@ -0,0 +1,284 @@
+"""
+FrameCache - Cache des frames décodées (fichier brut memory-mappé)
+
+Au premier passage, les frames décodées (éventuellement réduites / en niveaux
+de gris) sont écrites dans un fichier brut précédé d'un petit en-tête. Les
+passages suivants lisent des vues directes du memmap, sans décodage : utile
+pour les balayages de paramètres sur le même clip.
+
+Format (.frames) :
+    En-tête 64 octets : magic 'TSFRM1', version, canaux, largeur, hauteur, fps,
+    nombre de frames. Puis les frames uint8 contiguës (H x W [x C]).
+
+La clé du cache combine le chemin, la taille, la date de modification et le
+début du fichier source, ainsi que la largeur et le format de décodage.
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+from pathlib import Path
+from typing import Union
+
+import cv2
+import numpy as np
+
+from ts341_project.logging_utils import get_logger
+from .FFmpegCapture import PIXEL_FORMATS
+
+CACHE_MAGIC = b"TSFRM1\x00\x00"
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".frames"
+HEADER_SIZE = 64
+
+# magic, version, canaux, largeur, hauteur, fps, nombre de frames
+_HEADER = struct.Struct("<8sHBxIIdQ")
+
+
+def default_cache_dir() -> Path:
+    """~/.cache/ts341/frames (ou $XDG_CACHE_HOME/ts341/frames)"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ts341" / "frames"
+
+
+def cache_key(source: Union[str, Path], width: int = None, pixel_format: str = "bgr24") -> str:
+    """Empreinte de la source et des réglages de décodage"""
+    path = Path(source).resolve()
+    stat = path.stat()
+
+    digest = hashlib.sha1()
+    digest.update(str(path).encode())
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(1 << 20))
+    digest.update(f"{width}:{pixel_format}:{CACHE_VERSION}".encode())
+    return digest.hexdigest()[:20]
+
+
+def cache_path(
+    source: Union[str, Path],
+    cache_dir: Union[str, Path],
+    width: int = None,
+    pixel_format: str = "bgr24",
+) -> Path:
+    """Chemin du fichier cache d'une source"""
+    key = cache_key(source, width, pixel_format)
+    return Path(cache_dir) / f"{Path(source).stem}-{key}{CACHE_SUFFIX}"
+
+
+class CachedCapture:
+    """
+    Lecture d'un cache de frames : read() retourne une vue du memmap.
+
+    Le memmap est ouvert en copy-on-write ('c') : un bloc qui dessine sur la
+    frame ne modifie pas le fichier.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"Cache tronqué: {self.path}")
+
+        magic, version, channels, width, height, fps, count = _HEADER.unpack_from(header)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError(f"Cache invalide: {self.path}")
+
+        self.width, self.height, self.channels = width, height, channels
+        self.source_width, self.source_height = width, height
+        self.fps = fps
+        self.frame_count = count
+        self.frame_shape = (height, width) if channels == 1 else (height, width, channels)
+
+        self.frames = np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode="c",
+            offset=HEADER_SIZE,
+            shape=(count,) + self.frame_shape,
+        )
+        self._position = 0
+
+    def isOpened(self) -> bool:
+        return self.frame_count > 0
+
+    def read(self):
+        if self._position >= self.frame_count:
+            return False, None
+        frame = self.frames[self._position]
+        self._position += 1
+        return True, frame
+
+    def grab(self) -> bool:
+        if self._position >= self.frame_count:
+            return False
+        self._position += 1
+        return True
+
+    def get(self, prop: int) -> float:
+        """Sous-ensemble des propriétés cv2.CAP_PROP_*"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return 1000.0 * self._position / self.fps if self.fps else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """Seek direct (accès aléatoire)"""
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            prop, value = cv2.CAP_PROP_POS_FRAMES, value * self.fps / 1000.0
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self._position = min(max(0, int(value)), self.frame_count)
+        return True
+
+    def release(self):
+        self.frames = None
+
+
+class CachingCapture:
+    """
+    Enveloppe d'une capture qui écrit les frames décodées dans le cache.
+
+    Le cache n'est conservé que pour un décodage complet et séquentiel
+    (depuis la première frame, sans seek ni grab) ; sinon le fichier
+    temporaire est supprimé à release().
+    """
+
+    def __init__(
+        self,
+        capture,
+        path: Union[str, Path],
+        width: int = None,
+        pixel_format: str = "bgr24",
+    ):
+        """
+        Args:
+            capture: Capture sous-jacente (interface cv2.VideoCapture)
+            path: Fichier cache final
+            width: Largeur des frames mises en cache (pas d'agrandissement)
+            pixel_format: 'bgr24' ou 'gray'
+        """
+        self.capture = capture
+        self.path = Path(path)
+        self.pixel_format = pixel_format
+        self.channels = PIXEL_FORMATS[pixel_format]
+        self.logger = get_logger(__name__)
+
+        source_width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        source_height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width and 0 < width < source_width:
+            self.width = int(width)
+            self.height = int(round(source_height * width / source_width / 2)) * 2
+        else:
+            self.width, self.height = source_width, source_height
+        self.source_width, self.source_height = self.width, self.height
+        self.frame_bytes = self.width * self.height * self.channels
+
+        self._file = None
+        self._tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.part")
+        self._count = 0
+        self._position = 0
+        self._abandoned = False
+
+    def _open(self):
+        """Ouvre le fichier temporaire au premier read() (si l'espace disque suffit)"""
+        frame_count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        needed = max(0, frame_count) * self.frame_bytes
+        free = shutil.disk_usage(self.path.parent).free
+        if needed > free:
+            self.logger.warning(
+                f"Cache désactivé: {needed / 1e9:.1f} Go nécessaires, {free / 1e9:.1f} Go libres"
+            )
+            self._abandoned = True
+            return
+
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(bytes(HEADER_SIZE))
+
+    def _abandon(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._tmp_path.unlink(missing_ok=True)
+        self._abandoned = True
+
+    def _finalize(self):
+        """Écrit l'en-tête définitif et publie le cache (renommage atomique)"""
+        header = _HEADER.pack(
+            CACHE_MAGIC,
+            CACHE_VERSION,
+            self.channels,
+            self.width,
+            self.height,
+            float(self.capture.get(cv2.CAP_PROP_FPS) or 0.0),
+            self._count,
+        )
+        self._file.seek(0)
+        self._file.write(header.ljust(HEADER_SIZE, b"\x00"))
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+        self.logger.info(f"Cache écrit: {self.path} ({self._count} frames)")
+
+    def _convert(self, frame: np.ndarray) -> np.ndarray:
+        """Met la frame au format du cache (si le backend ne l'a pas déjà fait)"""
+        if self.channels == 1 and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        elif self.channels == 3 and frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        if frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return np.ascontiguousarray(frame)
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self):
+        if self._position == 0 and self._file is None and not self._abandoned:
+            self._open()
+
+        ret, frame = self.capture.read()
+        if not ret:
+            if self._file is not None and self._count > 0:
+                self._finalize()
+            return False, None
+
+        frame = self._convert(frame)
+        self._position += 1
+        if self._file is not None:
+            self._file.write(frame.data)
+            self._count += 1
+        return True, frame
+
+    def grab(self) -> bool:
+        # Frame non décodée : le cache serait incomplet
+        self._abandon()
+        self._position += 1
+        return self.capture.grab()
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return self.capture.get(prop)
+
+    def set(self, prop: int, value: float) -> bool:
+        self._abandon()
+        return self.capture.set(prop, value)
+
+    def release(self):
+        self._abandon()
+        self.capture.release()
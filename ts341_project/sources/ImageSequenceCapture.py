@@ -0,0 +1,225 @@
+"""
+ImageSequenceCapture - Séquence d'images (dossier de dataset) comme source vidéo
+
+Accepte un dossier, un motif glob (`dataset/*.png`) ou un fichier index
+(.txt / .lst, un chemin par ligne, relatif au fichier index). Les images sont
+décodées par un pool de threads (cv2.imread relâche le GIL) avec lecture
+anticipée, et livrées dans l'ordre. Expose l'interface de cv2.VideoCapture.
+
+Limites : la cadence est attribuée (`fps`, aucun horodatage lu dans les
+fichiers) ; les images de taille différente de la première sont
+redimensionnées ; les images illisibles sont sautées (comptées dans
+`unreadable`) ; grab() n'annule que les décodages pas encore commencés ;
+jusqu'à `prefetch` images décodées restent en mémoire.
+"""
+
+import glob
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import cv2
+import numpy as np
+
+from .FFmpegCapture import PIXEL_FORMATS
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp", ".pgm", ".ppm")
+INDEX_EXTENSIONS = (".txt", ".lst")
+
+
+def _natural_key(path: str) -> list:
+    """Tri naturel : frame_2.png avant frame_10.png"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path)]
+
+
+def is_image_sequence(source) -> bool:
+    """True si la source désigne une séquence d'images (dossier, glob ou index)"""
+    if not isinstance(source, (str, Path)):
+        return False
+    path = Path(source)
+    # Chemin existant (éventuellement avec '[' ou '*' dans son nom) avant motif glob
+    if path.exists():
+        return path.is_dir() or (path.is_file() and path.suffix.lower() in INDEX_EXTENSIONS)
+    return glob.has_magic(str(source))
+
+
+def list_images(source: str) -> List[str]:
+    """Résout une source de séquence en liste ordonnée de fichiers image"""
+    path = Path(source)
+
+    if path.is_file() and path.suffix.lower() in INDEX_EXTENSIONS:
+        # Fichier index : ordre du fichier, chemins relatifs à l'index
+        files = []
+        for line in path.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                files.append(str(path.parent / line))
+        return files
+
+    if path.is_dir():
+        candidates = [str(p) for p in path.iterdir()]
+    else:
+        candidates = glob.glob(source)
+
+    return sorted(
+        (f for f in candidates if f.lower().endswith(IMAGE_EXTENSIONS)),
+        key=_natural_key,
+    )
+
+
+class ImageSequenceCapture:
+    """
+    Capture d'une séquence d'images avec décodage parallèle et lecture anticipée.
+
+    Les images doivent avoir la même taille (sinon elles sont redimensionnées
+    à la taille de la première).
+    """
+
+    def __init__(
+        self,
+        source: str,
+        fps: float = 25.0,
+        width: int = None,
+        pixel_format: str = "bgr24",
+        workers: int = 0,
+        prefetch: int = 16,
+    ):
+        """
+        Args:
+            source: Dossier, motif glob ou fichier index
+            fps: Cadence attribuée à la séquence (timestamps, mode realtime, sauvegarde)
+            width: Largeur de sortie (hauteur proportionnelle, paire), None = native
+            pixel_format: 'bgr24' (3 canaux) ou 'gray' (1 canal)
+            workers: Threads de décodage (0 = nombre de CPU, max 8)
+            prefetch: Nombre d'images décodées en avance
+        """
+        if pixel_format not in PIXEL_FORMATS:
+            raise ValueError(
+                f"Format de pixel non supporté: {pixel_format} ({', '.join(PIXEL_FORMATS)})"
+            )
+
+        self.source = str(source)
+        self.files = list_images(self.source)
+        self.fps = fps
+        self.pixel_format = pixel_format
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.prefetch = max(1, prefetch)
+
+        self._imread_flag = (
+            cv2.IMREAD_GRAYSCALE if pixel_format == "gray" else cv2.IMREAD_COLOR
+        )
+        self._position = 0  # Index de la prochaine image livrée
+        self.unreadable = 0  # Images illisibles sautées par read()
+        self._next = 0  # Index de la prochaine image soumise au pool
+        self._pending = deque()
+        self._executor = None
+
+        # Taille depuis la première image lisible
+        first = cv2.imread(self.files[0], self._imread_flag) if self.files else None
+        self._opened = first is not None
+        self.source_height, self.source_width = (
+            first.shape[:2] if self._opened else (0, 0)
+        )
+        if width and self.source_width:
+            self.width = int(width)
+            self.height = int(round(self.source_height * width / self.source_width / 2)) * 2
+        else:
+            self.width, self.height = self.source_width, self.source_height
+
+    def _decode(self, path: str) -> np.ndarray:
+        image = cv2.imread(path, self._imread_flag)
+        if image is None:
+            return None
+        if image.shape[:2] != (self.height, self.width):
+            image = cv2.resize(image, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return image
+
+    def _fill(self):
+        """Maintient `prefetch` décodages en cours ou terminés"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="imread"
+            )
+        while len(self._pending) < self.prefetch and self._next < len(self.files):
+            self._pending.append(
+                self._executor.submit(self._decode, self.files[self._next])
+            )
+            self._next += 1
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self):
+        """
+        Image lisible suivante (dans l'ordre de la séquence).
+
+        Les images illisibles sont sautées et comptées (`unreadable`) ;
+        CAP_PROP_POS_FRAMES donne l'index qui suit l'image livrée.
+
+        Returns:
+            (ret, frame) comme cv2.VideoCapture.read
+        """
+        if not self._opened:
+            return False, None
+        while True:
+            self._fill()
+            if not self._pending:
+                return False, None
+            frame = self._pending.popleft().result()
+            self._position += 1
+            if frame is not None:
+                return True, frame
+            self.unreadable += 1
+
+    def grab(self) -> bool:
+        """Avance d'une image ; annule son décodage s'il n'a pas commencé"""
+        if not self._opened:
+            return False
+        if self._pending:
+            self._pending.popleft().cancel()
+        elif self._next < len(self.files):
+            self._next += 1
+        else:
+            return False
+        self._position += 1
+        return True
+
+    def get(self, prop: int) -> float:
+        """Sous-ensemble des propriétés cv2.CAP_PROP_*"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.files))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return 1000.0 * self._position / self.fps if self.fps else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """Seek (CAP_PROP_POS_FRAMES / CAP_PROP_POS_MSEC) : accès direct au fichier"""
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            prop, value = cv2.CAP_PROP_POS_FRAMES, value * self.fps / 1000.0
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._position = self._next = min(max(0, int(value)), len(self.files))
+        return True
+
+    def release(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,103 @@
+"""
+LatestFrameCapture - Capture live « la dernière frame gagne »
+
+Un thread lit la caméra en continu et écrase un unique emplacement
+« dernière frame ». read() retourne la frame la plus récente non encore lue :
+les frames capturées entre deux lectures sont ignorées (et comptées), la
+latence ne s'accumule donc jamais.
+"""
+
+import threading
+import time
+
+import cv2
+
+
+class LatestFrameCapture:
+    """
+    Enveloppe d'une capture (interface cv2.VideoCapture) pour le mode live.
+    """
+
+    def __init__(self, capture):
+        """
+        Args:
+            capture: Capture sous-jacente déjà ouverte (cv2.VideoCapture ou compatible)
+        """
+        self.capture = capture
+        self.frame_number = 0  # Index source (1-based) de la dernière frame lue
+        self.capture_time = 0.0  # time.time() de la capture de cette frame
+        self.skipped = 0
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._latest_number = 0
+        self._latest_time = 0.0
+        self._ended = False
+        self._running = True
+
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        while self._running:
+            ret, frame = self.capture.read()
+            now = time.time()
+            with self._cond:
+                if not ret:
+                    self._ended = True
+                    self._cond.notify_all()
+                    return
+                self._frame = frame
+                self._latest_number += 1
+                self._latest_time = now
+                self._cond.notify_all()
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self, timeout: float = 5.0):
+        """
+        Retourne la frame la plus récente non encore lue.
+
+        Attend une nouvelle frame si la dernière a déjà été lue.
+
+        Args:
+            timeout: Attente maximale (secondes) d'une nouvelle frame
+
+        Returns:
+            (ret, frame) comme cv2.VideoCapture.read, sauf si aucune frame n'est
+            arrivée pendant `timeout` alors que la caméra n'a pas signalé de fin
+            (caméra figée, reconnexion...) : (None, None), l'appelant peut
+            réessayer. (False, None) signifie toujours la fin du flux.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._latest_number > self.frame_number or self._ended,
+                timeout=timeout,
+            ):
+                return None, None  # Pas encore de nouvelle frame
+            if self._latest_number <= self.frame_number:
+                return False, None  # Fin de flux
+
+            self.skipped += self._latest_number - self.frame_number - 1
+            self.frame_number = self._latest_number
+            self.capture_time = self._latest_time
+            frame, self._frame = self._frame, None
+            return True, frame
+
+    def grab(self) -> bool:
+        ret, _ = self.read()
+        return ret is True
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_number)
+        return self.capture.get(prop)
+
+    def set(self, prop: int, value: float) -> bool:
+        return self.capture.set(prop, value)
+
+    def release(self):
+        self._running = False
+        self._thread.join(timeout=2.0)
+        self.capture.release()
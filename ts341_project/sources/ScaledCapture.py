@@ -0,0 +1,74 @@
+"""
+ScaledCapture - Réduction et conversion après décodage OpenCV
+
+cv2.VideoCapture décode toujours en pleine résolution BGR : cette enveloppe
+réduit (largeur demandée, hauteur proportionnelle paire) et convertit en
+niveaux de gris dans le processus de lecture, avant que la frame ne
+traverse les queues. Expose l'interface de cv2.VideoCapture.
+"""
+
+import cv2
+import numpy as np
+
+from .FFmpegCapture import PIXEL_FORMATS
+
+
+class ScaledCapture:
+    """Capture dont les frames sont réduites / converties au format demandé"""
+
+    def __init__(self, capture, width: int = None, pixel_format: str = "bgr24"):
+        """
+        Args:
+            capture: Capture sous-jacente (interface cv2.VideoCapture)
+            width: Largeur de sortie (pas d'agrandissement), None = native
+            pixel_format: 'bgr24' (3 canaux) ou 'gray' (1 canal)
+        """
+        if pixel_format not in PIXEL_FORMATS:
+            raise ValueError(
+                f"Format de pixel non supporté: {pixel_format} ({', '.join(PIXEL_FORMATS)})"
+            )
+
+        self.capture = capture
+        self.pixel_format = pixel_format
+        self.channels = PIXEL_FORMATS[pixel_format]
+
+        self.source_width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.source_height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width and 0 < width < self.source_width:
+            self.width = int(width)
+            self.height = int(round(self.source_height * width / self.source_width / 2)) * 2
+        else:
+            self.width, self.height = self.source_width, self.source_height
+
+    def _convert(self, frame: np.ndarray) -> np.ndarray:
+        # Conversion avant réduction : le redimensionnement porte sur un seul canal
+        if self.channels == 1 and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self):
+        ret, frame = self.capture.read()
+        if not ret:
+            return False, None
+        return True, self._convert(frame)
+
+    def grab(self) -> bool:
+        return self.capture.grab()
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return self.capture.get(prop)
+
+    def set(self, prop: int, value: float) -> bool:
+        return self.capture.set(prop, value)
+
+    def release(self):
+        self.capture.release()
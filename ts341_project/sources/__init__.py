@@ -0,0 +1,109 @@
+"""
+Sources vidéo pour VideoReader.
+
+Toutes les captures exposent l'interface de cv2.VideoCapture
+(isOpened, read, grab, get, set, release).
+"""
+
+from pathlib import Path
+from typing import Union
+
+import cv2
+
+from .FFmpegCapture import FFmpegCapture, PIXEL_FORMATS
+from .FrameCache import CachedCapture, CachingCapture, cache_path, default_cache_dir
+from .ImageSequenceCapture import ImageSequenceCapture, is_image_sequence
+from .LatestFrameCapture import LatestFrameCapture
+from .ScaledCapture import ScaledCapture
+
+BACKENDS = ("opencv", "ffmpeg")
+
+
+def open_capture(
+    source: Union[str, int],
+    backend: str = "opencv",
+    decode_width: int = None,
+    pixel_format: str = None,
+    threads: int = 0,
+    cache_dir: Union[str, Path] = None,
+    stride: int = 1,
+):
+    """
+    Ouvre une source vidéo avec le backend demandé.
+
+    Args:
+        source: Chemin vidéo, ID webcam, ou séquence d'images (dossier, glob, index)
+        backend: 'opencv' (cv2.VideoCapture) ou 'ffmpeg' (pipe rawvideo)
+        decode_width: Largeur de décodage (ffmpeg / séquence d'images ; avec
+                      opencv, réduction juste après le décodage)
+        pixel_format: 'bgr24' ou 'gray' (opencv: conversion après le décodage)
+        threads: Threads de décodage (ffmpeg / séquence d'images, 0 = auto)
+        cache_dir: Dossier du cache de frames décodées (fichiers vidéo uniquement) :
+                   lecture du memmap si le cache existe, sinon écriture au
+                   premier décodage complet
+        stride: Une frame sur `stride` sélectionnée dans ffmpeg (backend ffmpeg,
+                sans cache) ; la capture retournée expose alors `stride` et
+                read() avance de `stride` frames source. Ignoré sinon (le
+                lecteur saute les frames avec grab())
+
+    Returns:
+        Objet capture compatible cv2.VideoCapture
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend} ({', '.join(BACKENDS)})")
+
+    # Cache de frames décodées (clé: source + largeur + format)
+    if (
+        cache_dir is not None
+        and not isinstance(source, int)
+        and Path(source).is_file()
+        and not is_image_sequence(source)
+    ):
+        pixel_format = pixel_format or "bgr24"
+        path = cache_path(source, cache_dir, decode_width, pixel_format)
+        if path.exists():
+            try:
+                return CachedCapture(path)
+            except ValueError:
+                path.unlink()
+        capture = open_capture(source, backend, decode_width, pixel_format, threads)
+        return CachingCapture(capture, path, decode_width, pixel_format)
+
+    # Séquence d'images: décodage parallèle quel que soit le backend
+    if is_image_sequence(source):
+        return ImageSequenceCapture(
+            source,
+            width=decode_width,
+            pixel_format=pixel_format or "bgr24",
+            workers=threads,
+        )
+
+    # Les webcams restent sur OpenCV (ffmpeg ne lit que des fichiers/URL ici)
+    if backend == "ffmpeg" and not isinstance(source, int):
+        return FFmpegCapture(
+            source,
+            width=decode_width,
+            pixel_format=pixel_format or "bgr24",
+            threads=threads,
+            stride=stride,
+        )
+
+    capture = cv2.VideoCapture(source)
+    if (decode_width or pixel_format) and capture.isOpened():
+        return ScaledCapture(capture, width=decode_width, pixel_format=pixel_format or "bgr24")
+    return capture
+
+
+__all__ = [
+    "open_capture",
+    "FFmpegCapture",
+    "ImageSequenceCapture",
+    "CachedCapture",
+    "CachingCapture",
+    "default_cache_dir",
+    "is_image_sequence",
+    "LatestFrameCapture",
+    "ScaledCapture",
+    "BACKENDS",
+    "PIXEL_FORMATS",
+]
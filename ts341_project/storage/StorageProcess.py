@@ -1,16 +1,194 @@
 """NewStorageProcess - Sauvegarde vidéo dans un processus dédié
 
-Écrit les frames traitées dans un fichier vidéo
+Écrit les frames traitées dans un fichier vidéo.
+
+Chaque frame est écrite une seule fois par le VideoWriter (cadence fixe) et
+son PTS source est relevé (TimestampGrid). Si les temps réels s'écartent de
+la cadence fixe (frames jetées ou sautées, source VFR), ils sont écrits dans
+un fichier timecodes (format v2, aussi utilisable avec mkvmerge) puis
+appliqués frame par frame au transcodage ffmpeg : sortie à cadence variable
+avec autant de frames que de frames traitées.
 """
 
-from multiprocessing import Process, Queue, Event
+from multiprocessing import Process, Event
+from queue import Empty
 import cv2
 import time
 from pathlib import Path
 import subprocess
 import shlex
 import sys
+import tempfile
+from typing import Dict, List
 from ts341_project.logging_utils import get_logger
+from ts341_project.FrameCodec import FrameCodec
+from ts341_project.DeliveryQueue import DeliveryQueue
+from ts341_project.memory_utils import memory_report
+from ts341_project.LatencyHistogram import LatencyRecorder
+from ts341_project.LatencyTrace import record_trace, stamp
+from ts341_project.TimelineTrace import span, start_tracing, stop_tracing
+from ts341_project.ProcessProfiler import profiled
+
+
+class TimestampGrid:
+    """
+    Horodatage des frames écrites par un writer à cadence fixe.
+
+    Le writer (VideoWriter, CFR) écrit chaque frame une seule fois ; les
+    temps réels relevés ici (PTS source) sont appliqués au transcodage
+    final lorsqu'ils s'écartent de la cadence fixe (sortie VFR).
+    """
+
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.origin = None  # PTS de la première frame (t = 0 dans la sortie)
+        self.next_index = 0  # Prochain emplacement de la grille à cadence fixe
+        self.gaps = 0  # Emplacements de la grille sans frame (frames jetées / sautées)
+        self.rejected = 0  # Frames ignorées (PTS non croissant)
+        self.timecodes = []  # Temps de présentation réels (ms) des frames écrites
+
+    def place(self, pts: float = None) -> bool:
+        """
+        Args:
+            pts: PTS source de la frame (None = emplacement suivant)
+
+        Returns:
+            False si la frame doit être ignorée (PTS pas après la frame précédente)
+        """
+        if pts is None:
+            index = self.next_index
+            time_ms = 1000.0 * index / self.fps
+        else:
+            if self.origin is None:
+                self.origin = pts
+            index = int(round((pts - self.origin) * self.fps))
+            time_ms = 1000.0 * (pts - self.origin)
+
+        if self.timecodes and time_ms <= self.timecodes[-1]:
+            self.rejected += 1
+            return False
+
+        self.gaps += max(0, index - self.next_index)
+        self.next_index = max(self.next_index, index + 1)
+        self.timecodes.append(time_ms)
+        return True
+
+    @property
+    def vfr(self) -> bool:
+        """Au moins une frame à une demi-période ou plus de son emplacement à cadence fixe"""
+        period = 1000.0 / self.fps
+        return any(
+            abs(time_ms - i * period) >= period / 2 for i, time_ms in enumerate(self.timecodes)
+        )
+
+    def write_timecodes(self, path: Path):
+        """Fichier timecodes v2 (un temps en ms par frame réelle)"""
+        with open(path, "w") as f:
+            f.write("# timestamp format v2\n")
+            for time_ms in self.timecodes:
+                f.write(f"{time_ms:.3f}\n")
+
+
+def read_timecodes(path: Path) -> List[float]:
+    """Lit un fichier timecodes v2 (temps en ms)"""
+    with open(path) as f:
+        return [float(line) for line in f if line.strip() and not line.startswith("#")]
+
+
+def timecodes_commands(timecodes: List[float], fps: float) -> str:
+    """
+    Commandes sendcmd qui replacent les frames d'une vidéo à cadence fixe
+    `fps` (frame i à i / fps) à leurs temps réels (setpts, base de temps 1/90000).
+
+    Une commande par changement de décalage : une seule pour chaque trou,
+    et rien tant que la cadence est régulière.
+    """
+    changes = []  # (index de la première frame, décalage en secondes)
+    for i, time_ms in enumerate(timecodes):
+        offset = round(time_ms / 1000.0 - i / fps, 6)
+        if not changes or offset != changes[-1][1]:
+            changes.append((i, offset))
+
+    lines = []
+    for k, (i, offset) in enumerate(changes):
+        start = max(0.0, (i - 0.5) / fps)
+        end = (changes[k + 1][0] - 0.5) / fps if k + 1 < len(changes) else 1e9
+        lines.append(f"{start:.6f}-{end:.6f} [enter] setpts expr PTS{offset:+.6f}/TB;")
+    return "\n".join(lines) + "\n"
+
+
+class OutputWriter:
+    """
+    Fichier de sortie d'un flux : VideoWriter, temps réels des frames écrites
+    et finalisation (timecodes, transcodage H.264). Partagé par
+    NewStorageProcess et ProcessingSession.
+    """
+
+    def __init__(self, path, fps: float, width: int, height: int, codec: str, logger):
+        """
+        Args:
+            path: Fichier de sortie
+            fps: Cadence du writer (cadence source / stride)
+            width: Largeur de sortie (les frames sont redimensionnées si besoin)
+            height: Hauteur de sortie
+            codec: Codec fourcc du VideoWriter (mp4v, MJPG, etc.)
+            logger: Logger du processus
+        """
+        self.path = Path(path)
+        self.size = (width, height)
+        self.logger = logger
+        self.writer, self.temp_avi = NewStorageProcess._open_writer(
+            path, fps, width, height, codec, logger
+        )
+        self.grid = TimestampGrid(fps)
+
+    @property
+    def opened(self) -> bool:
+        return self.writer is not None
+
+    def write(self, frame, pts: float = None) -> bool:
+        """
+        Écrit une frame (1 ou 3 canaux, toute taille) à son temps réel.
+
+        Args:
+            pts: PTS source de la frame (None = emplacement suivant)
+
+        Returns:
+            False si la frame est ignorée (PTS pas après la frame précédente)
+        """
+        if not self.grid.place(pts):
+            return False
+        if frame.shape[1::-1] != self.size:
+            frame = cv2.resize(frame, self.size)
+        # Étendre en BGR côté sink
+        self.writer.write(FrameCodec.to_bgr(frame))
+        return True
+
+    def release(self):
+        """Ferme le VideoWriter (sans transcodage)"""
+        if self.writer is not None:
+            self.writer.release()
+
+    def finalize(self):
+        """Ferme le writer, applique les temps réels si besoin et transcode"""
+        self.release()
+        grid = self.grid
+        timecodes = None
+        if grid.vfr:
+            # Horodatages source seulement si la sortie n'est pas une simple CFR
+            timecodes = self.path.with_suffix(".timecodes.txt")
+            grid.write_timecodes(timecodes)
+            self.logger.info(
+                f"{self.path.name}: sortie VFR, {grid.gaps} emplacements sans frame "
+                f"(cadence {grid.fps:.2f} FPS)"
+            )
+        if grid.rejected:
+            self.logger.warning(
+                f"{self.path.name}: {grid.rejected} frames ignorées (PTS non croissant)"
+            )
+        NewStorageProcess._finalize_output(
+            self.path, self.temp_avi, self.logger, timecodes, grid.fps
+        )
 
 
 class NewStorageProcess:
@@ -20,13 +198,17 @@ class NewStorageProcess:
 
     def __init__(
         self,
-        storage_queue: Queue,
+        storage_queue: DeliveryQueue,
         stop_event: Event,
         output_path: str,
         fps: float,
         width: int,
         height: int,
         codec: str = "mp4v",
+        streams: Dict[int, tuple] = None,
+        trace_dir: str = None,
+        metrics=None,
+        profile=None,
     ):
         """
         Args:
@@ -37,6 +219,12 @@ class NewStorageProcess:
             width: Largeur
             height: Hauteur
             codec: Codec fourcc (mp4v, MJPG, etc.)
+            streams: Sorties par flux (multi-caméras) :
+                     {stream_id: (output_path, fps, width, height)}.
+                     None = flux unique (output_path, fps, width, height)
+            trace_dir: Dossier de la chronologie (TimelineTrace), None = désactivée
+            metrics: Bloc de métriques partagé de l'étape (PipelineMetrics), None = désactivé
+            profile: Profilage du processus (ProcessProfiler.ProfileConfig), None = désactivé
         """
         self.storage_queue = storage_queue
         self.stop_event = stop_event
@@ -45,28 +233,34 @@ class NewStorageProcess:
         self.width = width
         self.height = height
         self.codec = codec
+        self.streams = streams
+        self.ready_event = Event()  # Writer(s) ouvert(s)
+        self.trace_dir = trace_dir
+        self.metrics = metrics
+        self.profile = profile
 
-        # Créer dossier de sortie
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        # Créer dossier(s) de sortie
+        for path, *_ in (streams or {None: (output_path,)}).values():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
-    def _storage_process(
-        storage_queue, stop_event, output_path, fps, width, height, codec
-    ):
-        """Processus de sauvegarde"""
-        logger = get_logger(__name__)
-        logger.info(
-            f"Démarrage - Sortie: {output_path}"
-        )  # Préparer le writer. On essaie d'ouvrir directement le fichier demandé.
+    def _open_writer(output_path, fps, width, height, codec, logger):
+        """
+        Ouvre le VideoWriter de sortie.
+
+        Returns:
+            (writer, temp_avi) : temp_avi est le fichier .avi MJPG de repli (à
+            transcoder) si le codec demandé n'a pas pu être ouvert ;
+            writer est None si aucune sortie n'a pu être ouverte
+        """
+        # Préparer le writer. On essaie d'ouvrir directement le fichier demandé.
         out_path = Path(output_path)
-        ext = out_path.suffix.lower()
 
         fourcc = cv2.VideoWriter_fourcc(*codec)
         writer = cv2.VideoWriter(str(out_path), fourcc, fps, (width, height), True)
 
         # Si l'ouverture a échoué et que l'extension est .mp4, on bascule
         # vers un fichier temporaire .avi en MJPG puis on transcode avec ffmpeg
-        use_transcode = False
         temp_avi = None
         if not writer.isOpened():
             logger.warning(
@@ -80,53 +274,23 @@ class NewStorageProcess:
             )
             if not writer.isOpened():
                 logger.error(f"Impossible d'ouvrir ni {output_path} ni {temp_avi}")
-                return
-            use_transcode = True
-
-        frame_count = 0
-        start_time = time.time()
+                return None, None
 
-        while not stop_event.is_set():
-            try:
-                data = storage_queue.get(timeout=0.5)
-
-                # Fin de stream ?
-                if isinstance(data, dict) and data.get("end_of_stream"):
-                    logger.info("END_OF_STREAM reçu")
-                    break
-
-                # Écrire
-                frame = data["frame"]
+        return writer, temp_avi
 
-                # Adapter dimensions
-                h, w = frame.shape[:2]
-                if (h, w) != (height, width):
-                    frame = cv2.resize(frame, (width, height))
-
-                # Adapter couleur
-                if len(frame.shape) == 2:
-                    frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-                elif len(frame.shape) == 3 and frame.shape[2] == 4:
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-
-                writer.write(frame)
-                frame_count += 1
-
-                if frame_count % 100 == 0:
-                    elapsed = time.time() - start_time
-                    fps_writing = frame_count / elapsed
-                    logger.info(f"{frame_count} frames | {fps_writing:.1f} FPS")
-
-            except:
-                continue  # Queue vide
+    @staticmethod
+    def _finalize_output(output_path, temp_avi, logger, timecodes=None, fps: float = None):
+        """
+        Vérifie le codec écrit et transcode en H.264 si nécessaire.
 
-        writer.release()
+        Avec un fichier timecodes (v2, un temps par frame écrite à `fps`), le
+        transcodage est forcé et replace chaque frame à son temps réel :
+        sortie à cadence variable, sans ajout ni suppression de frame.
+        """
+        out_path = Path(output_path)
 
         # Déterminer la source à vérifier / transcoder
-        if use_transcode and temp_avi is not None:
-            src_path = temp_avi
-        else:
-            src_path = out_path
+        src_path = temp_avi if temp_avi is not None else out_path
 
         def probe_video_codec(path: Path) -> str:
             """Retourne le codec vidéo du premier stream via ffprobe, ou chaîne vide si échec."""
@@ -155,17 +319,39 @@ class NewStorageProcess:
 
         # Si codec non-h264, essayer un transcodage pour produire un MP4 H.264 lisible
         try:
-            needs_transcode = written_codec.lower() != "h264"
+            needs_transcode = written_codec.lower() != "h264" or timecodes is not None
         except Exception:
             needs_transcode = True
 
         if needs_transcode:
             final_tmp = out_path.with_suffix(".tmp.mp4")
+            timing = []
+            commands_file = None
+            if timecodes is not None:
+                # Fichier de commandes hors du dossier de sortie (chemin sans
+                # caractère spécial pour le filtre)
+                with tempfile.NamedTemporaryFile(
+                    "w", suffix=".sendcmd.txt", delete=False
+                ) as commands_file:
+                    commands_file.write(timecodes_commands(read_timecodes(timecodes), fps))
+                timing = [
+                    "-vf",
+                    f"settb=1/90000,sendcmd=f={commands_file.name},setpts=PTS",
+                    "-fps_mode",
+                    "passthrough",
+                    # Sans B-frames ni edit list : première frame à t = 0 et
+                    # dernière frame conservée (durée de frame inconnue après setpts)
+                    "-bf",
+                    "0",
+                    "-use_editlist",
+                    "0",
+                ]
             cmd = [
                 "ffmpeg",
                 "-y",
                 "-i",
                 str(src_path),
+                *timing,
                 "-c:v",
                 "libx264",
                 "-preset",
@@ -182,6 +368,8 @@ class NewStorageProcess:
                 f"Transcodage vers H.264: {' '.join(shlex.quote(a) for a in cmd)}"
             )
             res = subprocess.run(cmd, capture_output=True, text=True)
+            if commands_file is not None:
+                Path(commands_file.name).unlink(missing_ok=True)
             if res.returncode != 0:
                 logger.error(
                     f"ERREUR ffmpeg (returncode={res.returncode}): {res.stderr}"
@@ -211,16 +399,115 @@ class NewStorageProcess:
                         f"Impossible de déplacer {src_path} -> {out_path}: {e}"
                     )
 
+    @staticmethod
+    def _storage_process(
+        storage_queue,
+        stop_event,
+        output_path,
+        fps,
+        width,
+        height,
+        codec,
+        streams,
+        ready_event,
+        trace_dir,
+        metrics,
+    ):
+        """Processus de sauvegarde"""
+        logger = get_logger(__name__)
+        start_tracing(trace_dir, f"storage ({Path(output_path).name})")
+
+        # Sorties par flux: {stream_id: (chemin, fps, largeur, hauteur)}
+        outputs = streams or {None: (output_path, fps, width, height)}
+
+        writers = {}  # stream_id -> OutputWriter
+        for stream_id, (path, stream_fps, w, h) in outputs.items():
+            logger.info(f"Démarrage - Sortie: {path}")
+            output = OutputWriter(path, stream_fps, w, h, codec, logger)
+            if output.opened:
+                writers[stream_id] = output
+        if not writers:
+            return
+        ready_event.set()
+
+        active_streams = set(outputs)
+        frame_count = 0
+        errors = 0  # Frames jetées sur exception (décodage, écriture)
+        start_time = time.time()
+        latencies = LatencyRecorder()  # Frames tracées (VideoReader trace=True)
+
+        while not stop_event.is_set():
+            try:
+                data = storage_queue.get(timeout=0.5)
+            except Empty:
+                continue  # Queue vide
+
+            try:
+                trace = stamp(data.get("trace"), "sink_in")
+                stream_id = data.get("stream_id")
+
+                # Fin de stream ?
+                if isinstance(data, dict) and data.get("end_of_stream"):
+                    logger.info("END_OF_STREAM reçu")
+                    active_streams.discard(stream_id)
+                    if not active_streams:
+                        break
+                    continue
+
+                if stream_id not in writers:
+                    continue
+
+                # Écrire à son temps réel (PTS source) ; la frame arrive dans
+                # son nombre de canaux natif
+                frame = FrameCodec.decode(data)
+                with span("écriture", frame=data.get("frame_number")):
+                    if not writers[stream_id].write(frame, data.get("pts")):
+                        continue
+                frame_count += 1
+                if trace is not None:
+                    record_trace(latencies, stamp(trace, "sink_out"), "écriture")
+                if metrics is not None:
+                    metrics.frame()
+
+                if frame_count % 100 == 0:
+                    elapsed = time.time() - start_time
+                    fps_writing = frame_count / elapsed
+                    logger.info(f"{frame_count} frames | {fps_writing:.1f} FPS")
+                    logger.info(memory_report([storage_queue]))
+
+            except Exception:
+                errors += 1
+                logger.exception(f"Frame {data.get('frame_number')} non écrite (erreur)")
+                if metrics is not None:
+                    metrics.error()
+
+        # Transcodage après la fin de tous les flux (ne bloque pas les autres)
+        for output in writers.values():
+            with span("transcodage", file=output.path.name):
+                output.finalize()
+
         elapsed = time.time() - start_time
         fps_avg = frame_count / elapsed if elapsed > 0 else 0
 
         logger.info(f"Arrêté - {frame_count} frames, {fps_avg:.1f} FPS")
-        logger.info(f"Fichier: {output_path}")
+        if errors:
+            logger.warning(f"{errors} frame(s) non écrite(s) sur erreur")
+        if latencies.histograms:
+            logger.info(latencies.report("Latence capture -> disque"))
+        if metrics is not None:
+            metrics.publish()  # État final (RSS, horodatage)
+        stop_tracing()
+        for path, *_ in outputs.values():
+            logger.info(f"Fichier: {path}")
 
     def start(self):
         """Démarre le processus"""
         self.process = Process(
-            target=NewStorageProcess._storage_process,
+            target=profiled(
+                NewStorageProcess._storage_process,
+                self.profile,
+                f"storage-{Path(self.output_path).stem}",
+            ),
             args=(
                 self.storage_queue,
                 self.stop_event,
@@ -229,6 +516,10 @@ class NewStorageProcess:
                 self.width,
                 self.height,
                 self.codec,
+                self.streams,
+                self.ready_event,
+                self.trace_dir,
+                self.metrics,
             ),
         )
         self.process.start()